@@ -192,6 +192,8 @@ async def lifespan(app: FastAPI):
     yield
     
     # Cleanup on shutdown
+    await pipeline.aclose()
+    await pipeline.llm_provider.aclose()
     pipeline = None
 
 
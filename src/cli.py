@@ -266,6 +266,7 @@ def cmd_ingest(args: argparse.Namespace) -> int:
         print(f"   Documents processed: {result.documents_processed}")
         print(f"   Chunks created:      {result.chunks_created}")
         print(f"   Chunks ingested:     {result.chunks_ingested}")
+        print(f"   Chunks unchanged:    {result.chunks_skipped}")
         print(f"   Total in store:      {ingester.document_count}")
         
         if result.errors:
@@ -292,7 +293,7 @@ def cmd_query(args: argparse.Namespace) -> int:
     print("-" * 50)
     
     try:
-        pipeline = RAGPipeline()
+        pipeline = RAGPipeline(use_batch_for_stream=settings.llm.use_batch_for_stream)
         
         if pipeline.document_count == 0:
             print("⚠️  No documents in vector store. Run 'ingest' first.")
@@ -342,7 +343,7 @@ def cmd_chat(args: argparse.Namespace) -> int:
     print("-" * 60)
     
     try:
-        pipeline = RAGPipeline()
+        pipeline = RAGPipeline(use_batch_for_stream=settings.llm.use_batch_for_stream)
         
         if pipeline.document_count == 0:
             print("⚠️  No documents in vector store. Run 'ingest' first.")
@@ -567,7 +568,10 @@ def cmd_voice_chat(args: argparse.Namespace) -> int:
     
     try:
         # Initialize services
-        pipeline = RAGPipeline(system_prompt=VOICE_RAG_SYSTEM_PROMPT)
+        pipeline = RAGPipeline(
+            system_prompt=VOICE_RAG_SYSTEM_PROMPT,
+            use_batch_for_stream=settings.llm.use_batch_for_stream
+        )
         speech = SpeechService()
         
         if pipeline.document_count == 0:
@@ -603,18 +607,20 @@ def cmd_voice_chat(args: argparse.Namespace) -> int:
                     speech.speak(farewell)
                     break
                 
-                # Get response from RAG pipeline
+                # Stream the response, speaking each sentence as it arrives
                 print("🤔 Thinking...")
-                response = pipeline.chat(user_text)
-                
-                # Speak the response
-                print(f"🤖 Bot: {response.answer}")
-                speech.speak(response.answer)
+                print("🤖 Bot: ", end="", flush=True)
+                speech.speak_stream(
+                    pipeline.stream_query(user_text),
+                    on_token=lambda token: print(token, end="", flush=True)
+                )
+                print()
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Voice chat interrupted.")
                 break
         
+        speech.close()
         return 0
         
     except Exception as e:
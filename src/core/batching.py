@@ -0,0 +1,137 @@
+"""
+Batching LLM Provider Module
+
+Micro-batches concurrent async chat requests in front of AzureLLMProvider.
+
+Requests arriving within a short window (or until the batch is full) are
+dispatched together by a MicroBatcher. Azure chat completions take a single conversation
+per request, so a batch cannot be packed into one POST; instead,
+identical temperature-0 requests in the batch are coalesced into one API
+call whose result is shared, and the remaining requests are sent
+concurrently over the provider's pooled async session. Sampled
+(temperature > 0) requests are never shared, so each caller gets its own
+answer.
+
+Usage:
+    from src.core.batching import BatchingAzureLLMProvider
+
+    llm = BatchingAzureLLMProvider(max_batch=8, max_wait_ms=20)
+    response = await llm.chat_async(messages)
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from src.core.cache import request_key
+from src.core.llm import AzureLLMProvider, ChatResponse, LLMProvider, Message
+from src.core.microbatch import MicroBatcher, fail_pending
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (coalescing key or None, messages, kwargs)
+_Request = Tuple[Optional[str], List[Message], Dict[str, Any]]
+_Pending = Tuple[_Request, "asyncio.Future[ChatResponse]"]
+
+
+class BatchingAzureLLMProvider(LLMProvider):
+    """
+    LLM provider that micro-batches concurrent async chat requests.
+
+    Synchronous chat() and stream_chat() pass straight through to the
+    wrapped provider.
+
+    Example:
+        llm = BatchingAzureLLMProvider()
+
+        responses = await asyncio.gather(
+            llm.chat_async(messages_a),
+            llm.chat_async(messages_b),
+        )
+    """
+
+    def __init__(
+        self,
+        provider: Optional[AzureLLMProvider] = None,
+        max_batch: int = 8,
+        max_wait_ms: float = 20.0
+    ):
+        """
+        Initialize the batching provider.
+
+        Args:
+            provider: Provider that sends the requests (defaults to a new AzureLLMProvider)
+            max_batch: Maximum requests per batch
+            max_wait_ms: Maximum time to wait for a batch to fill
+        """
+        self.provider = provider or AzureLLMProvider()
+        self.model = self.provider.model
+        self.context_window = self.provider.context_window
+        self.max_tokens = self.provider.max_tokens
+        self._batcher: MicroBatcher[_Request, ChatResponse] = MicroBatcher(
+            self._dispatch, max_batch, max_wait_ms, name="Batching provider"
+        )
+
+    def chat(self, messages: List[Message], **kwargs: Any) -> ChatResponse:
+        """Generate a chat completion (not batched)."""
+        return self.provider.chat(messages, **kwargs)
+
+    def stream_chat(self, messages: List[Message], **kwargs: Any) -> Iterator[str]:
+        """Generate a streaming chat completion (not batched)."""
+        return self.provider.stream_chat(messages, **kwargs)
+
+    async def achat(self, messages: List[Message], **kwargs: Any) -> ChatResponse:
+        """Generate a chat completion through the micro-batcher."""
+        return await self.chat_async(messages, **kwargs)
+
+    def astream_chat(self, messages: List[Message], **kwargs: Any) -> AsyncIterator[str]:
+        """Generate an async streaming chat completion (not batched)."""
+        return self.provider.astream_chat(messages, **kwargs)
+
+    async def chat_async(self, messages: List[Message], **kwargs: Any) -> ChatResponse:
+        """
+        Queue a chat completion for the next batch.
+
+        Args:
+            messages: List of conversation messages
+            **kwargs: Extra arguments passed to achat()
+
+        Returns:
+            ChatResponse for these messages
+        """
+        temperature = kwargs.get("temperature")
+        if temperature is None:
+            temperature = self.provider.temperature
+        # Like the exact response cache, only deterministic requests are shared
+        key = request_key({"messages": messages, **kwargs}) if temperature == 0 else None
+        return await self._batcher.submit((key, messages, kwargs))
+
+    async def aclose(self) -> None:
+        """Stop the batching worker, failing queued requests, and close the wrapped provider."""
+        await self._batcher.aclose()
+        await self.provider.aclose()
+
+    async def _dispatch(self, batch: List[_Pending]) -> None:
+        """Send one API call per distinct request and resolve every waiter."""
+        groups: Dict[Hashable, List[_Pending]] = {}
+        for pending in batch:
+            (key, _, _), future = pending
+            # Uncoalesced requests get a group of their own
+            groups.setdefault(key if key is not None else id(future), []).append(pending)
+
+        if len(groups) < len(batch):
+            logger.debug(f"Coalesced {len(batch)} chat requests into {len(groups)} calls")
+
+        requests = [group[0][0] for group in groups.values()]
+        results = await asyncio.gather(
+            *(self.provider.achat(messages, **kwargs) for _, messages, kwargs in requests),
+            return_exceptions=True
+        )
+
+        for group, result in zip(groups.values(), results):
+            if isinstance(result, BaseException):
+                fail_pending(group, result)
+                continue
+            for _, future in group:
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,463 @@
+"""
+Response Cache Module
+
+In-process caches for LLM responses.
+
+Architecture:
+- LRUCache: Thread-safe bounded key/value cache with LRU eviction
+- request_key: Stable hash of a canonicalized request body
+- CacheBackend: Storage interface (MemoryCacheBackend, RedisCacheBackend)
+- LLMCache: Exact-match response cache with an optional semantic tier
+- GenerativeCache: Reuses answers across questions differing only in slot values
+
+Only deterministic requests (temperature 0) should be cached; sampled
+responses are meant to vary between calls.
+
+Usage:
+    from src.core.cache import LLMCache
+
+    cache = LLMCache(ttl_seconds=3600)
+    response = cache.get(body)
+    if response is None:
+        response = call_api(body)
+        cache.set(body, response)
+"""
+
+import dataclasses
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any, Callable, Dict, Generic, Hashable, List, Optional, Protocol, Set, Tuple, TypeVar
+)
+
+import numpy as np
+import orjson
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+V = TypeVar("V")
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    """
+    Hash a request body into a cache key.
+
+    Keys are sorted before hashing, so equal bodies built in a different
+    order map to the same key. Dataclass values (e.g. chat messages) are
+    serialized natively.
+
+    Args:
+        body: JSON-serializable request body
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe bounded cache with least-recently-used eviction.
+
+    Example:
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.get("a")  # -> 1
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get a cached value and mark it recently used, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(Protocol):
+    """Byte storage used by LLMCache."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a stored value, or None if missing or expired."""
+        ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Store a value for ttl_seconds."""
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the backend.
+
+        Args:
+            maxsize: Maximum number of entries
+        """
+        self._cache: LRUCache[Tuple[float, bytes]] = LRUCache(maxsize)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._cache.set(key, (time.monotonic() + ttl_seconds, value))
+
+
+class RedisCacheBackend:
+    """Redis backend, shared across worker processes. Requires the redis package."""
+
+    def __init__(self, url: str, prefix: str = "llm-cache:"):
+        """
+        Initialize the backend.
+
+        Args:
+            url: Redis connection URL
+            prefix: Key prefix for cache entries
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("Redis cache backend requires: pip install redis") from e
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._client.setex(self._prefix + key, ttl_seconds, value)
+
+
+class LLMCache:
+    """
+    Response cache for deterministic chat completions.
+
+    Lookups first try an exact match on the whole request body. With an
+    embedding function configured, a miss then falls back to a semantic
+    match: requests that are identical except for the question text (same
+    system prompt, history, retrieved context, and session line) are
+    compared by the cosine similarity of the customer's question.
+
+    Example:
+        cache = LLMCache(embed_fn=embedder.embed)
+
+        cached = cache.get(body, query_text="how do i check my balance")
+        if cached is None:
+            cache.set(body, response, query_text="how do i check my balance")
+    """
+
+    # Most recent questions kept per semantic bucket
+    _MAX_BUCKET_ENTRIES = 32
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl_seconds: int = 3600,
+        maxsize: int = 1024,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        similarity_threshold: float = 0.92
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend (defaults to in-memory LRU)
+            ttl_seconds: Entry lifetime
+            maxsize: Entry limit for the default backend and semantic index
+            embed_fn: Embedding function; enables the semantic tier
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.backend = backend or MemoryCacheBackend(maxsize)
+        self.ttl_seconds = ttl_seconds
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+
+        # bucket key -> [(unit question vector, exact key)]
+        self._semantic: LRUCache[List[Tuple[np.ndarray, str]]] = LRUCache(maxsize)
+        # A miss embeds the question on get() and again on set()
+        self._vectors: LRUCache[np.ndarray] = LRUCache(256)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters."""
+        return {
+            "hits": self._hits,
+            "semantic_hits": self._semantic_hits,
+            "misses": self._misses,
+        }
+
+    def get(self, body: Dict[str, Any], query_text: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            body: Request body
+            query_text: Customer's question, used for semantic matching
+
+        Returns:
+            Cached response dict, or None on a miss
+        """
+        value = self.backend.get(request_key(body))
+        if value is not None:
+            self._count("_hits")
+            return orjson.loads(value)
+
+        if self.embed_fn and query_text:
+            value = self._semantic_lookup(body, query_text)
+            if value is not None:
+                self._count("_hits")
+                self._count("_semantic_hits")
+                return orjson.loads(value)
+
+        self._count("_misses")
+        return None
+
+    def set(
+        self,
+        body: Dict[str, Any],
+        response: Dict[str, Any],
+        query_text: Optional[str] = None
+    ) -> None:
+        """
+        Store a response.
+
+        Args:
+            body: Request body
+            response: JSON-serializable response
+            query_text: Customer's question, indexed for semantic matching
+        """
+        key = request_key(body)
+        self.backend.set(key, orjson.dumps(response), self.ttl_seconds)
+
+        if self.embed_fn and query_text:
+            vector = self._embed(query_text)
+            if vector is None:
+                return
+            bucket = _bucket_key(body, query_text)
+            with self._lock:
+                entries = [*(self._semantic.get(bucket) or []), (vector, key)]
+                self._semantic.set(bucket, entries[-self._MAX_BUCKET_ENTRIES:])
+
+    def _semantic_lookup(self, body: Dict[str, Any], query_text: str) -> Optional[bytes]:
+        """Find a cached response for a similar question in the same bucket."""
+        entries = self._semantic.get(_bucket_key(body, query_text))
+        if not entries:
+            return None
+
+        vector = self._embed(query_text)
+        if vector is None:
+            return None
+
+        vectors, keys = zip(*entries)
+        similarities = np.stack(vectors) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        logger.debug(f"Semantic cache hit (similarity={similarities[best]:.3f})")
+        return self.backend.get(keys[best])
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed and L2-normalize text; None if embedding fails."""
+        vector = self._vectors.get(text)
+        if vector is not None:
+            return vector
+        try:
+            vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        vector = vector / norm
+        self._vectors.set(text, vector)
+        return vector
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def _bucket_key(body: Dict[str, Any], query_text: str) -> str:
+    """Hash everything in a request except the question text itself."""
+    *earlier, last = body["messages"]
+    # Messages are dicts or dataclasses (e.g. src.core.llm.Message)
+    last = last if isinstance(last, dict) else dataclasses.asdict(last)
+    template = {**last, "content": last["content"].replace(query_text, "")}
+    return request_key({**body, "messages": [*earlier, template]})
+
+
+# Slot values: service codes (*123#, #456#), phone numbers, then plain numbers
+_SLOT_PATTERN = re.compile(
+    r"(?P<CODE>[*#][\d*#]*\d[\d*#]*#?)|"
+    r"(?P<PHONE>(?:\+94|\b0)\d{9}\b)|"
+    r"(?P<NUM>\b\d+(?:\.\d+)?)"
+)
+
+
+def _context_slots(body: Dict[str, Any], query_text: str) -> Set[str]:
+    """Slot values in a request outside the question (retrieved context, prompt)."""
+    slots: Set[str] = set()
+    for message in body["messages"]:
+        content = message["content"] if isinstance(message, dict) else message.content
+        slots.update(m.group(0) for m in _SLOT_PATTERN.finditer(content.replace(query_text, "")))
+    return slots
+
+
+def _placeholder(index: int) -> str:
+    return f"\x00{index}\x00"
+
+
+class GenerativeCache:
+    """
+    Template cache for questions that differ only in slot values.
+
+    "Activate *123# on 0771234567" and "Activate *456# on 0719876543" share
+    the skeleton "Activate <CODE> on <PHONE>". When a response for one of
+    them only reuses slot values from its own question, it is stored as a
+    template and re-filled with the new values for the other.
+
+    A response is only templated if every number or code in it comes from
+    the question. "The 1GB pack costs Rs. 100" is never stored: reusing it
+    for "5GB" would invent a price.
+
+    Nor is it templated (or re-filled) when a slot value also appears in
+    the retrieved context: then the answer was looked up for that value, not
+    just echoed. "Plan 5 includes unlimited data" came from the Plan 5 entry
+    and must not become "Plan 10 includes unlimited data". Answers that only
+    repeat back customer-supplied values (codes, phone numbers) are reused.
+
+    Example:
+        cache = GenerativeCache()
+        cache.set(body, question, answer)
+        cache.get(other_body, other_question)  # answer with slots re-filled
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: int = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of templates
+            ttl_seconds: Template lifetime
+        """
+        self.ttl_seconds = ttl_seconds
+        self._templates = MemoryCacheBackend(maxsize)
+
+    def get(self, body: Dict[str, Any], question: str) -> Optional[str]:
+        """
+        Build a response from a cached template.
+
+        Args:
+            body: Request body containing the question
+            question: Customer's question
+
+        Returns:
+            Response with this question's slot values, or None on a miss
+        """
+        skeleton, values = _skeletonize(question)
+        if not values:
+            return None
+
+        template = self._templates.get(_bucket_key(body, question) + skeleton)
+        if template is None or not _context_slots(body, question).isdisjoint(values):
+            return None
+
+        response = template.decode("utf-8")
+        for index, value in enumerate(values):
+            response = response.replace(_placeholder(index), value)
+        return response
+
+    def set(self, body: Dict[str, Any], question: str, response: str) -> None:
+        """
+        Store a response as a template if it is safe to re-fill.
+
+        Args:
+            body: Request body containing the question
+            question: Customer's question
+            response: Generated response
+        """
+        skeleton, values = _skeletonize(question)
+        if not values or len(set(values)) != len(values):
+            return
+        # The context has facts specific to this value; don't carry them over
+        if not _context_slots(body, question).isdisjoint(values):
+            return
+
+        foreign: List[str] = []
+
+        def replace(match: "re.Match[str]") -> str:
+            value = match.group(0)
+            if value not in values:
+                foreign.append(value)
+                return value
+            return _placeholder(values.index(value))
+
+        template = _SLOT_PATTERN.sub(replace, response)
+        # A slot that did not come from the question (a price, a balance)
+        # would be wrong for the next customer
+        if foreign:
+            return
+
+        key = _bucket_key(body, question) + skeleton
+        self._templates.set(key, template.encode("utf-8"), self.ttl_seconds)
+
+
+def _skeletonize(text: str) -> Tuple[str, List[str]]:
+    """Replace slot values with their kind, returning the skeleton and values."""
+    values: List[str] = []
+
+    def replace(match: "re.Match[str]") -> str:
+        values.append(match.group(0))
+        return f"<{match.lastgroup}>"
+
+    return _SLOT_PATTERN.sub(replace, text), values
@@ -22,15 +22,19 @@ Usage:
     vectors = provider.embed_batch(["Hello world", "How are you?"])
 """
 
+import asyncio
 import hashlib
 import json
-import math
 import time
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 
 from src.config import settings
 from src.logger import get_logger
@@ -85,6 +89,21 @@ class EmbeddingProvider(ABC):
             List of embedding vectors
         """
         pass
+    
+    async def aembed(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text without blocking the event loop.
+        
+        The default runs embed() in a worker thread; providers with an
+        async HTTP client can override it.
+        
+        Args:
+            text: Input text to embed
+            
+        Returns:
+            List of floats representing the embedding vector
+        """
+        return await asyncio.to_thread(self.embed, text)
 
 
 class EmbeddingCache:
@@ -222,6 +241,17 @@ class AzureEmbeddingProvider(EmbeddingProvider):
         use_cache = use_cache if use_cache is not None else settings.embedding.enable_cache
         self._cache = EmbeddingCache() if use_cache else None
         
+        # Pooled keep-alive session; retries are handled by _call_api().
+        # Sized like AzureLLMProvider's: a directory ingest keeps up to
+        # max_workers * prefetch (8 * 2) embedding calls in flight, more than
+        # requests' default pool of 10 would keep alive.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0)
+        )
+        self._session.headers.update(self._headers)
+        
         logger.info(
             f"Initialized AzureEmbeddingProvider: deployment={self.deployment}, "
             f"batch_size={self.batch_size}, max_retries={self.max_retries}, "
@@ -244,24 +274,32 @@ class AzureEmbeddingProvider(EmbeddingProvider):
         """Return HTTP headers for API requests."""
         return {
             "api-key": self.api_key,
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # Embedding responses are large float arrays and compress well;
+            # urllib3 decodes them transparently
+            "Accept-Encoding": ACCEPT_ENCODING
         }
     
     @staticmethod
-    def _normalize_vector(vector: List[float]) -> List[float]:
+    def _normalize_vectors(vectors: List[List[float]]) -> List[List[float]]:
         """
-        Normalize a vector to unit length for cosine similarity.
+        Normalize vectors to unit length for cosine similarity.
+        
+        The whole batch is normalized as one array operation; zero vectors
+        are left unchanged.
         
         Args:
-            vector: Input vector
+            vectors: Input vectors, all of the same dimension
             
         Returns:
-            Normalized vector with L2 norm = 1
+            Normalized vectors with L2 norm = 1
         """
-        norm = math.sqrt(sum(x * x for x in vector))
-        if norm == 0:
-            return vector
-        return [x / norm for x in vector]
+        if not vectors:
+            return vectors
+        matrix = np.asarray(vectors, dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).tolist()
     
     def _call_api(self, texts: List[str]) -> List[List[float]]:
         """
@@ -277,13 +315,13 @@ class AzureEmbeddingProvider(EmbeddingProvider):
             requests.RequestException: If all retries fail
         """
         last_exception = None
+        payload = orjson.dumps({"input": texts})
         
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(
+                response = self._session.post(
                     self._url,
-                    headers=self._headers,
-                    json={"input": texts},
+                    data=payload,
                     timeout=60
                 )
                 
@@ -304,12 +342,12 @@ class AzureEmbeddingProvider(EmbeddingProvider):
                 response.raise_for_status()
                 
                 # Extract embeddings from response
-                data = response.json()
+                data = orjson.loads(response.content)
                 embeddings = [item["embedding"] for item in data["data"]]
                 
                 # Normalize if requested
                 if self.normalize:
-                    embeddings = [self._normalize_vector(e) for e in embeddings]
+                    embeddings = self._normalize_vectors(embeddings)
                 
                 return embeddings
                 
@@ -322,6 +360,10 @@ class AzureEmbeddingProvider(EmbeddingProvider):
         
         raise last_exception or RuntimeError("Failed to get embeddings")
     
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._session.close()
+    
     def embed(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
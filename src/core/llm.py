@@ -27,21 +27,71 @@ Usage:
     print(response.content)
 """
 
-import json
+import asyncio
+import random
+import re
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Iterator
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Iterator, AsyncIterator, Callable, Mapping, Sequence, Set, Tuple
 
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 
 from src.config import settings
+from src.core.cache import GenerativeCache, LLMCache, LRUCache, RedisCacheBackend
+from src.core.tokens import count_tokens_batch, truncate_to_tokens
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (5, 60)
 
-@dataclass
+# A word plus its trailing whitespace, for re-emitting text as a stream
+_WORD_CHUNK = re.compile(r"\s*\S+\s*")
+
+# Client errors that fail the same way on every retry (429 is retried)
+NON_RETRIABLE_STATUS_CODES = frozenset({400, 401, 403, 404, 422})
+
+# Upper bound on a server-requested Retry-After wait, in seconds
+MAX_RETRY_AFTER = 30.0
+
+# Token counts of recently seen message contents, keyed by (model, content).
+# The system prompt and history repeat on every turn of a conversation, so
+# only the per-turn context and question need tokenizing for budgeting.
+MESSAGE_TOKEN_CACHE_SIZE = 256
+_message_token_counts: LRUCache[int] = LRUCache(MESSAGE_TOKEN_CACHE_SIZE)
+
+# Server-sent event markers in streamed chat completions
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DATA_PREFIX_LEN = len(_SSE_DATA_PREFIX)
+_SSE_DONE = b"[DONE]"
+# Oldest Azure api-version that accepts stream_options (older ones reject it)
+_STREAM_OPTIONS_MIN_API_VERSION = "2024-09-01"
+
+# Conversational-noise vocabulary (regex alternatives), shared with the quick
+# reply router so both recognise the same greetings, thanks and goodbyes
+GREETING_PHRASES = ("hi", "hello", "hey", "hiya", "hi there", "hello there", "good (morning|afternoon|evening)")
+THANKS_PHRASES = ("thanks?( you)?( so much)?( for (the|your) help)?", "thank you", "cheers")
+GOODBYE_PHRASES = ("bye", "goodbye", "bye bye", "see you", "gotta go", "that'?s all", "that is all")
+ACKNOWLEDGEMENT_PHRASES = ("ok(ay)?", "great", "cool", "perfect")
+
+# Greeting/goodbye turns only ever need a one-line reply, so their completion
+# budget is capped and decoding stops early instead of running to max_tokens.
+_SHORT_TURN_PHRASES = GREETING_PHRASES + THANKS_PHRASES + GOODBYE_PHRASES + ACKNOWLEDGEMENT_PHRASES
+_SHORT_TURN_PATTERN = re.compile(rf"^({'|'.join(_SHORT_TURN_PHRASES)})\W*$", re.IGNORECASE)
+_CUSTOMER_QUOTE_PATTERN = re.compile(r'Customer: "(.*)"', re.DOTALL)
+SHORT_TURN_STOP_SEQUENCES = ["\n\nCustomer:", "</s>"]
+
+
+@dataclass(slots=True, frozen=True)
 class Message:
     """
     Represents a chat message.
@@ -58,7 +108,7 @@ class Message:
         return {"role": self.role, "content": self.content}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChatResponse:
     """
     Response from LLM chat completion.
@@ -90,6 +140,43 @@ class ChatResponse:
         return self.usage.get("total_tokens", 0)
 
 
+def _last_user_text(messages: List[Message]) -> str:
+    """Return the customer's own words from the last user message."""
+    for message in reversed(messages):
+        if message.role == "user":
+            match = _CUSTOMER_QUOTE_PATTERN.search(message.content)
+            return (match.group(1) if match else message.content).strip()
+    return ""
+
+
+# Chat format overhead: role/separator tokens per message, plus the primed reply
+_TOKENS_PER_MESSAGE = 3
+_REPLY_PRIMING_TOKENS = 3
+# Slack for token-count drift when capping max_tokens to the context window
+_CONTEXT_SAFETY_TOKENS = 32
+
+
+def _retry_after(header: Optional[str], attempt: int) -> float:
+    """
+    Seconds to wait before retrying a rate-limited request.
+    
+    Both sources are clamped to MAX_RETRY_AFTER and jittered so clients
+    limited together do not all retry at the same instant. The Retry-After
+    header is a floor, so its jitter only ever adds up to 20%; the
+    exponential fallback is jittered by +/-20%.
+    """
+    try:
+        delay = min(float(header), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, MAX_RETRY_AFTER) * random.uniform(0.8, 1.2)
+    return delay + random.uniform(0, 0.2 * delay)
+
+
+def is_short_turn(messages: List[Message]) -> bool:
+    """Check whether the last user turn is a greeting, thanks, or goodbye."""
+    return bool(_SHORT_TURN_PATTERN.match(_last_user_text(messages)))
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -98,6 +185,74 @@ class LLMProvider(ABC):
     It provides methods for chat completions and configuration.
     """
     
+    # Subclasses override these per instance
+    model: str = "gpt-4o-mini"
+    context_window: int = 128000
+    max_tokens: int = 300
+    
+    def count_tokens(self, messages: List[Message]) -> int:
+        """
+        Count prompt tokens for a list of messages.
+        
+        Contents seen recently (the system prompt, earlier turns) reuse
+        their cached counts; the rest are encoded in one batch call. The
+        chat format's fixed per-message and reply-priming overhead is added.
+        
+        Args:
+            messages: Conversation messages
+            
+        Returns:
+            Prompt token count
+        """
+        content_tokens = 0
+        uncounted = []
+        for m in messages:
+            cached = _message_token_counts.get((self.model, m.content))
+            if cached is None:
+                uncounted.append(m.content)
+            else:
+                content_tokens += cached
+        
+        if uncounted:
+            for content, n in zip(uncounted, count_tokens_batch(uncounted, self.model)):
+                _message_token_counts.set((self.model, content), n)
+                content_tokens += n
+        return content_tokens + _TOKENS_PER_MESSAGE * len(messages) + _REPLY_PRIMING_TOKENS
+    
+    def fit_context(
+        self,
+        context: str,
+        messages: List[Message],
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Truncate retrieved context so the prompt and response fit the window.
+        
+        Args:
+            context: Context text included in messages
+            messages: Fully built messages (system, history, and context)
+            max_tokens: Response budget (defaults to the provider's max_tokens)
+            
+        Returns:
+            The context unchanged if it fits, otherwise a truncated copy
+        """
+        response_budget = max_tokens or self.max_tokens
+        overflow = self.count_tokens(messages) + response_budget - self.context_window
+        if overflow <= 0:
+            return context
+        
+        context_tokens = count_tokens_batch([context], self.model)[0]
+        logger.warning(f"Prompt exceeds context window by {overflow} tokens, truncating context")
+        return truncate_to_tokens(context, context_tokens - overflow, self.model)
+    
+    def close(self) -> None:
+        """Release network resources held by the provider."""
+        pass
+    
+    async def aclose(self) -> None:
+        """Release network resources, including async ones."""
+        self.close()
+    
     @abstractmethod
     def chat(
         self,
@@ -137,6 +292,101 @@ class LLMProvider(ABC):
             Token strings as they're generated
         """
         pass
+    
+    async def achat(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> ChatResponse:
+        """
+        Generate a chat completion without blocking the event loop.
+        
+        The default runs chat() in a worker thread; providers with an
+        async HTTP client override it.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature override
+            max_tokens: Max response tokens override
+            
+        Returns:
+            ChatResponse with generated content
+        """
+        return await asyncio.to_thread(self.chat, messages, temperature, max_tokens)
+    
+    async def astream_chat(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a streaming chat completion without blocking the event loop.
+        
+        The default drives stream_chat() from a worker thread and hands
+        tokens to the loop as they arrive.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature override
+            max_tokens: Max response tokens override
+            
+        Yields:
+            Token strings as they're generated
+        """
+        loop = asyncio.get_running_loop()
+        tokens: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+        
+        def pump() -> None:
+            try:
+                for token in self.stream_chat(messages, temperature, max_tokens):
+                    loop.call_soon_threadsafe(tokens.put_nowait, ("token", token))
+            except Exception as e:
+                loop.call_soon_threadsafe(tokens.put_nowait, ("error", e))
+            else:
+                loop.call_soon_threadsafe(tokens.put_nowait, ("done", None))
+        
+        worker = loop.run_in_executor(None, pump)
+        while True:
+            kind, value = await tokens.get()
+            if kind == "token":
+                yield value
+            elif kind == "error":
+                raise value
+            else:
+                break
+        await worker
+    
+    def stream_chat_via_batch(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        chunk_delay: float = 0.0
+    ) -> Iterator[str]:
+        """
+        Generate a non-streaming completion and re-emit it as a stream.
+        
+        When the deployment's content filter releases streams in large
+        bursts anyway, a single non-streaming call often finishes sooner
+        overall. Callers that care about total latency more than time to
+        first token can use this as a drop-in for stream_chat().
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature override
+            max_tokens: Max response tokens override
+            chunk_delay: Seconds to pause between chunks (0 = no pacing)
+            
+        Yields:
+            The response word by word, with trailing whitespace
+        """
+        response = self.chat(messages, temperature=temperature, max_tokens=max_tokens)
+        for match in _WORD_CHUNK.finditer(response.content):
+            yield match.group(0)
+            if chunk_delay:
+                time.sleep(chunk_delay)
 
 
 class AzureLLMProvider(LLMProvider):
@@ -173,7 +423,8 @@ class AzureLLMProvider(LLMProvider):
         max_tokens: Optional[int] = None,
         presence_penalty: Optional[float] = None,
         frequency_penalty: Optional[float] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        cache: Optional[LLMCache] = None
     ):
         """
         Initialize the Azure LLM provider.
@@ -188,35 +439,203 @@ class AzureLLMProvider(LLMProvider):
             presence_penalty: Penalty for topic repetition (defaults to settings)
             frequency_penalty: Penalty for phrase repetition (defaults to settings)
             max_retries: Maximum retry attempts on failure
+            cache: Response cache for temperature-0 requests (defaults to settings)
         """
         self.api_key = api_key or settings.azure.api_key
         self.endpoint = endpoint or settings.azure.endpoint
         self.deployment = deployment or settings.azure.chat_deployment
         self.api_version = api_version or settings.azure.api_version
+        # Versions are "YYYY-MM-DD[-preview]", so the dates compare as strings
+        self._stream_usage = self.api_version[:10] >= _STREAM_OPTIONS_MIN_API_VERSION
         self.temperature = temperature if temperature is not None else settings.llm.temperature
         self.max_tokens = max_tokens if max_tokens is not None else settings.llm.max_tokens
         self.presence_penalty = presence_penalty if presence_penalty is not None else settings.llm.presence_penalty
         self.frequency_penalty = frequency_penalty if frequency_penalty is not None else settings.llm.frequency_penalty
         self.max_retries = max_retries
+        self.model = settings.llm.model
+        self.context_window = settings.llm.context_window
+        
+        # Request URL and headers are fixed for the provider's lifetime
+        base = self.endpoint.rstrip("/")
+        self._url_cached = (
+            f"{base}/openai/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
+        )
+        self._headers_cached: Mapping[str, str] = MappingProxyType({
+            "api-key": self.api_key,
+            "Content-Type": "application/json",
+            # Every encoding urllib3 can decode here (br/zstd only when their
+            # optional packages are installed); decoding is transparent,
+            # including for streamed responses.
+            "Accept-Encoding": ACCEPT_ENCODING
+        })
+        
+        # One session per provider: keep-alive reuses the TCP+TLS connection
+        # across calls instead of handshaking on every request. Retries are
+        # handled by _attempt(), so the adapter must not retry on its own.
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0)
+        )
+        self._session.headers.update(self._headers)
+        # Async session, created on first use inside the event loop
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Strong references to sessions being closed after a loop change
+        self._aio_closing: Set["asyncio.Task[None]"] = set()
+        # Identical temperature-0 requests (retries, reloads, summaries)
+        self.cache = cache or self._build_cache()
+        self.generative_cache = (
+            GenerativeCache(settings.llm.exact_cache_size, settings.llm.cache_ttl_seconds)
+            if settings.llm.generative_cache else None
+        )
+        self._loop_warned = False
+        
+        if settings.llm.prewarm_connection and self.endpoint:
+            threading.Thread(target=self._prewarm, name="llm-prewarm", daemon=True).start()
         
         logger.info(
             f"Initialized AzureLLMProvider: deployment={self.deployment}, "
             f"temperature={self.temperature}, max_tokens={self.max_tokens}"
         )
     
+    @staticmethod
+    def _build_cache() -> LLMCache:
+        """Create the response cache configured in settings."""
+        backend = None
+        if settings.llm.cache_redis_url:
+            backend = RedisCacheBackend(settings.llm.cache_redis_url)
+        
+        embed_fn = None
+        if settings.llm.semantic_cache:
+            from src.core.embeddings import AzureEmbeddingProvider
+            embed_fn = AzureEmbeddingProvider().embed
+        
+        return LLMCache(
+            backend=backend,
+            ttl_seconds=settings.llm.cache_ttl_seconds,
+            maxsize=settings.llm.exact_cache_size,
+            embed_fn=embed_fn,
+            similarity_threshold=settings.llm.semantic_cache_threshold
+        )
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._session.close()
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections, sync and async."""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self.close()
+    
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        """
+        Get the async session for the running event loop.
+        
+        aiohttp sessions are bound to the loop they were created on, so
+        the session is created lazily on first async use.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_session.closed or self._aio_loop is not loop:
+            self._discard_aio_session()
+            # aiohttp negotiates Accept-Encoding itself for what it can decode
+            headers = {k: v for k, v in self._headers.items() if k != "Accept-Encoding"}
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1]
+                )
+            )
+            self._aio_loop = loop
+        return self._aio_session
+    
+    def _discard_aio_session(self) -> None:
+        """Close the async session created on a previous event loop."""
+        session, loop = self._aio_session, self._aio_loop
+        self._aio_session = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # Still running on another thread; close it there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # Its loop has finished, so there is nothing left to await; closing
+        # releases the connector without the "Unclosed client session" warning
+        task = asyncio.get_running_loop().create_task(session.close())
+        self._aio_closing.add(task)
+        task.add_done_callback(self._aio_closing.discard)
+    
+    def _prewarm(self) -> None:
+        """
+        Open the pooled connection ahead of the first chat call.
+        
+        DNS, TCP and TLS setup happen here in the background, so the first
+        user-facing request reuses a warm connection. Any response (even
+        404) is fine; errors are ignored.
+        """
+        base = self.endpoint.rstrip("/")
+        try:
+            self._session.head(
+                f"{base}/openai/deployments/{self.deployment}?api-version={self.api_version}",
+                timeout=5
+            )
+            logger.debug("LLM connection pre-warmed")
+        except requests.RequestException as e:
+            logger.debug(f"LLM connection pre-warm failed: {e}")
+    
     @property
     def _url(self) -> str:
-        """Construct the Azure OpenAI chat completion API URL."""
-        base = self.endpoint.rstrip("/")
-        return f"{base}/openai/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
+        """Azure OpenAI chat completion API URL (built once in __init__)."""
+        return self._url_cached
     
     @property
-    def _headers(self) -> Dict[str, str]:
-        """Return HTTP headers for API requests."""
-        return {
-            "api-key": self.api_key,
-            "Content-Type": "application/json"
+    def _headers(self) -> Mapping[str, str]:
+        """HTTP headers for API requests (built once in __init__)."""
+        return self._headers_cached
+    
+    def _build_body(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        presence_penalty: Optional[float] = None,
+        frequency_penalty: Optional[float] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completion request body.
+        
+        Greeting/goodbye turns get a small completion budget and stop
+        sequences unless the caller passed an explicit max_tokens. The
+        completion budget is always capped to what is left of the context
+        window, so oversized prompts do not come back as 400s.
+        """
+        body: Dict[str, Any] = {
+            # orjson serializes Message dataclasses natively, so no
+            # per-message dicts are built
+            "messages": messages,
+            "temperature": temperature if temperature is not None else self.temperature,
+            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
+            "presence_penalty": presence_penalty if presence_penalty is not None else self.presence_penalty,
+            "frequency_penalty": frequency_penalty if frequency_penalty is not None else self.frequency_penalty
         }
+        
+        if max_tokens is None and is_short_turn(messages):
+            body["max_tokens"] = min(body["max_tokens"], settings.llm.short_reply_max_tokens)
+            body["stop"] = SHORT_TURN_STOP_SEQUENCES
+        
+        room = self.context_window - self.count_tokens(messages) - _CONTEXT_SAFETY_TOKENS
+        if body["max_tokens"] > room:
+            body["max_tokens"] = max(room, 1)
+        
+        if stream:
+            body["stream"] = True
+            if self._stream_usage:
+                body["stream_options"] = {"include_usage": True}
+        
+        return body
     
     def chat(
         self,
@@ -242,56 +661,378 @@ class AzureLLMProvider(LLMProvider):
         Raises:
             requests.RequestException: If API call fails after retries
         """
-        # Prepare request body with all parameters for natural responses
-        body = {
-            "messages": [m.to_dict() for m in messages],
-            "temperature": temperature if temperature is not None else self.temperature,
-            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
-            "presence_penalty": presence_penalty if presence_penalty is not None else self.presence_penalty,
-            "frequency_penalty": frequency_penalty if frequency_penalty is not None else self.frequency_penalty
-        }
+        self._warn_if_event_loop()
+        body = self._build_body(
+            messages, temperature, max_tokens, presence_penalty, frequency_penalty
+        )
+        
+        # Only deterministic requests are cacheable
+        cacheable = body["temperature"] == 0
+        if cacheable:
+            cached = self._cache_get(body, messages)
+            if cached is not None:
+                return cached
+        
+        response = self._parse_response(self._post(body))
+        if cacheable:
+            self._cache_set(body, messages, response)
+        return response
+    
+    async def achat(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        presence_penalty: Optional[float] = None,
+        frequency_penalty: Optional[float] = None
+    ) -> ChatResponse:
+        """
+        Generate a chat completion without blocking the event loop.
+        
+        Same as chat(), but uses aiohttp and asyncio.sleep for retry
+        backoff, so concurrent conversations overlap on the network
+        instead of each holding a thread.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            presence_penalty: Override default presence penalty
+            frequency_penalty: Override default frequency penalty
+            
+        Returns:
+            ChatResponse with generated content and usage stats
+            
+        Raises:
+            aiohttp.ClientError: If API call fails after retries
+        """
+        body = self._build_body(
+            messages, temperature, max_tokens, presence_penalty, frequency_penalty
+        )
+        
+        cacheable = body["temperature"] == 0
+        # The semantic tier makes an embedding call, so keep it off the loop
+        semantic = self.cache.embed_fn is not None
+        if cacheable:
+            if semantic:
+                cached = await asyncio.to_thread(self._cache_get, body, messages)
+            else:
+                cached = self._cache_get(body, messages)
+            if cached is not None:
+                return cached
+        
+        response = self._parse_response(await self._apost(body))
+        if cacheable:
+            if semantic:
+                await asyncio.to_thread(self._cache_set, body, messages, response)
+            else:
+                self._cache_set(body, messages, response)
+        return response
+    
+    def _warn_if_event_loop(self) -> None:
+        """Warn once if the blocking chat() is called on an event loop thread."""
+        if self._loop_warned:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._loop_warned = True
+        logger.warning("chat() called from a running event loop; use achat() to avoid blocking it")
+    
+    def _cache_get(self, body: Dict[str, Any], messages: List[Message]) -> Optional[ChatResponse]:
+        """Look up a cached response; cache hits report zero token usage."""
+        keyed_body = {**body, "deployment": self.deployment}
+        question = _last_user_text(messages)
+        
+        if self.generative_cache:
+            content = self.generative_cache.get(keyed_body, question)
+            if content is not None:
+                logger.debug("Chat completion built from cached template")
+                return ChatResponse(content=content, model=self.deployment, finish_reason="stop")
+        
+        cached = self.cache.get(keyed_body, question)
+        if cached is None:
+            return None
+        logger.debug("Chat completion served from cache")
+        return ChatResponse(**cached)
+    
+    def _cache_set(self, body: Dict[str, Any], messages: List[Message], response: ChatResponse) -> None:
+        """Store a response in the cache."""
+        keyed_body = {**body, "deployment": self.deployment}
+        question = _last_user_text(messages)
+        self.cache.set(
+            keyed_body,
+            {
+                "content": response.content,
+                "model": response.model,
+                "finish_reason": response.finish_reason,
+            },
+            question
+        )
+        if self.generative_cache:
+            self.generative_cache.set(keyed_body, question, response.content)
+    
+    def _parse_response(self, data: Dict[str, Any]) -> ChatResponse:
+        """Build a ChatResponse from a chat completion response."""
+        choice = data["choices"][0]
+        content = choice["message"]["content"]
+        
+        # Azure always sends these keys; only fall back to defaults if not
+        try:
+            return ChatResponse(
+                content=content,
+                model=data["model"],
+                usage=data["usage"],
+                finish_reason=choice["finish_reason"]
+            )
+        except KeyError:
+            return ChatResponse(
+                content=content,
+                model=data.get("model", self.deployment),
+                usage=data.get("usage", {}),
+                finish_reason=choice.get("finish_reason", "")
+            )
+    
+    def _attempt(self, payload: bytes, attempt: int) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Make one request attempt.
+        
+        Args:
+            payload: Serialized request body
+            attempt: Zero-based attempt number
+            
+        Returns:
+            (parsed response, 0) on success, or (None, seconds to wait) to retry
+            
+        Raises:
+            requests.RequestException: If the last attempt fails, or the
+                request was rejected with a non-retriable status
+        """
+        try:
+            response = self._session.post(
+                self._url,
+                data=payload,
+                timeout=REQUEST_TIMEOUT
+            )
+            
+            # Handle rate limiting; on the last attempt, raise_for_status() reports it
+            if response.status_code == 429 and attempt < self.max_retries - 1:
+                retry_after = _retry_after(response.headers.get("Retry-After"), attempt)
+                logger.warning(f"Rate limited, retrying in {retry_after:.1f}s")
+                return None, retry_after
+            
+            response.raise_for_status()
+            
+            return orjson.loads(response.content), 0
+            
+        except requests.RequestException as e:
+            if getattr(e.response, "status_code", None) in NON_RETRIABLE_STATUS_CODES:
+                logger.error(f"API call rejected: {e}")
+                raise
+            logger.warning(f"API call failed (attempt {attempt + 1}/{self.max_retries}): {e}")
+            if attempt >= self.max_retries - 1:
+                raise
+            return None, 2 ** attempt
+    
+    def _post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a chat completion request with retries.
         
-        last_exception = None
+        Args:
+            body: Request body
+            
+        Returns:
+            Parsed JSON response
+            
+        Raises:
+            requests.RequestException: If API call fails after retries
+        """
+        # Serialized once and reused by every retry
+        payload = orjson.dumps(body)
         
         for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self._url,
-                    headers=self._headers,
-                    json=body,
-                    timeout=60
-                )
-                
-                # Handle rate limiting
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 2 ** attempt))
-                    logger.warning(f"Rate limited, retrying in {retry_after}s")
-                    time.sleep(retry_after)
-                    continue
+            data, wait = self._attempt(payload, attempt)
+            if data is not None:
+                return data
+            time.sleep(wait)
+        
+        raise RuntimeError("Failed to get chat completion")
+    
+    async def _aattempt(self, payload: bytes, attempt: int) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Make one async request attempt (see _attempt()).
+        
+        Raises:
+            aiohttp.ClientError: If the last attempt fails
+        """
+        try:
+            async with self._get_aio_session().post(self._url, data=payload) as response:
+                # Handle rate limiting; on the last attempt, raise_for_status() reports it
+                if response.status == 429 and attempt < self.max_retries - 1:
+                    retry_after = _retry_after(response.headers.get("Retry-After"), attempt)
+                    logger.warning(f"Rate limited, retrying in {retry_after:.1f}s")
+                    return None, retry_after
                 
                 response.raise_for_status()
                 
-                data = response.json()
-                
-                # Extract response content
-                choice = data["choices"][0]
-                content = choice["message"]["content"]
-                
-                return ChatResponse(
-                    content=content,
-                    model=data.get("model", self.deployment),
-                    usage=data.get("usage", {}),
-                    finish_reason=choice.get("finish_reason", "")
-                )
+                return orjson.loads(await response.read()), 0
                 
-            except requests.RequestException as e:
-                last_exception = e
-                wait_time = 2 ** attempt
-                logger.warning(f"API call failed (attempt {attempt + 1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(wait_time)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if getattr(e, "status", None) in NON_RETRIABLE_STATUS_CODES:
+                logger.error(f"API call rejected: {e}")
+                raise
+            logger.warning(f"API call failed (attempt {attempt + 1}/{self.max_retries}): {e}")
+            if attempt >= self.max_retries - 1:
+                raise
+            return None, 2 ** attempt
+    
+    async def _apost(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Async _post(): non-blocking HTTP and backoff."""
+        payload = orjson.dumps(body)
+        
+        for attempt in range(self.max_retries):
+            data, wait = await self._aattempt(payload, attempt)
+            if data is not None:
+                return data
+            await asyncio.sleep(wait)
+        
+        raise RuntimeError("Failed to get chat completion")
+    
+    def chat_candidates(
+        self,
+        messages: List[Message],
+        n: int,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> List[ChatResponse]:
+        """
+        Generate several completions for the same prompt in one call.
+        
+        Uses the API's ``n`` parameter, so the shared prompt (system prompt
+        and context) is processed once for all candidates. Useful for e.g.
+        an answer plus a safety double-check sample.
+        
+        Args:
+            messages: List of conversation messages
+            n: Number of candidates
+            temperature: Override default temperature
+            max_tokens: Override default max tokens (per candidate)
+            
+        Returns:
+            One ChatResponse per candidate; usage is for the whole call
+        """
+        body = self._build_body(messages, temperature, max_tokens)
+        body["n"] = n
+        data = self._post(body)
+        
+        model = data.get("model", self.deployment)
+        usage = data.get("usage", {})
+        return [
+            ChatResponse(
+                content=choice["message"]["content"],
+                model=model,
+                usage=usage,
+                finish_reason=choice.get("finish_reason", "")
+            )
+            for choice in data["choices"]
+        ]
+    
+    async def chat_batch(
+        self,
+        batch: List[List[Message]],
+        max_concurrency: int = 8,
+        **kwargs: Any
+    ) -> List[ChatResponse]:
+        """
+        Run independent chat completions concurrently.
+        
+        The API has no multi-prompt request, so independent conversations
+        are fanned out as parallel calls, bounded by a semaphore.
+        
+        Args:
+            batch: Message lists, one per completion
+            max_concurrency: Maximum requests in flight
+            **kwargs: Extra arguments passed to achat()
+            
+        Returns:
+            ChatResponses in the same order as batch
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(messages: List[Message]) -> ChatResponse:
+            async with semaphore:
+                return await self.achat(messages, **kwargs)
+        
+        return await asyncio.gather(*(run(messages) for messages in batch))
+    
+    def chat_many(
+        self,
+        batch: List[List[Message]],
+        max_workers: int = 16,
+        **kwargs: Any
+    ) -> List[ChatResponse]:
+        """
+        Run independent chat completions concurrently from sync code.
+        
+        Thread-pool counterpart of chat_batch(). The calls are I/O-bound,
+        so threads overlap their waits and share the pooled session.
+        
+        Args:
+            batch: Message lists, one per completion
+            max_workers: Maximum requests in flight
+            **kwargs: Extra arguments passed to chat()
+            
+        Returns:
+            ChatResponses in the same order as batch
+        """
+        if not batch:
+            return []
+        if len(batch) == 1:
+            return [self.chat(batch[0], **kwargs)]
+        
+        with ThreadPoolExecutor(max_workers=min(len(batch), max_workers)) as executor:
+            return list(executor.map(lambda messages: self.chat(messages, **kwargs), batch))
+    
+    def chat_speculative(
+        self,
+        messages_provider: Callable[[], List[Message]],
+        partial_messages: List[Message],
+        **kwargs: Any
+    ) -> ChatResponse:
+        """
+        Start a completion before the final messages are known.
+        
+        The completion for ``partial_messages`` (e.g. built from an early or
+        cached retrieval) runs in the background while ``messages_provider``
+        builds the final messages. If both message lists match, the
+        speculative result is used and retrieval time overlaps the LLM call;
+        otherwise it is discarded and the final messages are sent.
+        
+        Args:
+            messages_provider: Callable returning the final messages
+            partial_messages: Best-guess messages to start generating from
+            **kwargs: Extra arguments passed to chat()
+            
+        Returns:
+            ChatResponse for the final messages
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            speculative = executor.submit(self.chat, partial_messages, **kwargs)
+            final_messages = messages_provider()
+            
+            if final_messages == partial_messages:
+                logger.debug("Speculative completion accepted")
+                return speculative.result()
+            
+            # A running request cannot be aborted; its result is simply ignored.
+            speculative.cancel()
+            logger.debug("Speculative completion discarded, messages changed")
+        finally:
+            executor.shutdown(wait=False)
         
-        raise last_exception or RuntimeError("Failed to get chat completion")
+        return self.chat(final_messages, **kwargs)
     
     def stream_chat(
         self,
@@ -316,47 +1057,106 @@ class AzureLLMProvider(LLMProvider):
         Yields:
             Token strings as generated
         """
-        # Prepare request body with streaming enabled and natural response params
-        body = {
-            "messages": [m.to_dict() for m in messages],
-            "temperature": temperature if temperature is not None else self.temperature,
-            "max_tokens": max_tokens if max_tokens is not None else self.max_tokens,
-            "presence_penalty": presence_penalty if presence_penalty is not None else self.presence_penalty,
-            "frequency_penalty": frequency_penalty if frequency_penalty is not None else self.frequency_penalty,
-            "stream": True
-        }
+        body = self._build_body(
+            messages, temperature, max_tokens, presence_penalty, frequency_penalty, stream=True
+        )
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 self._url,
-                headers=self._headers,
-                json=body,
-                timeout=60,
+                data=orjson.dumps(body),
+                timeout=REQUEST_TIMEOUT,
                 stream=True
             )
             response.raise_for_status()
             
-            # Process SSE stream
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode("utf-8")
-                    if line.startswith("data: "):
-                        data_str = line[6:]
-                        if data_str == "[DONE]":
-                            break
-                        try:
-                            data = json.loads(data_str)
-                            if "choices" in data and len(data["choices"]) > 0:
-                                delta = data["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                        except (KeyError, json.JSONDecodeError, IndexError):
-                            continue
+            # Process SSE stream. Lines stay as bytes (orjson parses them
+            # without a str decode) and lookups are bound outside the loop.
+            loads = orjson.loads
+            decode_error = orjson.JSONDecodeError
+            prefix = _SSE_DATA_PREFIX
+            prefix_len = _SSE_DATA_PREFIX_LEN
+            done = _SSE_DONE
+            for line in response.iter_lines(decode_unicode=False):
+                if not line.startswith(prefix):
+                    continue
+                payload = line[prefix_len:]
+                if payload == done:
+                    break
+                try:
+                    data = loads(payload)
+                except decode_error:
+                    continue
+                # Final chunk carries usage only (stream_options.include_usage)
+                usage = data.get("usage")
+                if usage:
+                    logger.debug(f"Stream usage: {usage}")
+                choices = data.get("choices")
+                if choices:
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
                             
         except requests.RequestException as e:
             logger.error(f"Streaming chat failed: {e}")
             raise
+    
+    async def astream_chat(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        presence_penalty: Optional[float] = None,
+        frequency_penalty: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a streaming chat completion without blocking the event loop.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            presence_penalty: Override default presence penalty
+            frequency_penalty: Override default frequency penalty
+            
+        Yields:
+            Token strings as generated
+        """
+        body = self._build_body(
+            messages, temperature, max_tokens, presence_penalty, frequency_penalty, stream=True
+        )
+        
+        try:
+            async with self._get_aio_session().post(self._url, data=orjson.dumps(body)) as response:
+                response.raise_for_status()
+                
+                loads = orjson.loads
+                decode_error = orjson.JSONDecodeError
+                prefix = _SSE_DATA_PREFIX
+                prefix_len = _SSE_DATA_PREFIX_LEN
+                done = _SSE_DONE
+                async for line in response.content:
+                    if not line.startswith(prefix):
+                        continue
+                    payload = line[prefix_len:].rstrip()
+                    if payload == done:
+                        break
+                    try:
+                        data = loads(payload)
+                    except decode_error:
+                        continue
+                    usage = data.get("usage")
+                    if usage:
+                        logger.debug(f"Stream usage: {usage}")
+                    choices = data.get("choices")
+                    if choices:
+                        content = (choices[0].get("delta") or {}).get("content")
+                        if content:
+                            yield content
+                        
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Streaming chat failed: {e}")
+            raise
 
 
 # Prompt templates for RAG
@@ -416,19 +1216,31 @@ STYLE
 - End with one follow-up question OR two options.
 """
 
-RAG_USER_TEMPLATE = """Context:
-{context}
+HISTORY_SUMMARY_PROMPT = """Summarize this customer support conversation in 2-3 short sentences.
+Keep facts the customer gave (names, numbers, service codes, ticket IDs) and any open requests.
+Do not add anything that was not said."""
 
-Customer: "{question}"
+# Context and the customer's turn are separate messages placed after the
+# history, so the system prompt and earlier turns form a byte-identical
+# prefix across turns that provider-side prompt caching can reuse.
+RAG_CONTEXT_TEMPLATE = """Context:
+{context}"""
+
+RAG_USER_TEMPLATE = """Customer: "{question}"
 
 Use the system rules above. Maintain memory of this chat."""
 
+# Template pieces around the placeholders, so messages are built with a
+# single join instead of format-spec parsing plus concatenation
+_RAG_CONTEXT_HEAD = RAG_CONTEXT_TEMPLATE.partition("{context}")[0]
+_RAG_USER_HEAD, _, _RAG_USER_TAIL = RAG_USER_TEMPLATE.partition("{question}")
+
 
 def build_rag_messages(
     question: str,
     context: str,
     system_prompt: Optional[str] = None,
-    conversation_history: Optional[List[Message]] = None,
+    conversation_history: Optional[Sequence[Message]] = None,
     session_status: Optional[str] = None
 ) -> List[Message]:
     """
@@ -451,9 +1263,12 @@ def build_rag_messages(
     if conversation_history:
         messages.extend(conversation_history)
     
-    # Add user message with context
-    status_line = f"\n\nSession: {session_status}" if session_status else ""
-    user_content = RAG_USER_TEMPLATE.format(context=context, question=question) + status_line
+    # Add per-turn context, then the user message (static prefix first)
+    messages.append(Message(role="system", content=_RAG_CONTEXT_HEAD + context))
+    if session_status:
+        user_content = "".join((_RAG_USER_HEAD, question, _RAG_USER_TAIL, "\n\nSession: ", session_status))
+    else:
+        user_content = "".join((_RAG_USER_HEAD, question, _RAG_USER_TAIL))
     messages.append(Message(role="user", content=user_content))
     
     return messages
@@ -0,0 +1,164 @@
+"""
+Micro-Batching Module
+
+Collects concurrent async requests into small batches for a dispatch
+callback, shared by BatchingAzureLLMProvider and BatchingRetriever.
+
+Requests arriving within a short window (or until the batch is full) are
+handed to the callback together as (item, future) pairs; the callback
+resolves each future. A batch is dispatched without waiting for the
+previous one, so the next batch can start filling meanwhile.
+
+Usage:
+    from src.core.microbatch import MicroBatcher
+
+    async def dispatch(batch):
+        for item, future in batch:
+            future.set_result(item * 2)
+
+    batcher = MicroBatcher(dispatch, max_batch=8, max_wait_ms=20)
+    result = await batcher.submit(21)
+    await batcher.aclose()
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Async micro-batcher in front of a dispatch callback.
+
+    The worker task lives on the event loop that first submits to it and
+    is restarted if a later submit comes from another loop. If the
+    callback raises, the error is raised to every caller in its batch;
+    callers still queued when the batcher is closed get a RuntimeError.
+
+    Example:
+        batcher = MicroBatcher(dispatch, max_batch=32, max_wait_ms=50)
+
+        results = await asyncio.gather(batcher.submit(a), batcher.submit(b))
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[Tuple[T, "asyncio.Future[R]"]]], Awaitable[None]],
+        max_batch: int,
+        max_wait_ms: float,
+        name: str = "Micro-batcher"
+    ):
+        """
+        Initialize the micro-batcher.
+
+        Args:
+            dispatch: Called with each batch of (item, future) pairs; must
+                resolve every future
+            max_batch: Maximum items per batch
+            max_wait_ms: Maximum time to wait for a batch to fill
+            name: Name used in log and error messages
+        """
+        self.dispatch = dispatch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self._queue: Optional["asyncio.Queue[Tuple[T, asyncio.Future[R]]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        # Strong references to in-flight dispatch tasks
+        self._dispatching: Set["asyncio.Task[None]"] = set()
+
+    async def submit(self, item: T) -> R:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item: Request passed to the dispatch callback
+
+        Returns:
+            The result the callback set for this item
+        """
+        self._ensure_worker()
+        future: "asyncio.Future[R]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop the worker, failing queued items."""
+        worker = self._stop_worker()
+        if worker is not None and worker.get_loop() is asyncio.get_running_loop():
+            # Let the worker fail its queued items before returning
+            await asyncio.gather(worker, return_exceptions=True)
+
+    def _ensure_worker(self) -> None:
+        """Start the worker on the running loop if needed."""
+        worker = self._worker
+        if worker is None or worker.done() or worker.get_loop() is not asyncio.get_running_loop():
+            self._stop_worker()
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(self._queue))
+
+    def _stop_worker(self) -> Optional["asyncio.Task[None]"]:
+        """Cancel the worker on its own loop; it fails whatever is still queued."""
+        worker = self._worker
+        self._worker = None
+        self._queue = None
+        if worker is None or worker.done():
+            return None
+        loop = worker.get_loop()
+        if loop is asyncio.get_running_loop():
+            worker.cancel()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(worker.cancel)
+        return worker
+
+    async def _run(self, queue: "asyncio.Queue[Tuple[T, asyncio.Future[R]]]") -> None:
+        """Collect batches from the queue and dispatch them."""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[T, "asyncio.Future[R]"]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Dispatch without waiting, so the next batch can start filling
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatching.add(task)
+                task.add_done_callback(self._dispatching.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Nobody will dispatch these now; don't leave their callers waiting
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            fail_pending(batch, RuntimeError(f"{self.name} was closed"))
+            raise
+
+    async def _dispatch(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        """Run the callback, failing every unresolved caller if it raises."""
+        try:
+            await self.dispatch(batch)
+        except Exception as e:
+            logger.error(f"{self.name} batch of {len(batch)} failed: {e}")
+            fail_pending(batch, e)
+
+
+def fail_pending(pending: Iterable[Tuple[object, "asyncio.Future[R]"]], error: BaseException) -> None:
+    """Raise an error to every caller still waiting on these items."""
+    for _, future in pending:
+        if not future.done():
+            future.set_exception(error)
@@ -14,15 +14,27 @@ Usage:
     
     # Text-to-speech
     service.speak("Hello, how can I help you?")
+    
+    # Speak an LLM stream sentence by sentence as it is generated
+    answer = service.speak_stream(llm.stream_chat(messages))
 """
 
+import re
+import threading
 import azure.cognitiveservices.speech as speechsdk
-from typing import Optional, Callable
+from typing import Any, Optional, Callable, Iterable, List
 from src.config import settings
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# End of a sentence: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r"[.!?]\s")
+
+# PCM format pushed into the recognizer when SPEECH_PUSH_AUDIO is enabled
+PUSH_SAMPLE_RATE = 16000
+PUSH_BLOCK_FRAMES = 1600  # 100 ms
+
 
 class SpeechService:
     """
@@ -55,13 +67,25 @@ class SpeechService:
         self._speech_config.speech_synthesis_voice_name = settings.speech.voice_name
         
         # Create audio configs
-        self._audio_input_config = speechsdk.audio.AudioConfig(
-            use_default_microphone=True
-        )
+        self._push_stream: Optional[speechsdk.audio.PushAudioInputStream] = None
+        self._mic_stream: Any = None
+        self._listening = threading.Event()
+        if settings.speech.push_audio:
+            self._audio_input_config = self._open_push_audio()
+        else:
+            self._audio_input_config = speechsdk.audio.AudioConfig(
+                use_default_microphone=True
+            )
         self._audio_output_config = speechsdk.audio.AudioOutputConfig(
             use_default_speaker=True
         )
         
+        # Long-lived recognizer and synthesizer: they keep their Speech
+        # service connections and audio devices open across calls instead
+        # of reopening them each time
+        self._recognizer: Optional[speechsdk.SpeechRecognizer] = None
+        self._synthesizer: Optional[speechsdk.SpeechSynthesizer] = None
+        
         logger.info(
             f"Speech service initialized: region={settings.speech.region}, "
             f"language={settings.speech.language}, voice={settings.speech.voice_name}"
@@ -84,13 +108,10 @@ class SpeechService:
         """
         timeout = timeout or settings.speech.speech_timeout
         
-        # Create recognizer
-        recognizer = speechsdk.SpeechRecognizer(
-            speech_config=self._speech_config,
-            audio_config=self._audio_input_config
-        )
+        recognizer = self._get_recognizer()
         
-        # Set up interim results callback if provided
+        # Set up interim results callback (replacing any from a previous call)
+        recognizer.recognizing.disconnect_all()
         if on_recognizing:
             def recognizing_handler(evt):
                 if evt.result.text:
@@ -100,7 +121,11 @@ class SpeechService:
         logger.debug("Listening for speech...")
         
         # Perform recognition
-        result = recognizer.recognize_once_async().get()
+        self._listening.set()
+        try:
+            result = recognizer.recognize_once_async().get()
+        finally:
+            self._listening.clear()
         
         # Handle result
         if result is None:
@@ -145,13 +170,11 @@ class SpeechService:
         if not text:
             return False
         
-        # Create synthesizer
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=self._speech_config,
-            audio_config=self._audio_output_config
-        )
+        synthesizer = self._get_synthesizer()
         
-        # Set up callbacks
+        # Set up callbacks (replacing any from a previous call)
+        synthesizer.synthesis_started.disconnect_all()
+        synthesizer.synthesis_completed.disconnect_all()
         if on_started:
             synthesizer.synthesis_started.connect(lambda evt: on_started())
         if on_completed:
@@ -162,7 +185,132 @@ class SpeechService:
         # Perform synthesis
         result = synthesizer.speak_text_async(text).get()
         
-        # Handle result
+        return self._check_synthesis(result)
+    
+    def speak_stream(
+        self,
+        tokens: Iterable[str],
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Speak streamed text sentence by sentence as it arrives.
+        
+        Each complete sentence is queued on the synthesizer as soon as it
+        is generated, so the first sentence plays while the rest of the
+        response is still being produced.
+        
+        Args:
+            tokens: Text chunks, e.g. from AzureLLMProvider.stream_chat()
+            on_token: Optional callback for each chunk (e.g. to print it)
+            
+        Returns:
+            The full text that was spoken
+        """
+        synthesizer = self._get_synthesizer()
+        synthesizer.synthesis_started.disconnect_all()
+        synthesizer.synthesis_completed.disconnect_all()
+        
+        pending: List[speechsdk.ResultFuture] = []
+        parts: List[str] = []
+        buffer = ""
+        
+        for token in tokens:
+            if on_token:
+                on_token(token)
+            parts.append(token)
+            buffer += token
+            
+            # Queue every complete sentence; the synthesizer plays them in order
+            match = None
+            for match in _SENTENCE_END.finditer(buffer):
+                pass
+            if match:
+                sentence, buffer = buffer[:match.end()].strip(), buffer[match.end():]
+                pending.append(synthesizer.speak_text_async(sentence))
+        
+        if buffer.strip():
+            pending.append(synthesizer.speak_text_async(buffer.strip()))
+        
+        # Wait for playback to finish in order
+        for future in pending:
+            self._check_synthesis(future.get())
+        
+        return "".join(parts)
+    
+    def close(self) -> None:
+        """Stop the microphone stream opened for push audio, if any."""
+        if self._mic_stream is not None:
+            self._mic_stream.stop()
+            self._mic_stream.close()
+            self._mic_stream = None
+        if self._push_stream is not None:
+            self._push_stream.close()
+            self._push_stream = None
+    
+    def _open_push_audio(self) -> speechsdk.audio.AudioConfig:
+        """
+        Open the microphone once and feed it to the recognizer via a push stream.
+        
+        The device stays open for the life of the service. Audio is only
+        pushed while a recognition is in progress, so speech played back
+        between turns is not picked up as the next utterance.
+        
+        Returns:
+            Audio config reading from the push stream
+            
+        Raises:
+            ImportError: If sounddevice is not installed
+        """
+        try:
+            import sounddevice
+        except ImportError as e:
+            raise ImportError("SPEECH_PUSH_AUDIO requires: pip install sounddevice") from e
+        
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=PUSH_SAMPLE_RATE,
+            bits_per_sample=16,
+            channels=1
+        )
+        push_stream = speechsdk.audio.PushAudioInputStream(stream_format)
+        listening = self._listening
+        
+        # Runs on the audio driver's thread
+        def on_audio(indata, frames, time_info, status):
+            if listening.is_set():
+                push_stream.write(bytes(indata))
+        
+        self._mic_stream = sounddevice.RawInputStream(
+            samplerate=PUSH_SAMPLE_RATE,
+            blocksize=PUSH_BLOCK_FRAMES,
+            channels=1,
+            dtype="int16",
+            callback=on_audio
+        )
+        self._mic_stream.start()
+        self._push_stream = push_stream
+        
+        return speechsdk.audio.AudioConfig(stream=push_stream)
+    
+    def _get_recognizer(self) -> speechsdk.SpeechRecognizer:
+        """Get the shared speech recognizer, creating it on first use."""
+        if self._recognizer is None:
+            self._recognizer = speechsdk.SpeechRecognizer(
+                speech_config=self._speech_config,
+                audio_config=self._audio_input_config
+            )
+        return self._recognizer
+    
+    def _get_synthesizer(self) -> speechsdk.SpeechSynthesizer:
+        """Get the shared speech synthesizer, creating it on first use."""
+        if self._synthesizer is None:
+            self._synthesizer = speechsdk.SpeechSynthesizer(
+                speech_config=self._speech_config,
+                audio_config=self._audio_output_config
+            )
+        return self._synthesizer
+    
+    def _check_synthesis(self, result: Optional[speechsdk.SpeechSynthesisResult]) -> bool:
+        """Log a synthesis result and report whether it succeeded."""
         if result is None:
             logger.warning("Synthesis returned no result")
             return False
@@ -190,10 +338,9 @@ class SpeechService:
         Returns:
             True if synthesis succeeded, False otherwise
         """
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=self._speech_config,
-            audio_config=self._audio_output_config
-        )
+        synthesizer = self._get_synthesizer()
+        synthesizer.synthesis_started.disconnect_all()
+        synthesizer.synthesis_completed.disconnect_all()
         
         result = synthesizer.speak_ssml_async(ssml).get()
         
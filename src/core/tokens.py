@@ -0,0 +1,119 @@
+"""
+Token Counting Module
+
+Shared tiktoken encoders for prompt budgeting.
+
+Encoders are loaded once per process and reused. If an encoding cannot be
+loaded (e.g. the BPE files are not cached and there is no network), token
+counts fall back to the usual 4-characters-per-token approximation so prompt
+budgeting keeps working.
+
+Usage:
+    from src.core.tokens import count_tokens
+
+    n = count_tokens("How do I activate roaming?")
+"""
+
+import os
+from functools import lru_cache
+from typing import List, Optional
+
+import tiktoken
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Model name -> tiktoken encoding name
+MODEL_ENCODINGS = {
+    "gpt-4o-mini": "o200k_base",
+    "gpt-4o": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+    "text-embedding-3-large": "cl100k_base",
+    "text-embedding-3-small": "cl100k_base",
+}
+
+
+@lru_cache(maxsize=8)
+def get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once and reuse it."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+@lru_cache(maxsize=8)
+def get_model_encoding(model: str = DEFAULT_MODEL) -> Optional[tiktoken.Encoding]:
+    """
+    Get the encoder for a model, or None if it cannot be loaded.
+
+    Failures are cached too, so an offline host only pays for one attempt.
+    """
+    encoding_name = MODEL_ENCODINGS.get(model, "cl100k_base")
+    try:
+        return get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"Tokenizer {encoding_name} unavailable, approximating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """
+    Count tokens in a text string.
+
+    Args:
+        text: Input text
+        model: Model whose tokenizer to use
+
+    Returns:
+        Exact token count, or an approximation if the tokenizer is unavailable
+    """
+    encoder = get_model_encoding(model)
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode_ordinary(text))
+
+
+def count_tokens_batch(texts: List[str], model: str = DEFAULT_MODEL) -> List[int]:
+    """
+    Count tokens for many strings in one call.
+
+    Uses tiktoken's batch encoder, which runs BPE across threads in native code.
+
+    Args:
+        texts: Input strings
+        model: Model whose tokenizer to use
+
+    Returns:
+        Token count per input string
+    """
+    encoder = get_model_encoding(model)
+    if encoder is None:
+        return [(len(text) + 3) // 4 for text in texts]
+    encoded = encoder.encode_ordinary_batch(texts, num_threads=os.cpu_count() or 1)
+    return [len(tokens) for tokens in encoded]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """
+    Truncate text to at most max_tokens tokens.
+
+    Args:
+        text: Input text
+        max_tokens: Token limit
+        model: Model whose tokenizer to use
+
+    Returns:
+        The text unchanged if it fits, otherwise its first max_tokens tokens
+    """
+    if max_tokens <= 0:
+        return ""
+    encoder = get_model_encoding(model)
+    if encoder is None:
+        max_chars = max_tokens * 4
+        return text if len(text) <= max_chars else text[:max_chars]
+    tokens = encoder.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])
@@ -5,7 +5,7 @@ This module provides abstractions and implementations for vector storage and sea
 It stores document embeddings and enables fast similarity-based retrieval.
 
 Architecture:
-- VectorStore: Abstract base class defining the interface (ISP)
+- VectorStore: Protocol defining the interface (ISP)
 - ChromaVectorStore: Concrete implementation using ChromaDB
 - Support for metadata storage and filtering
 
@@ -23,12 +23,17 @@ Usage:
     results = store.search(query_embedding, top_k=5)
 """
 
-from abc import ABC, abstractmethod
+import os
 from dataclasses import dataclass, field
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Sequence, cast
+from typing import (
+    List, Optional, Dict, Any, Protocol, Sequence, Set, Tuple, Union, cast, runtime_checkable
+)
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 
 from src.config import settings
@@ -36,6 +41,57 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# HNSW presets (collection metadata). M and construction_ef only take
+# effect when a collection is created; search_ef also sets the query-time
+# candidate list, and values well above top_k avoid hnswlib's "contiguous
+# 2D array" errors on small or filtered result sets.
+HNSW_PROFILES: Dict[str, Dict[str, int]] = {
+    "fast": {"hnsw:M": 16, "hnsw:construction_ef": 100, "hnsw:search_ef": 50},
+    "balanced": {"hnsw:M": 24, "hnsw:construction_ef": 128, "hnsw:search_ef": 100},
+    "recall-max": {"hnsw:M": 32, "hnsw:construction_ef": 200, "hnsw:search_ef": 200},
+}
+
+# Collection metadata key listing fields registered with create_metadata_index()
+INDEXED_FIELDS_KEY = "indexed_fields"
+
+# Version of the ID hashing used by Chunk.id and default document IDs,
+# stamped into collection metadata. Bump it whenever either changes: a
+# collection built with other IDs would get a second copy of every chunk
+# on re-ingest, so writes to it are refused until it is cleared.
+ID_SCHEME_KEY = "id_scheme"
+ID_SCHEME = 2
+
+
+@lru_cache(maxsize=256)
+def _canon_filter(frozen_items: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    """
+    Build a Chroma where clause from sorted (key, value) pairs.
+    
+    Chroma accepts a single condition per where dict, so several plain
+    equality filters are combined under $and in a stable key order.
+    """
+    if len(frozen_items) == 1 or any(key.startswith("$") for key, _ in frozen_items):
+        return dict(frozen_items)
+    return {"$and": [{key: value} for key, value in frozen_items]}
+
+
+def canonical_filter(filter_metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a metadata filter, reusing the result for repeated filters.
+    
+    Args:
+        filter_metadata: Metadata filter (e.g., {"source": "faq.pdf"})
+        
+    Returns:
+        Where clause to pass to Chroma
+    """
+    items = tuple(sorted(filter_metadata.items()))
+    try:
+        return _canon_filter(items)
+    except TypeError:
+        # Unhashable values (e.g. {"$in": [...]}) can't be cached
+        return _canon_filter.__wrapped__(items)
+
 
 @dataclass
 class SearchResult:
@@ -45,9 +101,11 @@ class SearchResult:
     Attributes:
         id: Unique identifier of the document
         text: The document text content
-        metadata: Additional metadata (source, chunk_index, etc.)
+        metadata: Additional metadata (source, chunk_index, etc.). Search
+            results share the dict returned by the store; treat it as read-only.
         distance: Similarity distance (lower = more similar for cosine)
-        score: Similarity score (higher = more similar)
+        score: Similarity score (higher = more similar); derived from
+            distance unless set explicitly
     """
     id: str
     text: str
@@ -70,9 +128,12 @@ class SearchResults:
     Attributes:
         results: List of individual SearchResult objects
         query_embedding: The query embedding used (optional)
+        embeddings: Stored embeddings of the results, one float32 row per
+            result (only when requested from the store)
     """
     results: List[SearchResult] = field(default_factory=list)
     query_embedding: Optional[List[float]] = None
+    embeddings: Optional[np.ndarray] = None
     
     def __iter__(self):
         return iter(self.results)
@@ -97,13 +158,115 @@ class SearchResults:
     def metadatas(self) -> List[Dict[str, Any]]:
         """Get all result metadata."""
         return [r.metadata for r in self.results]
+    
+    def rerank_exact(self, query_embedding: Optional[List[float]] = None) -> "SearchResults":
+        """
+        Re-score results by exact cosine similarity and sort by it.
+        
+        The approximate (HNSW) search finds candidates; this refines their
+        order with one matrix-vector product over the returned embeddings.
+        
+        Args:
+            query_embedding: Query vector (defaults to the one used for the search)
+            
+        Returns:
+            New SearchResults sorted by exact similarity, with scores set
+            
+        Raises:
+            ValueError: If the results carry no embeddings or no query is known
+        """
+        if self.embeddings is None:
+            raise ValueError("Results have no embeddings; search with include_embeddings=True")
+        query = query_embedding if query_embedding is not None else self.query_embedding
+        if query is None:
+            raise ValueError("No query embedding to rerank against")
+        if not self.results:
+            return self
+        
+        q = np.asarray(query, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        row_norms = np.linalg.norm(self.embeddings, axis=1)
+        scores = (self.embeddings @ q) / np.maximum(row_norms * q_norm, 1e-12)
+        order = np.argsort(-scores, kind="stable")
+        
+        reranked = []
+        for i in order:
+            result = self.results[i]
+            reranked.append(SearchResult(
+                id=result.id,
+                text=result.text,
+                metadata=result.metadata,
+                distance=float(1.0 - scores[i]),
+                score=float(scores[i])
+            ))
+        
+        return SearchResults(results=reranked, query_embedding=query, embeddings=self.embeddings[order])
+    
+    def mmr(
+        self,
+        k: int,
+        lambda_mult: float = 0.5,
+        query_embedding: Optional[List[float]] = None
+    ) -> "SearchResults":
+        """
+        Select a diverse subset with maximal marginal relevance.
+        
+        Each pick maximizes lambda * sim(query, doc) - (1 - lambda) *
+        max sim(doc, already picked), so near-duplicate chunks are skipped
+        in favour of ones that add information. Similarities come from one
+        matrix product over the returned embeddings; the greedy loop only
+        does vector updates.
+        
+        Args:
+            k: Number of results to keep
+            lambda_mult: Relevance/diversity trade-off (1.0 = pure relevance)
+            query_embedding: Query vector (defaults to the one used for the search)
+            
+        Returns:
+            New SearchResults with up to k results in selection order
+            
+        Raises:
+            ValueError: If the results carry no embeddings or no query is known
+        """
+        if self.embeddings is None:
+            raise ValueError("Results have no embeddings; search with include_embeddings=True")
+        query = query_embedding if query_embedding is not None else self.query_embedding
+        if query is None:
+            raise ValueError("No query embedding for MMR")
+        if not self.results or k <= 0:
+            return SearchResults(results=[], query_embedding=query)
+        
+        q = np.asarray(query, dtype=np.float32)
+        docs = self.embeddings / np.maximum(np.linalg.norm(self.embeddings, axis=1, keepdims=True), 1e-12)
+        relevance = docs @ (q / max(float(np.linalg.norm(q)), 1e-12))
+        similarity = docs @ docs.T
+        
+        n = len(self.results)
+        redundancy = np.zeros(n, dtype=np.float32)
+        available = np.ones(n, dtype=bool)
+        selected: List[int] = []
+        for _ in range(min(k, n)):
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+            scores[~available] = -np.inf
+            pick = int(np.argmax(scores))
+            selected.append(pick)
+            available[pick] = False
+            np.maximum(redundancy, similarity[pick], out=redundancy)
+        
+        return SearchResults(
+            results=[self.results[i] for i in selected],
+            query_embedding=query,
+            embeddings=self.embeddings[selected]
+        )
 
 
-class VectorStore(ABC):
+@runtime_checkable
+class VectorStore(Protocol):
     """
-    Abstract base class for vector stores.
+    Protocol for vector stores.
     
     This interface defines the contract for all vector store implementations.
+    Implementations may subclass it or simply match it structurally.
     It provides methods for adding, searching, and managing document embeddings.
     
     All implementations must support:
@@ -113,11 +276,10 @@ class VectorStore(ABC):
     - Collection statistics
     """
     
-    @abstractmethod
     def add_documents(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         ids: Optional[List[str]] = None
     ) -> List[str]:
@@ -133,9 +295,8 @@ class VectorStore(ABC):
         Returns:
             List of document IDs
         """
-        pass
+        ...
     
-    @abstractmethod
     def search(
         self,
         query_embedding: List[float],
@@ -153,9 +314,8 @@ class VectorStore(ABC):
         Returns:
             SearchResults containing matching documents
         """
-        pass
+        ...
     
-    @abstractmethod
     def delete(self, ids: List[str]) -> None:
         """
         Delete documents by ID.
@@ -163,9 +323,29 @@ class VectorStore(ABC):
         Args:
             ids: Document IDs to delete
         """
-        pass
+        ...
+    
+    def exists_many(
+        self,
+        ids: List[str],
+        texts: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> Set[str]:
+        """
+        Find which of the given IDs are already stored, in one lookup.
+        
+        Args:
+            ids: Document IDs to check
+            texts: Optional expected text per ID; an ID only counts as
+                existing if its stored text is identical
+            metadatas: Optional expected metadata per ID; an ID only counts
+                as existing if its stored metadata is identical
+            
+        Returns:
+            Set of IDs that are already stored
+        """
+        ...
     
-    @abstractmethod
     def count(self) -> int:
         """
         Get the number of documents in the store.
@@ -173,12 +353,11 @@ class VectorStore(ABC):
         Returns:
             Document count
         """
-        pass
+        ...
     
-    @abstractmethod
     def clear(self) -> None:
         """Remove all documents from the store."""
-        pass
+        ...
 
 
 class ChromaVectorStore(VectorStore):
@@ -210,10 +389,16 @@ class ChromaVectorStore(VectorStore):
             print(f"{result.text} (score: {result.score})")
     """
     
+    # The document count is tracked locally and adjusted on every write.
+    # Upserts that overwrite existing IDs make it drift upwards, so it is
+    # re-read from Chroma after this many writes.
+    COUNT_RESYNC_WRITES = 100
+    
     def __init__(
         self,
         persist_directory: Optional[str] = None,
-        collection_name: Optional[str] = None
+        collection_name: Optional[str] = None,
+        hnsw_profile: Optional[str] = None
     ):
         """
         Initialize ChromaDB vector store.
@@ -221,10 +406,20 @@ class ChromaVectorStore(VectorStore):
         Args:
             persist_directory: Directory for persistent storage
             collection_name: Name of the collection
+            hnsw_profile: HNSW preset from HNSW_PROFILES (defaults to settings;
+                empty keeps Chroma's defaults)
+            
+        Raises:
+            ValueError: If hnsw_profile is not a known preset
         """
         self.persist_directory = persist_directory or settings.vectorstore.directory
         self.collection_name = collection_name or settings.vectorstore.collection
-        
+        self.hnsw_profile = hnsw_profile if hnsw_profile is not None else settings.vectorstore.hnsw_profile
+        if self.hnsw_profile and self.hnsw_profile not in HNSW_PROFILES:
+            raise ValueError(
+                f"Unknown HNSW profile '{self.hnsw_profile}'. "
+                f"Choose one of: {', '.join(HNSW_PROFILES)}"
+            )
         # Ensure directory exists
         Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
         
@@ -235,23 +430,26 @@ class ChromaVectorStore(VectorStore):
         )
 
         # Get or create collection.
-        # Keep metadata minimal for compatibility across Chroma versions.
-        # (Setting advanced HNSW params via metadata has caused startup failures in some environments.)
-        self._collection = self._client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"hnsw:space": "cosine"},
-        )
+        # Metadata stays minimal unless an HNSW profile is chosen: advanced
+        # HNSW params via metadata have caused startup failures in some
+        # environments, so a rejected profile falls back to the defaults.
+        self._collection = self._open_collection(create=False)
+        self._doc_count = self._collection.count()
+        self._writes_since_sync = 0
+        self.id_scheme_mismatch = False
+        self._check_id_scheme()
+        # Bumped on every write so callers can invalidate cached searches
+        self.generation = 0
         
         logger.info(
-            f"Initialized ChromaVectorStore: collection={self.collection_name}, "
-            f"persist_directory={self.persist_directory}, "
-            f"existing_docs={self.count()}"
+            "Initialized ChromaVectorStore: collection=%s, persist_directory=%s, existing_docs=%d",
+            self.collection_name, self.persist_directory, self._doc_count
         )
     
     def add_documents(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         ids: Optional[List[str]] = None
     ) -> List[str]:
@@ -260,21 +458,29 @@ class ChromaVectorStore(VectorStore):
         
         Args:
             texts: Document texts
-            embeddings: Embedding vectors
+            embeddings: Embedding vectors (lists or a 2D array)
             metadatas: Optional metadata dicts
             ids: Optional document IDs
             
         Returns:
             List of assigned document IDs
+            
+        Raises:
+            ValueError: If the collection was built with a different ID scheme
         """
         if not texts:
             return []
+        if self.id_scheme_mismatch:
+            raise ValueError(
+                f"Collection '{self.collection_name}' was built with an older chunk ID scheme; "
+                f"adding to it would duplicate every chunk. Clear it first "
+                f"('python -m src.cli clear --force') and re-ingest."
+            )
         
-        # Generate IDs if not provided
+        # Generate IDs if not provided (8-byte digest = 16 hex chars, no truncation)
         if ids is None:
-            import hashlib
             ids = [
-                hashlib.sha256(text.encode()).hexdigest()[:16]
+                blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
                 for text in texts
             ]
         
@@ -282,23 +488,29 @@ class ChromaVectorStore(VectorStore):
         if metadatas is None:
             metadatas = [{} for _ in texts]
         
+        # Chroma stores float32; convert once into a contiguous buffer
+        # instead of letting it walk nested Python float lists
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        
         # Add to collection (Chroma handles duplicates by ID)
         # Cast types for ChromaDB compatibility
         self._collection.upsert(
             documents=texts,
-            embeddings=cast(Any, embeddings),
+            embeddings=cast(Any, vectors),
             metadatas=cast(Any, metadatas),
             ids=ids
         )
+        self._record_write(len(texts))
         
-        logger.info(f"Added {len(texts)} documents to vector store")
+        logger.info("Added %d documents to vector store", len(texts))
         return ids
     
     def search(
         self,
         query_embedding: List[float],
         top_k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False
     ) -> SearchResults:
         """
         Search for similar documents using cosine similarity.
@@ -307,48 +519,110 @@ class ChromaVectorStore(VectorStore):
             query_embedding: Query vector
             top_k: Number of results
             filter_metadata: Optional metadata filter (e.g., {"source": "faq.pdf"})
+            include_embeddings: Also return stored embeddings (for rerank_exact())
             
         Returns:
             SearchResults with matching documents
         """
-        # Build query kwargs
+        return self.search_batch(
+            [query_embedding],
+            top_k=top_k,
+            filter_metadata=filter_metadata,
+            include_embeddings=include_embeddings
+        )[0]
+    
+    def search_batch(
+        self,
+        query_embeddings: Sequence[List[float]],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False
+    ) -> List[SearchResults]:
+        """
+        Search for several query embeddings in one collection query.
+        
+        All queries share top_k and the metadata filter.
+        
+        Args:
+            query_embeddings: Query vectors
+            top_k: Number of results per query
+            filter_metadata: Optional metadata filter (e.g., {"source": "faq.pdf"})
+            include_embeddings: Also return stored embeddings (for rerank_exact())
+            
+        Returns:
+            One SearchResults per query embedding, in order
+        """
+        if not len(query_embeddings):
+            return []
+        
+        # Build query kwargs; Chroma returns fewer than n_results when the
+        # collection is smaller, so the local count (which can drift from
+        # writes by other processes) is not used to cap it
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
         query_kwargs = {
-            "query_embeddings": [query_embedding],
-            "n_results": min(top_k, self.count()) if self.count() > 0 else top_k,
-            "include": ["documents", "metadatas", "distances"]
+            "query_embeddings": list(query_embeddings),
+            "n_results": top_k,
+            "include": include
         }
         
         # Add metadata filter if provided
         if filter_metadata:
-            query_kwargs["where"] = filter_metadata
+            query_kwargs["where"] = canonical_filter(filter_metadata)
         
         # Execute query
-        results = self._collection.query(**query_kwargs)
+        results = self._collection.query(**query_kwargs) or {}
         
-        # Parse results into SearchResults
-        search_results = []
+        # Chroma returns one row per query embedding in every field
+        ids_rows = results.get("ids") or []
+        documents_rows = results.get("documents") or []
+        metadatas_rows = results.get("metadatas") or []
+        distances_rows = results.get("distances") or []
+        embeddings_rows = results.get("embeddings") if include_embeddings else None
         
-        if results and results.get("ids") and results["ids"][0]:
-            ids = results["ids"][0]
-            # Safely extract results with defaults
-            documents_list = results.get("documents") or [[]]
-            metadatas_list = results.get("metadatas") or [[]]
-            distances_list = results.get("distances") or [[]]
+        batch = []
+        for row, query_embedding in enumerate(query_embeddings):
+            ids = ids_rows[row] if row < len(ids_rows) else None
+            if not ids:
+                batch.append(SearchResults(results=[], query_embedding=query_embedding))
+                continue
             
-            documents = documents_list[0] if documents_list else []
-            metadatas = metadatas_list[0] if metadatas_list else []
-            distances = distances_list[0] if distances_list else []
+            documents = documents_rows[row] if row < len(documents_rows) else []
+            metadatas = metadatas_rows[row] if row < len(metadatas_rows) else []
+            distances = distances_rows[row] if row < len(distances_rows) else []
             
-            for i, doc_id in enumerate(ids):
-                search_results.append(SearchResult(
+            # Chroma returns parallel arrays for every included field, so
+            # only a field that is missing altogether needs padding
+            n = len(ids)
+            search_results = [
+                SearchResult(
                     id=doc_id,
-                    text=documents[i] if i < len(documents) else "",
-                    metadata=dict(metadatas[i]) if i < len(metadatas) else {},
-                    distance=distances[i] if i < len(distances) else 0.0
-                ))
+                    text=text,
+                    metadata=metadata or {},
+                    distance=distance
+                )
+                for doc_id, text, metadata, distance in zip(
+                    ids,
+                    documents or [""] * n,
+                    metadatas or [None] * n,
+                    distances or [0.0] * n
+                )
+            ]
+            
+            embeddings = None
+            if embeddings_rows is not None and row < len(embeddings_rows):
+                embeddings = np.asarray(embeddings_rows[row], dtype=np.float32)
+            
+            batch.append(SearchResults(
+                results=search_results, query_embedding=query_embedding, embeddings=embeddings
+            ))
         
-        logger.debug(f"Search returned {len(search_results)} results")
-        return SearchResults(results=search_results, query_embedding=query_embedding)
+        logger.debug(
+            "Search returned %d results for %d queries",
+            sum(len(r) for r in batch), len(batch)
+        )
+        return batch
     
     def delete(self, ids: List[str]) -> None:
         """
@@ -359,22 +633,159 @@ class ChromaVectorStore(VectorStore):
         """
         if ids:
             self._collection.delete(ids=ids)
-            logger.info(f"Deleted {len(ids)} documents from vector store")
+            self._record_write(-len(ids))
+            logger.info("Deleted %d documents from vector store", len(ids))
+    
+    def exists_many(
+        self,
+        ids: List[str],
+        texts: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> Set[str]:
+        """
+        Find which of the given IDs are already stored, in one lookup.
+        
+        Args:
+            ids: Document IDs to check
+            texts: Optional expected text per ID; an ID only counts as
+                existing if its stored text is identical
+            metadatas: Optional expected metadata per ID; an ID only counts
+                as existing if its stored metadata is identical
+            
+        Returns:
+            Set of IDs that are already stored
+        """
+        if not ids:
+            return set()
+        
+        include: List[Any] = []
+        if texts is not None:
+            include.append("documents")
+        if metadatas is not None:
+            include.append("metadatas")
+        stored = self._collection.get(ids=ids, include=include)
+        stored_ids = stored.get("ids") or []
+        existing = set(stored_ids)
+        
+        if texts is not None:
+            expected = dict(zip(ids, texts))
+            documents = stored.get("documents") or []
+            existing &= {
+                doc_id for doc_id, document in zip(stored_ids, documents)
+                if expected.get(doc_id) == document
+            }
+        if metadatas is not None:
+            # Chroma returns None for documents stored without metadata
+            expected_metadata = dict(zip(ids, metadatas))
+            stored_metadata = stored.get("metadatas") or []
+            existing &= {
+                doc_id for doc_id, metadata in zip(stored_ids, stored_metadata)
+                if (expected_metadata.get(doc_id) or {}) == (metadata or {})
+            }
+        return existing
     
     def count(self) -> int:
-        """Get number of documents in collection."""
-        return self._collection.count()
+        """
+        Get number of documents in collection.
+        
+        Tracked locally and resynced every COUNT_RESYNC_WRITES writes, so it
+        is approximate and meant for reporting only.
+        """
+        return self._doc_count
     
     def clear(self) -> None:
         """Remove all documents from the collection."""
         # Chroma doesn't have a direct clear method, so recreate collection
         self._client.delete_collection(name=self.collection_name)
-        self._collection = self._client.create_collection(
-            name=self.collection_name,
-            metadata={"hnsw:space": "cosine"}
-        )
+        self._collection = self._open_collection(create=True)
+        self._doc_count = 0
+        self._writes_since_sync = 0
+        self.id_scheme_mismatch = False
+        self.generation += 1
         logger.info("Cleared all documents from vector store")
     
+    def _record_write(self, delta: int) -> None:
+        """Adjust the local document count, resyncing it periodically."""
+        self.generation += 1
+        self._writes_since_sync += 1
+        if self._writes_since_sync >= self.COUNT_RESYNC_WRITES:
+            self._doc_count = self._collection.count()
+            self._writes_since_sync = 0
+        else:
+            self._doc_count = max(0, self._doc_count + delta)
+    
+    def _collection_metadata(self) -> Dict[str, Any]:
+        """Build collection metadata, including the HNSW profile if set."""
+        metadata: Dict[str, Any] = {"hnsw:space": "cosine", ID_SCHEME_KEY: ID_SCHEME}
+        if self.hnsw_profile:
+            metadata.update(HNSW_PROFILES[self.hnsw_profile])
+            metadata["hnsw:num_threads"] = os.cpu_count() or 1
+        return metadata
+    
+    def _open_collection(self, create: bool) -> Any:
+        """
+        Get or create the collection with the configured metadata.
+        
+        Args:
+            create: Create a new collection instead of opening an existing one
+            
+        Returns:
+            Chroma collection
+        """
+        open_fn = self._client.create_collection if create else self._client.get_or_create_collection
+        metadata = self._collection_metadata()
+        
+        try:
+            return open_fn(name=self.collection_name, metadata=metadata)
+        except Exception as e:
+            if not self.hnsw_profile:
+                raise
+            logger.warning("HNSW profile '%s' rejected, using Chroma defaults: %s", self.hnsw_profile, e)
+            return open_fn(name=self.collection_name, metadata={"hnsw:space": "cosine", ID_SCHEME_KEY: ID_SCHEME})
+    
+    def _check_id_scheme(self) -> None:
+        """Stamp an empty collection with the current ID scheme, or flag a stale one."""
+        metadata = self._collection.metadata or {}
+        if metadata.get(ID_SCHEME_KEY) == ID_SCHEME:
+            return
+        if self._doc_count:
+            self.id_scheme_mismatch = True
+            logger.warning(
+                "Collection '%s' uses chunk ID scheme %s (current: %d); "
+                "writes are refused until it is cleared and re-ingested",
+                self.collection_name, metadata.get(ID_SCHEME_KEY, 1), ID_SCHEME
+            )
+            return
+        
+        # HNSW settings can't be modified after creation, so they're left out
+        metadata = {key: value for key, value in metadata.items() if not key.startswith("hnsw:")}
+        metadata[ID_SCHEME_KEY] = ID_SCHEME
+        self._collection.modify(metadata=metadata)
+    
+    def create_metadata_index(self, field_name: str) -> None:
+        """
+        Register a metadata field that searches filter on.
+        
+        Chroma indexes every metadata field itself; this records the field
+        in the collection metadata so filters can be kept to known keys.
+        
+        Args:
+            field_name: Metadata key (e.g., "source")
+        """
+        metadata = {
+            key: value for key, value in (self._collection.metadata or {}).items()
+            if not key.startswith("hnsw:")
+        }
+        fields = set(filter(None, str(metadata.get(INDEXED_FIELDS_KEY, "")).split(",")))
+        if field_name in fields:
+            return
+        
+        fields.add(field_name)
+        metadata[INDEXED_FIELDS_KEY] = ",".join(sorted(fields))
+        # HNSW settings can't be modified after creation, so they're left out
+        self._collection.modify(metadata=metadata)
+        logger.info("Registered metadata index on '%s'", field_name)
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the vector store.
@@ -7,7 +7,7 @@ configured MySQL connection string.
 
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional
+from typing import Any, Iterator, Mapping, Optional
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine, Result
 
@@ -26,6 +26,9 @@ def get_engine() -> Engine:
         _engine = create_engine(
             settings.database.url,
             pool_pre_ping=True,
+            pool_size=settings.database.pool_size,
+            max_overflow=settings.database.max_overflow,
+            pool_recycle=settings.database.pool_recycle,
         )
         logger.info("Database engine initialized")
     return _engine
@@ -38,17 +41,29 @@ class Database:
         self.engine = engine or get_engine()
 
     def execute(self, sql: str, params: Optional[Mapping[str, Any]] = None) -> Result:
+        """Run a write statement in its own committed transaction."""
         with self.engine.begin() as conn:
             return conn.execute(text(sql), params or {})
 
     def fetch_one(self, sql: str, params: Optional[Mapping[str, Any]] = None) -> Optional[dict[str, Any]]:
-        result = self.execute(sql, params)
-        row = result.mappings().first()
+        # Reads skip begin(): no COMMIT round trip for a SELECT
+        with self.engine.connect() as conn:
+            row = conn.execute(text(sql), params or {}).mappings().first()
         return dict(row) if row else None
 
     def fetch_all(self, sql: str, params: Optional[Mapping[str, Any]] = None) -> list[dict[str, Any]]:
-        result = self.execute(sql, params)
-        return [dict(r) for r in result.mappings().all()]
+        return list(self.stream(sql, params))
+
+    def stream(
+        self,
+        sql: str,
+        params: Optional[Mapping[str, Any]] = None,
+        yield_per: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield rows lazily from a server-side cursor, yield_per rows at a time."""
+        with self.engine.connect().execution_options(stream_results=True, yield_per=yield_per) as conn:
+            for row in conn.execute(text(sql), params or {}).mappings():
+                yield dict(row)
 
 
 db = Database()
@@ -18,19 +18,30 @@ Usage:
     ingester.ingest_directory("data/documents/")
 """
 
-import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Iterator, Union
+from typing import Deque, List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union
 from dataclasses import dataclass, field
 
-from src.core.embeddings import EmbeddingProvider, AzureEmbeddingProvider
-from src.core.vectorstore import VectorStore, ChromaVectorStore
+import orjson
+
+from src.core.embeddings import EmbeddingProvider
+from src.core.vectorstore import VectorStore
 from src.pipeline.chunker import TextChunker, Chunk
+from src.pipeline.providers import get_default_embedding_provider, get_default_vector_store
 from src.config import settings
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Marks the end of the chunk batch queue
+_END_OF_BATCHES = object()
+
 
 @dataclass
 class Document:
@@ -56,11 +67,13 @@ class IngestionResult:
         documents_processed: Number of documents processed
         chunks_created: Number of chunks created
         chunks_ingested: Number of chunks added to store
+        chunks_skipped: Number of chunks already stored unchanged (not re-embedded)
         errors: List of any errors encountered
     """
     documents_processed: int = 0
     chunks_created: int = 0
     chunks_ingested: int = 0
+    chunks_skipped: int = 0
     errors: List[str] = field(default_factory=list)
     
     @property
@@ -92,6 +105,26 @@ class DocumentLoader:
         Returns:
             List of Document objects
         """
+        return list(self.iter_file(filepath))
+    
+    def iter_file(self, filepath: Union[str, Path]) -> Iterator[Document]:
+        """
+        Lazily load documents from a file.
+        
+        JSON Lines files are read and parsed one line at a time, so large
+        files are never held in memory whole. The path is validated
+        immediately, not on first iteration.
+        
+        Args:
+            filepath: Path to the file
+            
+        Returns:
+            Iterator of Document objects
+            
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file format is not supported
+        """
         path = Path(filepath)
         
         if not path.exists():
@@ -100,16 +133,16 @@ class DocumentLoader:
         if path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
             raise ValueError(f"Unsupported file format: {path.suffix}")
         
-        logger.info(f"Loading file: {path}")
+        logger.info("Loading file: %s", path)
         
         if path.suffix.lower() in {".txt", ".md"}:
-            return self._load_text_file(path)
+            return iter(self._load_text_file(path))
         elif path.suffix.lower() == ".json":
-            return self._load_json_file(path)
+            return iter(self._load_json_file(path))
         elif path.suffix.lower() == ".jsonl":
-            return self._load_jsonl_file(path)
+            return self._iter_jsonl_file(path)
         
-        return []
+        return iter(())
     
     def _load_text_file(self, path: Path) -> List[Document]:
         """Load a plain text or markdown file."""
@@ -121,7 +154,7 @@ class DocumentLoader:
     
     def _load_json_file(self, path: Path) -> List[Document]:
         """Load a JSON file."""
-        content = json.loads(path.read_text(encoding="utf-8"))
+        content = orjson.loads(path.read_bytes())
         
         documents = []
         
@@ -139,24 +172,21 @@ class DocumentLoader:
         
         return documents
     
-    def _load_jsonl_file(self, path: Path) -> List[Document]:
-        """Load a JSON Lines file."""
-        documents = []
-        
-        with open(path, "r", encoding="utf-8") as f:
+    def _iter_jsonl_file(self, path: Path) -> Iterator[Document]:
+        """Load a JSON Lines file one document at a time."""
+        # Bytes lines go straight to orjson, with no str decode step
+        with open(path, "rb") as f:
             for i, line in enumerate(f):
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    item = json.loads(line)
+                    item = orjson.loads(line)
                     doc = self._parse_json_item(item, path.name, i)
                     if doc:
-                        documents.append(doc)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to parse line {i} in {path}: {e}")
-        
-        return documents
+                        yield doc
+                except orjson.JSONDecodeError as e:
+                    logger.warning("Failed to parse line %d in %s: %s", i, path, e)
     
     def _parse_json_item(
         self,
@@ -240,8 +270,8 @@ class DocumentIngester:
             vector_store: Store for documents
             chunker: Text chunker for splitting
         """
-        self.embedding_provider = embedding_provider or AzureEmbeddingProvider()
-        self.vector_store = vector_store or ChromaVectorStore()
+        self.embedding_provider = embedding_provider or get_default_embedding_provider()
+        self.vector_store = vector_store or get_default_vector_store()
         self.chunker = chunker or TextChunker()
         self.loader = DocumentLoader()
         
@@ -250,7 +280,9 @@ class DocumentIngester:
     def ingest_documents(
         self,
         documents: List[Document],
-        batch_size: int = 64
+        batch_size: int = 64,
+        prefetch: int = 2,
+        skip_existing: bool = True
     ) -> IngestionResult:
         """
         Ingest a list of documents.
@@ -258,60 +290,210 @@ class DocumentIngester:
         Args:
             documents: List of Document objects
             batch_size: Batch size for embedding
+            prefetch: Maximum embedding batches in flight
+            skip_existing: Do not re-embed chunks already stored with the same text and metadata
+            
+        Returns:
+            IngestionResult with statistics
+        """
+        return self.ingest_iter(
+            documents, batch_size=batch_size, prefetch=prefetch, skip_existing=skip_existing
+        )
+    
+    def ingest_iter(
+        self,
+        documents: Iterable[Document],
+        batch_size: int = 64,
+        prefetch: int = 2,
+        skip_existing: bool = True
+    ) -> IngestionResult:
+        """
+        Ingest documents from any iterable, streaming them through in batches.
+        
+        Runs as a three-stage pipeline so each stage overlaps the others:
+        
+        1. A chunker thread chunks documents lazily and queues a batch as
+           soon as enough chunks have accumulated (bounded queue, so memory
+           use depends on the batch size, not the corpus).
+        2. Embeddings for up to `prefetch` queued batches are requested
+           concurrently on a thread pool. With skip_existing, chunks already
+           stored with identical text and metadata are dropped first (one lookup per
+           batch), so re-ingesting unchanged files costs no embedding calls.
+        3. The calling thread writes embedded batches to the vector store,
+           in order.
+        
+        Args:
+            documents: Iterable of Document objects (e.g. DocumentLoader.iter_file())
+            batch_size: Batch size for embedding
+            prefetch: Maximum embedding batches in flight
+            skip_existing: Do not re-embed chunks already stored with the same text and metadata
             
         Returns:
             IngestionResult with statistics
         """
         result = IngestionResult()
+        # The chunker thread records into its own result; merged at the end
+        chunk_result = IngestionResult()
         
-        # Chunk all documents
-        all_chunks: List[Chunk] = []
-        for doc in documents:
+        batch_queue: "queue.Queue[Any]" = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        chunker_error: List[BaseException] = []
+        
+        def offer(item: Any) -> bool:
+            """Queue an item unless the consumer has stopped."""
+            while not stop.is_set():
+                try:
+                    batch_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce() -> None:
             try:
-                chunks = self.chunker.chunk_text(doc.text, metadata=doc.metadata)
-                all_chunks.extend(chunks)
-                result.documents_processed += 1
-            except Exception as e:
-                logger.error(f"Failed to chunk document: {e}")
-                result.errors.append(f"Chunking error: {str(e)}")
+                for batch in self._chunk_batches(documents, batch_size, chunk_result):
+                    if not offer(batch):
+                        return
+            except BaseException as e:
+                chunker_error.append(e)
+            finally:
+                offer(_END_OF_BATCHES)
         
-        result.chunks_created = len(all_chunks)
+        chunker = threading.Thread(target=produce, name="ingest-chunker", daemon=True)
+        chunker.start()
         
-        if not all_chunks:
-            return result
+        # Keep up to `prefetch` embedding calls in flight
+        prefetch = max(1, prefetch)
+        pending: Deque[Tuple[int, Future]] = deque()
         
-        # Process in batches
-        for batch_start in range(0, len(all_chunks), batch_size):
-            batch = all_chunks[batch_start:batch_start + batch_size]
-            
-            try:
-                # Get texts and metadata
-                texts = [c.text for c in batch]
-                metadatas = [c.metadata for c in batch]
-                ids = [c.id for c in batch]
+        try:
+            with ThreadPoolExecutor(max_workers=prefetch) as executor:
+                batch_number = 0
+                while True:
+                    batch = batch_queue.get()
+                    if batch is _END_OF_BATCHES:
+                        break
+                    
+                    batch_number += 1
+                    future = executor.submit(self._embed_batch, batch, skip_existing)
+                    pending.append((batch_number, future))
+                    
+                    if len(pending) >= prefetch:
+                        self._store_batch(*pending.popleft(), result)
                 
-                # Generate embeddings
-                embeddings = self.embedding_provider.embed_batch(texts)
+                while pending:
+                    self._store_batch(*pending.popleft(), result)
+        finally:
+            stop.set()
+            chunker.join()
+        
+        if chunker_error:
+            raise chunker_error[0]
+        
+        result.documents_processed = chunk_result.documents_processed
+        result.chunks_created = chunk_result.chunks_created
+        result.errors[:0] = chunk_result.errors
+        return result
+    
+    def _chunk_batches(
+        self,
+        documents: Iterable[Document],
+        batch_size: int,
+        result: IngestionResult
+    ) -> Iterator[List[Chunk]]:
+        """
+        Chunk documents lazily and yield chunks in batches of batch_size.
+        
+        Documents are chunked batch_size at a time with one chunk_batch()
+        call, which tokenizes the whole group at once.
+        """
+        batch: List[Chunk] = []
+        documents = iter(documents)
+        
+        while True:
+            group = list(islice(documents, batch_size))
+            if not group:
+                break
+            
+            outcomes = self.chunker.chunk_batch(
+                [doc.text for doc in group],
+                [doc.metadata for doc in group],
+                return_exceptions=True
+            )
+            
+            for chunks in outcomes:
+                if isinstance(chunks, Exception):
+                    logger.error("Failed to chunk document: %s", chunks)
+                    result.errors.append(f"Chunking error: {str(chunks)}")
+                    continue
                 
-                # Add to vector store
+                result.documents_processed += 1
+                result.chunks_created += len(chunks)
+                batch.extend(chunks)
+            
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                batch = batch[batch_size:]
+        
+        if batch:
+            yield batch
+    
+    def _embed_batch(
+        self,
+        batch: List[Chunk],
+        skip_existing: bool
+    ) -> Tuple[List[Chunk], List[str], List[List[float]], int]:
+        """
+        Embed a batch of chunks, optionally skipping ones already stored.
+        
+        Returns:
+            (chunks to store, their IDs, their embeddings, number skipped)
+        """
+        ids = [c.id for c in batch]
+        skipped = 0
+        
+        if skip_existing:
+            # Edited metadata (category, url, ...) must still be re-stored
+            existing = self.vector_store.exists_many(
+                ids, [c.text for c in batch], [c.metadata for c in batch]
+            )
+            if existing:
+                kept = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing]
+                skipped = len(batch) - len(kept)
+                batch = [batch[i] for i in kept]
+                ids = [ids[i] for i in kept]
+        
+        if not batch:
+            return [], [], [], skipped
+        
+        embeddings = self.embedding_provider.embed_batch([c.text for c in batch])
+        return batch, ids, embeddings, skipped
+    
+    def _store_batch(
+        self,
+        batch_number: int,
+        embedded: Future,
+        result: IngestionResult
+    ) -> None:
+        """Wait for a batch's embeddings and add the batch to the vector store."""
+        try:
+            batch, ids, embeddings, skipped = embedded.result()
+            result.chunks_skipped += skipped
+            
+            if batch:
                 self.vector_store.add_documents(
-                    texts=texts,
+                    texts=[c.text for c in batch],
                     embeddings=embeddings,
-                    metadatas=metadatas,
+                    metadatas=[c.metadata for c in batch],
                     ids=ids
                 )
-                
-                result.chunks_ingested += len(batch)
-                logger.info(
-                    f"Ingested batch {batch_start // batch_size + 1}: "
-                    f"{len(batch)} chunks"
-                )
-                
-            except Exception as e:
-                logger.error(f"Failed to ingest batch: {e}")
-                result.errors.append(f"Batch ingestion error: {str(e)}")
-        
-        return result
+            
+            result.chunks_ingested += len(batch)
+            logger.info("Ingested batch %d: %d chunks (%d unchanged)", batch_number, len(batch), skipped)
+            
+        except Exception as e:
+            logger.error("Failed to ingest batch: %s", e)
+            result.errors.append(f"Batch ingestion error: {str(e)}")
     
     def ingest_file(self, filepath: Union[str, Path]) -> IngestionResult:
         """
@@ -324,11 +506,11 @@ class DocumentIngester:
             IngestionResult with statistics
         """
         try:
-            documents = self.loader.load_file(filepath)
-            logger.info(f"Loaded {len(documents)} documents from {filepath}")
-            return self.ingest_documents(documents)
+            result = self.ingest_iter(self.loader.iter_file(filepath))
+            logger.info("Loaded %d documents from %s", result.documents_processed, filepath)
+            return result
         except Exception as e:
-            logger.error(f"Failed to ingest file {filepath}: {e}")
+            logger.error("Failed to ingest file %s: %s", filepath, e)
             result = IngestionResult()
             result.errors.append(f"File error: {str(e)}")
             return result
@@ -337,15 +519,22 @@ class DocumentIngester:
         self,
         directory: Union[str, Path],
         recursive: bool = True,
-        extensions: Optional[List[str]] = None
+        extensions: Optional[List[str]] = None,
+        max_workers: int = 8
     ) -> IngestionResult:
         """
         Ingest all documents from a directory.
         
+        Files are ingested concurrently on a thread pool; the work is
+        dominated by network-bound embedding calls. The embedding provider
+        and vector store must therefore be safe to share across threads
+        (AzureEmbeddingProvider and ChromaVectorStore are).
+        
         Args:
             directory: Path to directory
             recursive: Whether to process subdirectories
             extensions: File extensions to process (defaults to all supported)
+            max_workers: Maximum files ingested at once
             
         Returns:
             Combined IngestionResult
@@ -356,24 +545,39 @@ class DocumentIngester:
             raise FileNotFoundError(f"Directory not found: {directory}")
         
         extensions = extensions or list(DocumentLoader.SUPPORTED_EXTENSIONS)
-        extensions = [ext if ext.startswith(".") else f".{ext}" for ext in extensions]
-        
-        # Find all files
-        files = []
-        pattern = "**/*" if recursive else "*"
-        for ext in extensions:
-            files.extend(path.glob(f"{pattern}{ext}"))
+        wanted = {(ext if ext.startswith(".") else f".{ext}").lower() for ext in extensions}
+        
+        # Find all files in a single pass over the tree
+        files: List[Path] = []
+        if recursive:
+            for root, _, names in os.walk(path):
+                files.extend(
+                    Path(root) / name for name in names
+                    if os.path.splitext(name)[1].lower() in wanted
+                )
+        else:
+            with os.scandir(path) as entries:
+                files.extend(
+                    Path(entry.path) for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in wanted
+                )
         
-        logger.info(f"Found {len(files)} files in {directory}")
+        logger.info("Found %d files in %s", len(files), directory)
         
         # Ingest all files
         combined_result = IngestionResult()
+        if not files:
+            return combined_result
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            # Results are merged here on the calling thread, in file order
+            results = list(executor.map(self.ingest_file, files))
         
-        for file_path in files:
-            result = self.ingest_file(file_path)
+        for result in results:
             combined_result.documents_processed += result.documents_processed
             combined_result.chunks_created += result.chunks_created
             combined_result.chunks_ingested += result.chunks_ingested
+            combined_result.chunks_skipped += result.chunks_skipped
             combined_result.errors.extend(result.errors)
         
         return combined_result
@@ -11,11 +11,20 @@ Usage:
     logger.info("Processing document", extra={"doc_id": "123"})
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Background thread that writes queued records to the real handlers
+_listener: Optional[QueueListener] = None
+
+# Log records buffered before the log file is written
+FILE_BUFFER_RECORDS = 256
+
 
 class ColoredFormatter(logging.Formatter):
     """
@@ -41,6 +50,8 @@ class ColoredFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record with colors for terminal output."""
         color = self.COLORS.get(record.levelno, self.RESET)
+        # Color a copy: the same record also goes to the file handler
+        record = logging.makeLogRecord(record.__dict__)
         record.levelname = f"{color}{record.levelname}{self.RESET}"
         return super().format(record)
 
@@ -53,6 +64,9 @@ def setup_logging(
     """
     Configure the root logger with console and optional file handlers.
     
+    Callers only enqueue records; a QueueListener thread formats them and
+    does the console/file I/O, so logging never blocks on a slow stream.
+    
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional path to log file
@@ -66,7 +80,9 @@ def setup_logging(
     root_logger.setLevel(numeric_level)
     
     # Remove existing handlers
+    _stop_listener()
     root_logger.handlers.clear()
+    handlers: list[logging.Handler] = []
     
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
@@ -84,7 +100,7 @@ def setup_logging(
         )
     
     console_handler.setFormatter(console_format)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (if specified)
     if log_file:
@@ -98,7 +114,36 @@ def setup_logging(
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         file_handler.setFormatter(file_format)
-        root_logger.addHandler(file_handler)
+        # Batch file writes: flush every FILE_BUFFER_RECORDS records, or at
+        # once on an error so failures are on disk before anything else
+        handlers.append(MemoryHandler(
+            FILE_BUFFER_RECORDS,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        ))
+    
+    global _listener
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            # MemoryHandler flushes on close but leaves its target open
+            target = getattr(handler, "target", None)
+            handler.close()
+            if target is not None:
+                target.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def get_logger(name: str) -> logging.Logger:
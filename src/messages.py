@@ -5,8 +5,8 @@ Supports short contextual welcome messages.
 
 from __future__ import annotations
 
-from datetime import datetime
 import random
+import time
 
 _MESSAGES: dict[str, str] = {
     "error.rate_limited": "Too many requests. Please try again later.",
@@ -15,6 +15,9 @@ _MESSAGES: dict[str, str] = {
     "error.speech_not_configured": "Speech service is not configured.",
     "error.tts_failed": "Text-to-speech conversion failed.",
     "memory.cleared": "Conversation memory cleared.",
+    "router.greeting": "Hi! I'm Rashmi from LankaTel. What can I help you with today?",
+    "router.goodbye": "You're welcome! Thanks for contacting LankaTel. Have a great day!",
+    "router.refusal": "I'm here to help with LankaTel services, but I can't continue this conversation. Please reach out again whenever you need support.",
 }
 
 
@@ -51,24 +54,31 @@ _WELCOME_GENERIC: tuple[str, ...] = (
 )
 
 
-def _welcome_message(now: datetime) -> str:
-    hour = now.hour
+def _pool_for(hour: int) -> tuple[str, ...]:
     if 5 <= hour < 12:
-        pool = _WELCOME_MORNING
-    elif 12 <= hour < 17:
-        pool = _WELCOME_AFTERNOON
-    elif 17 <= hour < 22:
-        pool = _WELCOME_EVENING
-    else:
-        pool = _WELCOME_NIGHT
+        return _WELCOME_MORNING
+    if 12 <= hour < 17:
+        return _WELCOME_AFTERNOON
+    if 17 <= hour < 22:
+        return _WELCOME_EVENING
+    return _WELCOME_NIGHT
 
-    # Mix in some generic messages so it doesn't feel repetitive.
-    combined = pool + _WELCOME_GENERIC
-    return random.choice(combined)
+
+# Welcome pool for each hour of the day, mixed with some generic messages
+# so it doesn't feel repetitive; built once rather than on every welcome.
+_HOUR_TO_POOL: tuple[tuple[str, ...], ...] = tuple(
+    _pool_for(hour) + _WELCOME_GENERIC for hour in range(24)
+)
+
+
+def _welcome_message(hour: int) -> str:
+    pool = _HOUR_TO_POOL[hour]
+    return pool[random.randrange(len(pool))]
 
 
-def msg(key: str) -> str:
+def msg(key: str, _get=_MESSAGES.get) -> str:
     """Return a message by key, or the key itself if not found."""
+    # _get binds the dict lookup once instead of resolving it per call
     if key == "welcome.message":
-        return _welcome_message(datetime.now())
-    return _MESSAGES.get(key, key)
+        return _welcome_message(time.localtime().tm_hour)
+    return _get(key, key)
@@ -8,7 +8,7 @@ This package contains the RAG (Retrieval-Augmented Generation) pipeline componen
 """
 
 from src.pipeline.chunker import TextChunker, Chunk
-from src.pipeline.retriever import Retriever, RetrievalResult
+from src.pipeline.retriever import Retriever, RetrievalResult, BatchingRetriever
 from src.pipeline.rag_pipeline import RAGPipeline
 
 __all__ = [
@@ -16,5 +16,6 @@ __all__ = [
     "Chunk",
     "Retriever",
     "RetrievalResult",
+    "BatchingRetriever",
     "RAGPipeline",
 ]
@@ -23,19 +23,29 @@ Usage:
     chunks = chunker.chunk_text(document_text, metadata={"source": "doc.pdf"})
 """
 
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Callable
+from hashlib import blake2b
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
+import os
 import re
 
-import tiktoken
+import numpy as np
+from tiktoken import Encoding
 
 from src.config import settings
+from src.core.cache import LRUCache
+from src.core.tokens import MODEL_ENCODINGS, get_encoding
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Sentence ends (., !, ? plus whitespace) and paragraph breaks, matched on UTF-8 bytes
+_SENTENCE_BOUNDARY_RE = re.compile(rb'[.!?]\s+|\n\n')
 
-@dataclass
+
+@dataclass(slots=True)
 class Chunk:
     """
     Represents a single chunk of text with metadata.
@@ -54,6 +64,7 @@ class Chunk:
     end_token: int = 0
     token_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _id: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Calculate token count if not provided."""
@@ -62,8 +73,15 @@ class Chunk:
     
     @property
     def id(self) -> str:
-        """Generate a unique ID for this chunk based on content and position."""
-        import hashlib
+        """
+        Generate a unique ID for this chunk based on content and position.
+        
+        Computed on first access and then reused, so set text and metadata
+        before reading it.
+        """
+        if self._id is not None:
+            return self._id
+        
         # Include a document-level identity when available.
         # Without this, chunks from different JSONL rows in the same source file can collide
         # (same chunk index + same prefix text), causing Chroma upsert duplicate-id errors.
@@ -76,7 +94,9 @@ class Chunk:
             or ""
         )
         content = f"{self.metadata.get('source', '')}:{doc_identity}:{self.index}:{self.text[:50]}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Identity only, not security: BLAKE2b with an 8-byte digest (16 hex chars)
+        self._id = blake2b(content.encode(), digest_size=8).hexdigest()
+        return self._id
 
 
 class TextChunker:
@@ -103,21 +123,16 @@ class TextChunker:
     """
     
     # Supported models for tokenization
-    SUPPORTED_MODELS = {
-        "gpt-4o-mini": "o200k_base",
-        "gpt-4o": "o200k_base",
-        "gpt-4": "cl100k_base",
-        "gpt-3.5-turbo": "cl100k_base",
-        "text-embedding-3-large": "cl100k_base",
-        "text-embedding-3-small": "cl100k_base",
-    }
+    SUPPORTED_MODELS = MODEL_ENCODINGS
     
     def __init__(
         self,
         chunk_size: Optional[int] = None,
         overlap: Optional[int] = None,
         model: str = "gpt-4o-mini",
-        respect_sentences: bool = True
+        respect_sentences: bool = True,
+        max_workers: Optional[int] = None,
+        token_cache_size: int = 0
     ):
         """
         Initialize the text chunker.
@@ -127,20 +142,38 @@ class TextChunker:
             overlap: Token overlap between chunks (defaults to settings)
             model: Model name for tokenization
             respect_sentences: Try to break at sentence boundaries
+            max_workers: Threads for splitting documents in chunk_batch()
+                (defaults to the CPU count)
+            token_cache_size: Documents whose tokens are kept for re-chunking
+                (0 disables the cache)
         """
         self.chunk_size = chunk_size or settings.chunking.chunk_size
         self.overlap = overlap or settings.chunking.chunk_overlap
         self.respect_sentences = respect_sentences
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Token lists keyed by a digest of the document text, so re-chunking
+        # an unchanged document (re-indexing, settings tweaks) skips the BPE
+        self._token_cache: Optional[LRUCache[List[int]]] = (
+            LRUCache(token_cache_size) if token_cache_size > 0 else None
+        )
         
-        # Initialize tokenizer
-        encoding_name = self.SUPPORTED_MODELS.get(model, "cl100k_base")
-        self._encoder = tiktoken.get_encoding(encoding_name)
+        # Tokenizer is loaded on first use (and shared per process), so
+        # creating a chunker that never chunks costs nothing
+        self._encoding_name = self.SUPPORTED_MODELS.get(model, "cl100k_base")
+        self._encoder: Optional[Encoding] = None
         
         logger.info(
-            f"Initialized TextChunker: chunk_size={self.chunk_size}, "
-            f"overlap={self.overlap}, encoding={encoding_name}"
+            "Initialized TextChunker: chunk_size=%d, overlap=%d, encoding=%s",
+            self.chunk_size, self.overlap, self._encoding_name
         )
     
+    @property
+    def encoder(self) -> Encoding:
+        """The tiktoken encoding, loaded on first access."""
+        if self._encoder is None:
+            self._encoder = get_encoding(self._encoding_name)
+        return self._encoder
+    
     def count_tokens(self, text: str) -> int:
         """
         Count tokens in a text string.
@@ -151,11 +184,57 @@ class TextChunker:
         Returns:
             Number of tokens
         """
-        return len(self._encoder.encode(text))
+        # Ordinary encoding skips the special-token scan; special tokens are
+        # counted as plain text, which is what a length check wants anyway
+        return len(self.encoder.encode_ordinary(text))
+    
+    def _encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Tokenize texts in one batch call, reusing cached token lists."""
+        cache = self._token_cache
+        if cache is None:
+            return self.encoder.encode_batch(texts, num_threads=os.cpu_count() or 1)
+        
+        keys = [blake2b(text.encode(), digest_size=16).digest() for text in texts]
+        token_lists = [cache.get(key) for key in keys]
+        missing = [i for i, tokens in enumerate(token_lists) if tokens is None]
+        if len(missing) == 1:
+            # A single text (chunk_text(), possibly inside chunk_batch()'s
+            # pool) doesn't need encode_batch()'s thread pool
+            token_lists[missing[0]] = self.encoder.encode(texts[missing[0]])
+            cache.set(keys[missing[0]], token_lists[missing[0]])
+        elif missing:
+            encoded = self.encoder.encode_batch(
+                [texts[i] for i in missing], num_threads=os.cpu_count() or 1
+            )
+            for i, tokens in zip(missing, encoded):
+                token_lists[i] = tokens
+                cache.set(keys[i], tokens)
+        return token_lists
+    
+    def _sentence_boundaries(self, tokens: List[int]) -> List[int]:
+        """
+        Find every sentence boundary in a document as a token position.
+        
+        Each token is decoded to bytes once, so a single regex scan over
+        the document maps matches back to exact token positions.
+        
+        Args:
+            tokens: Token list for the whole document
+            
+        Returns:
+            Sorted token positions where a new sentence starts
+        """
+        token_bytes = self.encoder.decode_tokens_bytes(tokens)
+        ends = np.cumsum([len(b) for b in token_bytes], dtype=np.int64)
+        match_ends = [m.end() for m in _SENTENCE_BOUNDARY_RE.finditer(b"".join(token_bytes))]
+        # A match ending inside a token snaps back to that token's start.
+        # Returned as a list: the per-chunk lookups bisect it, which is much
+        # cheaper than a NumPy call per scalar.
+        return np.unique(np.searchsorted(ends, match_ends, side="right")).tolist()
     
     def _find_sentence_boundary(
         self,
-        tokens: List[int],
+        boundaries: List[int],
         target_position: int,
         search_range: int = 50
     ) -> int:
@@ -163,47 +242,31 @@ class TextChunker:
         Find the nearest sentence boundary to a target position.
         
         Args:
-            tokens: Token list
+            boundaries: Sorted boundary positions from _sentence_boundaries()
             target_position: Target position in tokens
             search_range: How far to search for boundary
             
         Returns:
             Adjusted position at sentence boundary
         """
-        if not self.respect_sentences:
-            return target_position
-        
-        # Decode tokens around target position
-        start = max(0, target_position - search_range)
-        end = min(len(tokens), target_position + search_range)
-        
-        text_segment = self._encoder.decode(tokens[start:end])
-        
-        # Find sentence boundaries (., !, ?, newlines)
-        sentence_pattern = r'[.!?]\s+|\n\n'
-        
-        # Look for boundaries and find closest to middle of segment
-        relative_target = target_position - start
-        best_boundary = relative_target
-        best_distance = float('inf')
+        i = bisect_left(boundaries, target_position)
+        best_boundary = target_position
+        best_distance = search_range
         
-        for match in re.finditer(sentence_pattern, text_segment):
-            boundary_pos = match.end()
-            # Convert character position to approximate token position
-            char_ratio = len(text_segment) / (end - start)
-            token_pos = int(boundary_pos / char_ratio)
-            distance = abs(token_pos - relative_target)
-            
-            if distance < best_distance and distance < search_range:
+        # Closest boundary at or below the target wins ties
+        for candidate in boundaries[max(0, i - 1):i + 1]:
+            distance = abs(candidate - target_position)
+            if distance < best_distance:
                 best_distance = distance
-                best_boundary = token_pos
+                best_boundary = candidate
         
-        return start + best_boundary
+        return best_boundary
     
     def chunk_text(
         self,
         text: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        precomputed_tokens: Optional[List[int]] = None
     ) -> List[Chunk]:
         """
         Split text into token-aware chunks with overlap.
@@ -211,6 +274,8 @@ class TextChunker:
         Args:
             text: Input text to chunk
             metadata: Metadata to attach to all chunks
+            precomputed_tokens: Tokens of text from this chunker's encoding,
+                if the caller already has them
             
         Returns:
             List of Chunk objects
@@ -218,17 +283,138 @@ class TextChunker:
         if not text or not text.strip():
             return []
         
-        metadata = metadata or {}
-        
         # Tokenize full text
-        tokens = self._encoder.encode(text)
+        if precomputed_tokens is None:
+            precomputed_tokens = (
+                self.encoder.encode(text) if self._token_cache is None
+                else self._encode_batch([text])[0]
+            )
+        return self._chunk_tokens(text, precomputed_tokens, metadata)
+    
+    def chunk_batch(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        return_exceptions: bool = False
+    ) -> List[Union[List[Chunk], Exception]]:
+        """
+        Chunk many texts, tokenizing them all in one batch call.
+        
+        tiktoken's batch encoder runs across threads in native code, so
+        many short documents (e.g. FAQ entries) are not dominated by
+        per-call overhead. Documents are then split on a thread pool;
+        the byte decoding in splitting also runs in native code.
+        
+        Args:
+            texts: Input texts
+            metadatas: Metadata for each text's chunks
+            return_exceptions: Return a failing text's exception in its slot
+                instead of raising
+            
+        Returns:
+            One list of chunks per input text, in input order
+        """
+        metadatas = metadatas or [None] * len(texts)
+        
+        try:
+            token_lists = self._encode_batch(texts)
+        except Exception:
+            # One bad text fails the whole batch call; retry per text so
+            # errors are attributed to the texts that caused them
+            token_lists = None
+        
+        def chunk_one(i: int) -> Union[List[Chunk], Exception]:
+            text, metadata = texts[i], metadatas[i]
+            try:
+                if not text or not text.strip():
+                    return []
+                if token_lists is None:
+                    return self.chunk_text(text, metadata)
+                return self._chunk_tokens(text, token_lists[i], metadata)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+        
+        workers = min(self.max_workers, len(texts))
+        if workers <= 1:
+            return [chunk_one(i) for i in range(len(texts))]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(chunk_one, range(len(texts))))
+    
+    def _fixed_windows(self, total_tokens: int) -> List[Tuple[int, int]]:
+        """
+        Lay out fixed-size overlapping windows without sentence snapping.
+        
+        Args:
+            total_tokens: Number of tokens in the document
+            
+        Returns:
+            (start, end) token ranges; the last one ends at total_tokens
+        """
+        # An overlap as large as the chunk would never advance, so it is dropped
+        step = self.chunk_size - self.overlap if self.overlap < self.chunk_size else self.chunk_size
+        count = 1 + -(-max(0, total_tokens - self.chunk_size) // step)
+        starts = np.arange(count, dtype=np.int64) * step
+        ends = np.minimum(starts + self.chunk_size, total_tokens)
+        return list(zip(starts.tolist(), ends.tolist()))
+    
+    def _sentence_windows(self, tokens: List[int]) -> List[Tuple[int, int]]:
+        """
+        Lay out overlapping windows that end at sentence boundaries.
+        
+        Each window starts from where the previous one ended, so this
+        stays a loop; the boundaries themselves are found in one pass.
+        
+        Args:
+            tokens: Token list for the whole document
+            
+        Returns:
+            (start, end) token ranges; the last one ends at len(tokens)
+        """
+        total_tokens = len(tokens)
+        boundaries = self._sentence_boundaries(tokens)
+        ranges = []
+        position = 0
+        
+        while True:
+            # Calculate end position for this chunk
+            end_position = min(position + self.chunk_size, total_tokens)
+            
+            # Try to find sentence boundary for cleaner breaks
+            if end_position < total_tokens:
+                boundary = self._find_sentence_boundary(
+                    boundaries, end_position, search_range=50
+                )
+                if boundary > position:
+                    end_position = boundary
+            
+            ranges.append((position, end_position))
+            if end_position >= total_tokens:
+                # Anything after this would lie entirely inside the overlap
+                return ranges
+            
+            # Move position with overlap
+            next_position = end_position - self.overlap
+            if next_position <= position:
+                # Prevent infinite loop for small texts
+                next_position = end_position
+            position = next_position
+    
+    def _chunk_tokens(
+        self,
+        text: str,
+        tokens: List[int],
+        metadata: Optional[Dict[str, Any]]
+    ) -> List[Chunk]:
+        """Split already-tokenized text into chunks."""
+        metadata = metadata or {}
         total_tokens = len(tokens)
         
         if total_tokens <= self.chunk_size:
             # Text fits in one chunk
-            chunk_metadata = metadata.copy()
-            chunk_metadata["chunk_index"] = 0
-            chunk_metadata["token_count"] = total_tokens
+            chunk_metadata = {**metadata, "chunk_index": 0, "token_count": total_tokens}
             return [Chunk(
                 text=text,
                 index=0,
@@ -238,47 +424,35 @@ class TextChunker:
                 metadata=chunk_metadata
             )]
         
-        chunks = []
-        position = 0
-        chunk_index = 0
+        # First pass: choose chunk boundaries
+        if self.respect_sentences:
+            ranges = self._sentence_windows(tokens)
+        else:
+            ranges = self._fixed_windows(total_tokens)
         
-        while position < total_tokens:
-            # Calculate end position for this chunk
-            end_position = min(position + self.chunk_size, total_tokens)
-            
-            # Try to find sentence boundary for cleaner breaks
-            if end_position < total_tokens:
-                end_position = self._find_sentence_boundary(
-                    tokens, end_position, search_range=50
-                )
-            
-            # Extract chunk tokens and decode
-            chunk_tokens = tokens[position:end_position]
-            chunk_text = self._encoder.decode(chunk_tokens)
-            
-            # Create chunk with metadata
-            chunk_metadata = metadata.copy()
-            chunk_metadata["chunk_index"] = chunk_index
-            chunk_metadata["token_count"] = len(chunk_tokens)
+        # Second pass: decode each chunk. decode_batch() would start a
+        # thread pool per call, which costs more than decoding a few chunks
+        # and nests inside chunk_batch()'s own pool
+        decode = self.encoder.decode
+        chunk_texts = [decode(tokens[start:end]) for start, end in ranges]
+        
+        chunks = []
+        for chunk_index, ((start, end), chunk_text) in enumerate(zip(ranges, chunk_texts)):
+            # Create chunk with metadata. Each chunk needs its own plain
+            # dict (Chroma rejects mapping views such as ChainMap), so build
+            # it in one step rather than copy-then-update
+            chunk_metadata = {**metadata, "chunk_index": chunk_index, "token_count": end - start}
             
             chunks.append(Chunk(
                 text=chunk_text,
                 index=chunk_index,
-                start_token=position,
-                end_token=end_position,
-                token_count=len(chunk_tokens),
+                start_token=start,
+                end_token=end,
+                token_count=end - start,
                 metadata=chunk_metadata
             ))
-            
-            # Move position with overlap
-            position = end_position - self.overlap
-            if position <= chunks[-1].start_token:
-                # Prevent infinite loop for small texts
-                position = end_position
-            
-            chunk_index += 1
         
-        logger.debug(f"Created {len(chunks)} chunks from {total_tokens} tokens")
+        logger.debug("Created %d chunks from %d tokens", len(chunks), total_tokens)
         return chunks
     
     def chunk_documents(
@@ -298,7 +472,8 @@ class TextChunker:
         Returns:
             List of all chunks from all documents
         """
-        all_chunks = []
+        texts = []
+        metadatas: List[Optional[Dict[str, Any]]] = []
         
         for doc_idx, doc in enumerate(documents):
             text = doc.get(text_key, "")
@@ -317,11 +492,15 @@ class TextChunker:
                     if key != text_key:
                         metadata[key] = value
             
-            # Chunk this document
-            chunks = self.chunk_text(text, metadata=metadata)
+            texts.append(text)
+            metadatas.append(metadata)
+        
+        # Tokenize every document in one batch call, then split each
+        all_chunks = []
+        for chunks in self.chunk_batch(texts, metadatas):
             all_chunks.extend(chunks)
         
-        logger.info(f"Created {len(all_chunks)} chunks from {len(documents)} documents")
+        logger.info("Created %d chunks from %d documents", len(all_chunks), len(documents))
         return all_chunks
 
 
@@ -0,0 +1,130 @@
+"""
+Context Compression Module
+
+Extractive compression for retrieved passages and older conversation turns.
+
+Each sentence is scored by its mean TF-IDF weight (IDF computed over the
+sentences of the text being compressed) times a structural weight that
+favours sentences carrying concrete details such as numbers, codes or
+list items. The highest-scoring sentences are kept until they hold a
+`theta` share of the text's total score; kept sentences stay in their
+original order.
+
+The result is deterministic, so compressing the same history twice gives
+byte-identical prompts.
+
+Usage:
+    from src.pipeline.compression import quench
+
+    shorter = quench(passage, theta=0.8)
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Tuple
+
+# Sentence ends, or line breaks (list items and headers are sentences too)
+_SENTENCE_SPLIT_RE = re.compile(r'((?<=[.!?])[ \t]+|\s*\n\s*)')
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_DETAIL_RE = re.compile(r'\d|\*\d+#|https?://|@')
+_LIST_ITEM_RE = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s')
+
+# Words that carry no information on their own
+_STOP_WORDS = frozenset(
+    "a an and are as at be by can do for from has have i if in is it its "
+    "me my of on or our so that the then this to us we will with you your".split()
+)
+
+# Texts with fewer sentences than this are returned unchanged
+MIN_SENTENCES = 3
+
+
+def _split_sentences(text: str) -> Tuple[List[str], List[str]]:
+    """Split text into sentences and the separator that precedes each one."""
+    pieces = _SENTENCE_SPLIT_RE.split(text.strip())
+    sentences, separators = [], []
+    separator = ""
+    for i, piece in enumerate(pieces):
+        if i % 2:
+            separator = piece
+        elif piece:
+            sentences.append(piece)
+            separators.append(separator)
+    return sentences, separators
+
+
+def _structural_weight(sentence: str, position: int) -> float:
+    """Weight sentences that usually carry the answer."""
+    weight = 1.0
+    if position == 0:
+        weight *= 1.2
+    if _DETAIL_RE.search(sentence):
+        weight *= 1.3
+    if _LIST_ITEM_RE.match(sentence):
+        weight *= 1.2
+    return weight
+
+
+def _sentence_scores(sentences: List[str]) -> List[float]:
+    """Score each sentence by mean TF-IDF times its structural weight."""
+    words = [
+        [w for w in _WORD_RE.findall(s.lower()) if w not in _STOP_WORDS]
+        for s in sentences
+    ]
+    document_frequency = Counter(w for ws in words for w in set(ws))
+    n = len(sentences)
+    idf = {w: math.log((1 + n) / (1 + df)) + 1 for w, df in document_frequency.items()}
+
+    scores = []
+    for position, (sentence, ws) in enumerate(zip(sentences, words)):
+        if not ws:
+            scores.append(0.0)
+            continue
+        tf = Counter(ws)
+        tf_idf_mean = sum(count * idf[w] for w, count in tf.items()) / len(ws)
+        scores.append(tf_idf_mean * _structural_weight(sentence, position))
+    return scores
+
+
+def quench(text: str, theta: float = 0.8) -> str:
+    """
+    Drop low-information sentences from a text.
+
+    Args:
+        text: Text to compress
+        theta: Share of the text's total sentence score to keep (0-1);
+            1.0 keeps everything
+
+    Returns:
+        The highest-scoring sentences in their original order; the text
+        unchanged if it is too short to compress
+    """
+    sentences, separators = _split_sentences(text)
+    if len(sentences) < MIN_SENTENCES or theta >= 1.0:
+        return text
+
+    scores = _sentence_scores(sentences)
+    total = sum(scores)
+    if total <= 0:
+        return text
+
+    kept = set()
+    running = 0.0
+    for i in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+        if running >= theta * total:
+            break
+        kept.add(i)
+        running += scores[i]
+
+    # Keep line breaks between kept sentences, so lists stay lists
+    parts = []
+    newline = False
+    for i, sentence in enumerate(sentences):
+        newline = newline or "\n" in separators[i]
+        if i in kept:
+            if parts:
+                parts.append("\n" if newline else " ")
+            parts.append(sentence)
+            newline = False
+    return "".join(parts)
@@ -0,0 +1,42 @@
+"""
+Default Providers Module
+
+Process-wide default embedding provider, vector store and LLM provider.
+
+Components that are given no explicit provider share these instances, so
+HTTP connection pools, the Chroma client and loaded tokenizers are built
+once per process rather than once per RAGPipeline or DocumentIngester.
+Sharing the vector store also means a retriever sees writes made by an
+ingester in the same process at once (its result cache keys on the store's
+write generation); writes from other processes show up once cached results
+expire (RETRIEVAL_CACHE_TTL_SECONDS).
+
+Usage:
+    from src.pipeline.providers import get_default_vector_store
+
+    store = get_default_vector_store()
+"""
+
+from functools import lru_cache
+
+from src.core.embeddings import AzureEmbeddingProvider
+from src.core.llm import AzureLLMProvider
+from src.core.vectorstore import ChromaVectorStore
+
+
+@lru_cache(maxsize=1)
+def get_default_embedding_provider() -> AzureEmbeddingProvider:
+    """Get the shared default embedding provider."""
+    return AzureEmbeddingProvider()
+
+
+@lru_cache(maxsize=1)
+def get_default_vector_store() -> ChromaVectorStore:
+    """Get the shared default vector store."""
+    return ChromaVectorStore()
+
+
+@lru_cache(maxsize=1)
+def get_default_llm_provider() -> AzureLLMProvider:
+    """Get the shared default LLM provider."""
+    return AzureLLMProvider()
@@ -23,23 +23,41 @@ Usage:
     print(response.answer)
 """
 
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Iterator
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, Tuple, Deque, Sequence, Callable
 from datetime import datetime
+import asyncio
+import hashlib
 import threading
+import time
 
-from src.core.embeddings import EmbeddingProvider, AzureEmbeddingProvider
-from src.core.vectorstore import VectorStore, ChromaVectorStore
+from src.core.embeddings import EmbeddingProvider
+from src.core.vectorstore import VectorStore
 from src.core.llm import (
-    LLMProvider, AzureLLMProvider, Message,
-    build_rag_messages, RAG_SYSTEM_PROMPT
+    LLMProvider, ChatResponse, Message,
+    build_rag_messages, RAG_SYSTEM_PROMPT, HISTORY_SUMMARY_PROMPT
+)
+from src.core.cache import LRUCache
+from src.core.tokens import count_tokens
+from src.pipeline.compression import quench
+from src.pipeline.providers import (
+    get_default_embedding_provider, get_default_llm_provider, get_default_vector_store
 )
 from src.pipeline.retriever import Retriever, RetrievalResult
+from src.pipeline.router import SafetyGreetingRouter
 from src.config import settings
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Max cached history summaries (keyed by a hash of the summary and turns folded into it)
+_SUMMARY_CACHE_SIZE = 256
+
+# Completion budget for history summaries
+_SUMMARY_MAX_TOKENS = 120
+
 
 @dataclass
 class RAGResponse:
@@ -53,7 +71,7 @@ class RAGResponse:
         retrieval_result: Full retrieval result for inspection
         model: Model used for generation
         tokens_used: Token usage statistics
-        timestamp: When response was generated
+        timestamp_ns: When response was generated (ns since the epoch)
     """
     answer: str
     query: str
@@ -61,7 +79,13 @@ class RAGResponse:
     retrieval_result: Optional[RetrievalResult] = None
     model: str = ""
     tokens_used: Dict[str, int] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.now)
+    # time.time_ns() is far cheaper than building a datetime per response
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """When the response was generated, as a local datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
     
     @property
     def has_sources(self) -> bool:
@@ -88,20 +112,47 @@ class ConversationMemory:
     Stores recent messages and provides them as context
     for follow-up questions.
     
+    History is trimmed from the front in blocks rather than one turn at a
+    time, so the history prefix of the prompt stays byte-identical for
+    several turns in a row and provider-side prompt caching keeps hitting.
+    
+    Turns that leave the verbatim history are kept aside until
+    fold_evicted() merges them into a rolling summary.
+    
+    Methods are thread-safe, so one session can be used from concurrent
+    requests.
+    
     Attributes:
         max_turns: Maximum conversation turns to remember
-        messages: List of conversation messages
+        trim_turns: Oldest turns dropped at once when max_turns is exceeded
+        messages: Conversation messages, oldest first
+        summary: Rolling summary of turns no longer held verbatim
     """
     
-    def __init__(self, max_turns: int = 5):
+    def __init__(self, max_turns: int = 5, trim_turns: Optional[int] = None):
         """
         Initialize conversation memory.
         
         Args:
             max_turns: Maximum turns to keep in memory
+            trim_turns: Turns to drop per trim (defaults to half of max_turns, rounded up)
         """
         self.max_turns = max_turns
-        self.messages: List[Message] = []
+        self.trim_turns = trim_turns or max(1, (max_turns + 1) // 2)
+        self.messages: Deque[Message] = deque()
+        self.summary = ""
+        # Evicted turns not yet summarized; bounded in case nobody summarizes
+        self._evicted: Deque[Message] = deque(maxlen=2 * max(self.max_turns, self.trim_turns))
+        self._turn_count = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+        # Serializes summarization without blocking add_turn()
+        self._fold_lock = threading.Lock()
+    
+    @property
+    def turn_count(self) -> int:
+        """Number of turns currently held in memory."""
+        return self._turn_count
     
     def add_turn(self, user_message: str, assistant_message: str) -> None:
         """
@@ -111,26 +162,86 @@ class ConversationMemory:
             user_message: User's message
             assistant_message: Assistant's response
         """
-        self.messages.append(Message(role="user", content=user_message))
         # Strip ACTION lines from assistant memory to avoid action echo on follow-ups.
         cleaned_assistant = "\n".join(
             line for line in assistant_message.splitlines()
             if not line.strip().startswith("ACTION:")
         )
-        self.messages.append(Message(role="assistant", content=cleaned_assistant))
+        turn = [
+            Message(role="user", content=user_message),
+            Message(role="assistant", content=cleaned_assistant),
+        ]
+        with self._lock:
+            self.messages.extend(turn)
+            self._turn_count += 1
+            
+            # Trim to max turns (each turn = 2 messages), a block at a time
+            max_messages = self.max_turns * 2
+            if len(self.messages) > max_messages:
+                self._evict(max(self.trim_turns, self._turn_count - self.max_turns))
+    
+    def _evict(self, turns: int) -> None:
+        """Move the oldest turns out of verbatim history (caller holds the lock)."""
+        for _ in range(turns * 2):
+            self._evicted.append(self.messages.popleft())
+        self._turn_count -= turns
+    
+    def evict_block(self) -> bool:
+        """
+        Move the oldest block of turns out of verbatim history early.
         
-        # Trim to max turns (each turn = 2 messages)
-        max_messages = self.max_turns * 2
-        if len(self.messages) > max_messages:
-            self.messages = self.messages[-max_messages:]
+        Used when the history is over its token budget. The latest turn is
+        always kept.
+        
+        Returns:
+            True if any turns were evicted
+        """
+        with self._lock:
+            turns = min(self.trim_turns, self._turn_count - 1)
+            if turns <= 0:
+                return False
+            self._evict(turns)
+            return True
+    
+    def fold_evicted(self, summarize: Callable[[str, Sequence[Message]], str]) -> str:
+        """
+        Fold turns evicted since the last call into the rolling summary.
+        
+        Args:
+            summarize: Called with the current summary and the evicted
+                messages; returns the new summary
+            
+        Returns:
+            The current summary ("" if nothing has been summarized)
+        """
+        with self._fold_lock:
+            with self._lock:
+                evicted = tuple(self._evicted)
+                self._evicted.clear()
+                summary, epoch = self.summary, self._epoch
+            if not evicted:
+                return summary
+            
+            summary = summarize(summary, evicted)
+            with self._lock:
+                # Don't resurrect a conversation cleared meanwhile
+                if self._epoch == epoch:
+                    self.summary = summary
+            return summary
     
-    def get_history(self) -> List[Message]:
-        """Get conversation history messages."""
-        return self.messages.copy()
+    def get_history(self) -> Tuple[Message, ...]:
+        """Get an immutable snapshot of the conversation history messages."""
+        with self._lock:
+            return tuple(self.messages)
     
     def clear(self) -> None:
         """Clear conversation history."""
-        self.messages.clear()
+        with self._lock:
+            self.messages.clear()
+            self._evicted.clear()
+            self.summary = ""
+            self._epoch += 1
+            self._turn_count = 0
 
 
 class RAGPipeline:
@@ -173,7 +284,10 @@ class RAGPipeline:
         retriever: Optional[Retriever] = None,
         system_prompt: Optional[str] = None,
         enable_memory: bool = True,
-        memory_turns: int = 5
+        memory_turns: int = 5,
+        enable_quick_replies: bool = True,
+        use_batch_for_stream: bool = False,
+        max_concurrent_queries: int = 32
     ):
         """
         Initialize the RAG pipeline.
@@ -186,11 +300,16 @@ class RAGPipeline:
             system_prompt: Custom system prompt
             enable_memory: Enable conversation memory
             memory_turns: Number of turns to remember
+            enable_quick_replies: Answer greetings/goodbyes/abuse without retrieval or LLM
+            use_batch_for_stream: Make stream_query() request the whole response and
+                re-emit it (lower total latency, later first token)
+            max_concurrent_queries: Async queries (aquery/astream_query) allowed
+                in flight at once; the rest wait their turn
         """
         # Initialize components with defaults
-        self.embedding_provider = embedding_provider or AzureEmbeddingProvider()
-        self.vector_store = vector_store or ChromaVectorStore()
-        self.llm_provider = llm_provider or AzureLLMProvider()
+        self.embedding_provider = embedding_provider or get_default_embedding_provider()
+        self.vector_store = vector_store or get_default_vector_store()
+        self.llm_provider = llm_provider or get_default_llm_provider()
         
         # Initialize retriever
         self.retriever = retriever or Retriever(
@@ -201,12 +320,26 @@ class RAGPipeline:
         # Configuration
         self.system_prompt = system_prompt or RAG_SYSTEM_PROMPT
         self.context_token_budget = settings.retrieval.context_token_budget
+        self.compression_theta = (
+            settings.retrieval.compression_theta
+            if settings.retrieval.compression_enabled else None
+        )
+        self.history_token_budget = settings.llm.history_token_budget
+        self._summary_cache: LRUCache[str] = LRUCache(_SUMMARY_CACHE_SIZE)
+        self.router = SafetyGreetingRouter() if enable_quick_replies else None
+        self.use_batch_for_stream = use_batch_for_stream
+        self.max_concurrent_queries = max_concurrent_queries
+        self._query_slots: Optional[asyncio.Semaphore] = None
+        self._query_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prep_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-prep")
         
         # Conversation memory (session-aware)
         self._memory_enabled = enable_memory
         self._memory_turns = memory_turns
         self._default_memory = ConversationMemory(max_turns=memory_turns) if enable_memory else None
-        self._session_memories: Dict[str, ConversationMemory] = {}
+        # Least recently used session first
+        self._session_memories: "OrderedDict[str, ConversationMemory]" = OrderedDict()
+        self._session_cap = settings.memory.max_sessions
         self._memory_lock = threading.Lock()
         
         logger.info(
@@ -228,50 +361,143 @@ class RAGPipeline:
             if mem is None:
                 mem = ConversationMemory(max_turns=self._memory_turns)
                 self._session_memories[session_id] = mem
+                if len(self._session_memories) > self._session_cap:
+                    self._session_memories.popitem(last=False)
+            else:
+                self._session_memories.move_to_end(session_id)
             return mem
     
-    def query(
+    def _compress_history(
         self,
-        question: str,
-        top_k: Optional[int] = None,
-        include_history: bool = False,
-        filter_metadata: Optional[Dict[str, Any]] = None,
-        session_id: Optional[str] = None,
-        session_status: Optional[str] = None
-    ) -> RAGResponse:
+        memory: ConversationMemory,
+        max_tokens: Optional[int] = None
+    ) -> Sequence[Message]:
         """
-        Process a question through the RAG pipeline.
+        Keep conversation history within a token budget.
+        
+        Recent turns are kept verbatim. While they are over budget the
+        oldest block of turns is evicted from memory; evicted turns (and
+        those trimmed by the memory itself) are folded into a rolling
+        summary sent as one system message. The summary only changes when
+        a block is evicted, so between evictions the history prefix of the
+        prompt stays byte-identical.
         
         Args:
-            question: User's question
-            top_k: Number of documents to retrieve
-            include_history: Include conversation history in context
-            filter_metadata: Filter retrieval by metadata
+            memory: Conversation memory to read (and evict from)
+            max_tokens: Token budget (defaults to settings)
             
         Returns:
-            RAGResponse with answer and sources
+            History that fits the budget
         """
-        logger.info(f"Processing query: {question[:50]}...")
+        budget = max_tokens or self.history_token_budget
+        history = memory.get_history()
+        
+        # Leave room for the summary once there is (or will be) one
+        limit = budget - _SUMMARY_MAX_TOKENS if memory.summary else budget
+        while sum(count_tokens(m.content) for m in history) > limit and memory.evict_block():
+            limit = budget - _SUMMARY_MAX_TOKENS
+            history = memory.get_history()
+        
+        summary = memory.fold_evicted(self._summarize)
+        if not summary:
+            return history
+        return [Message(role="system", content=f"Summary so far: {summary}"), *history]
+    
+    def _summarize(self, summary: str, evicted: Sequence[Message]) -> str:
+        """
+        Fold evicted turns into a rolling summary with one short LLM call.
+        
+        Args:
+            summary: Summary so far ("" for none)
+            evicted: Messages leaving the verbatim history, oldest first
+            
+        Returns:
+            The new summary, or the old one if summarization fails
+        """
+        transcript = "\n".join(f"{m.role}: {m.content}" for m in evicted)
+        if summary:
+            transcript = f"Summary so far: {summary}\n\n{transcript}"
+        key = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            folded = self.llm_provider.chat(
+                [
+                    Message(role="system", content=HISTORY_SUMMARY_PROMPT),
+                    Message(role="user", content=transcript),
+                ],
+                temperature=0.0,
+                max_tokens=_SUMMARY_MAX_TOKENS
+            ).content.strip()
+        except Exception as e:
+            logger.warning(f"History summarization failed, dropping evicted turns: {e}")
+            return summary
+        
+        self._summary_cache.set(key, folded)
+        logger.debug(f"Folded {len(evicted)} evicted history messages into the summary")
+        return folded
+    
+    def _history_for(
+        self,
+        memory: Optional[ConversationMemory],
+        include_history: bool
+    ) -> Optional[Sequence[Message]]:
+        """Get the (compressed) conversation history to send, if any."""
+        history = self._compress_history(memory) if (memory and include_history) else None
+        if history and self.compression_theta is not None:
+            # The latest turn stays verbatim; follow-ups usually refer to it
+            history = [
+                *(Message(role=m.role, content=quench(m.content, self.compression_theta))
+                  for m in history[:-2]),
+                *history[-2:]
+            ]
+        return history
+    
+    def _retrieve_with_history(
+        self,
+        question: str,
+        top_k: Optional[int],
+        filter_metadata: Optional[Dict[str, Any]],
+        memory: Optional[ConversationMemory],
+        include_history: bool
+    ) -> Tuple[RetrievalResult, Optional[Sequence[Message]]]:
+        """
+        Retrieve context and prepare conversation history at the same time.
+        
+        Preparing history can mean an LLM call to summarize older turns, so
+        it runs on a worker thread while retrieval runs on this one.
+        """
+        pending = None
+        if memory and include_history and memory.turn_count:
+            pending = self._prep_pool.submit(self._history_for, memory, include_history)
         
-        # Step 1: Retrieve relevant documents
         retrieval_result = self.retriever.retrieve(
             query=question,
             top_k=top_k,
             filter_metadata=filter_metadata
         )
-        
-        # Step 2: Format context
+        history = pending.result() if pending is not None else None
+        return retrieval_result, history
+    
+    def _build_messages(
+        self,
+        question: str,
+        retrieval_result: RetrievalResult,
+        history: Optional[Sequence[Message]],
+        session_status: Optional[str]
+    ) -> List[Message]:
+        """Format retrieved context and build messages that fit the context window."""
         context = retrieval_result.format_context(
             include_source=True,
-            max_tokens=self.context_token_budget
+            max_tokens=self.context_token_budget,
+            compression_theta=self.compression_theta
         )
         
         if not context:
             context = "No relevant information found in the knowledge base."
         
-        # Step 3: Build messages
-        memory = self._get_memory(session_id)
-        history = memory.get_history() if (memory and include_history) else None
         messages = build_rag_messages(
             question=question,
             context=context,
@@ -279,10 +505,70 @@ class RAGPipeline:
             conversation_history=history,
             session_status=session_status,
         )
+        fitted = self.llm_provider.fit_context(context, messages)
+        if fitted != context:
+            messages = build_rag_messages(
+                question=question,
+                context=fitted,
+                system_prompt=self.system_prompt,
+                conversation_history=history,
+                session_status=session_status,
+            )
+        return messages
+    
+    def query(
+        self,
+        question: str,
+        top_k: Optional[int] = None,
+        include_history: bool = False,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        session_status: Optional[str] = None
+    ) -> RAGResponse:
+        """
+        Process a question through the RAG pipeline.
+        
+        Args:
+            question: User's question
+            top_k: Number of documents to retrieve
+            include_history: Include conversation history in context
+            filter_metadata: Filter retrieval by metadata
+            
+        Returns:
+            RAGResponse with answer and sources
+        """
+        logger.info(f"Processing query: {question[:50]}...")
+        memory = self._get_memory(session_id)
+        
+        # Step 0: Answer greetings/goodbyes/abuse locally
+        quick_reply = self.router.route(question) if self.router else None
+        if quick_reply is not None:
+            if memory:
+                memory.add_turn(question, quick_reply)
+            logger.info("Answered with a quick reply")
+            return RAGResponse(answer=quick_reply, query=question)
+        
+        # Step 1: Retrieve relevant documents (history is prepared alongside)
+        retrieval_result, history = self._retrieve_with_history(
+            question, top_k, filter_metadata, memory, include_history
+        )
+        
+        # Steps 2-3: Format context and build messages
+        messages = self._build_messages(question, retrieval_result, history, session_status)
         
         # Step 4: Generate response
         chat_response = self.llm_provider.chat(messages)
         
+        return self._finish_query(question, retrieval_result, chat_response, memory)
+    
+    def _finish_query(
+        self,
+        question: str,
+        retrieval_result: RetrievalResult,
+        chat_response: ChatResponse,
+        memory: Optional[ConversationMemory]
+    ) -> RAGResponse:
+        """Build the RAGResponse for a generated answer and record the turn."""
         # Step 5: Build response
         response = RAGResponse(
             answer=chat_response.content,
@@ -348,36 +634,31 @@ class RAGPipeline:
             Response tokens as they're generated
         """
         logger.info(f"Streaming query: {question[:50]}...")
+        memory = self._get_memory(session_id)
         
-        # Retrieve and prepare context
-        retrieval_result = self.retriever.retrieve(
-            query=question,
-            top_k=top_k,
-            filter_metadata=filter_metadata
-        )
+        # Answer greetings/goodbyes/abuse locally
+        quick_reply = self.router.route(question) if self.router else None
+        if quick_reply is not None:
+            yield quick_reply
+            if memory:
+                memory.add_turn(question, quick_reply)
+            return
         
-        context = retrieval_result.format_context(
-            include_source=True,
-            max_tokens=self.context_token_budget
+        # Retrieve context while conversation history is prepared
+        retrieval_result, history = self._retrieve_with_history(
+            question, top_k, filter_metadata, memory, include_history
         )
         
-        if not context:
-            context = "No relevant information found in the knowledge base."
-        
         # Build messages with conversation history
-        memory = self._get_memory(session_id)
-        history = memory.get_history() if (memory and include_history) else None
-        messages = build_rag_messages(
-            question=question,
-            context=context,
-            system_prompt=self.system_prompt,
-            conversation_history=history,
-            session_status=session_status,
-        )
+        messages = self._build_messages(question, retrieval_result, history, session_status)
         
         # Stream response
         full_response = ""
-        for token in self.llm_provider.stream_chat(messages):
+        stream = (
+            self.llm_provider.stream_chat_via_batch
+            if self.use_batch_for_stream else self.llm_provider.stream_chat
+        )
+        for token in stream(messages):
             full_response += token
             yield token
         
@@ -385,6 +666,147 @@ class RAGPipeline:
         if memory:
             memory.add_turn(question, full_response)
     
+    def _slots(self) -> asyncio.Semaphore:
+        """Get the concurrency limiter for async queries on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._query_slots is None or self._query_slots_loop is not loop:
+            self._query_slots = asyncio.Semaphore(self.max_concurrent_queries)
+            self._query_slots_loop = loop
+        return self._query_slots
+    
+    async def _aprepare(
+        self,
+        question: str,
+        top_k: Optional[int],
+        filter_metadata: Optional[Dict[str, Any]],
+        memory: Optional[ConversationMemory],
+        include_history: bool,
+        session_status: Optional[str]
+    ) -> Tuple[RetrievalResult, List[Message]]:
+        """Retrieve context and prepare history concurrently, then build messages."""
+        retrieval = self.retriever.aretrieve(
+            query=question,
+            top_k=top_k,
+            filter_metadata=filter_metadata
+        )
+        if memory and include_history:
+            # History compression may call the LLM; run it alongside retrieval
+            retrieval_result, history = await asyncio.gather(
+                retrieval,
+                asyncio.to_thread(self._history_for, memory, include_history)
+            )
+        else:
+            retrieval_result, history = await retrieval, None
+        
+        messages = self._build_messages(question, retrieval_result, history, session_status)
+        return retrieval_result, messages
+    
+    async def aquery(
+        self,
+        question: str,
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_history: bool = True,
+        session_id: Optional[str] = None,
+        session_status: Optional[str] = None
+    ) -> RAGResponse:
+        """
+        Async version of query() for serving many requests on one event loop.
+        
+        Query embedding, vector search and history preparation run
+        concurrently, and the event loop stays free while waiting on them.
+        
+        Args:
+            question: User's question
+            top_k: Number of documents to retrieve
+            filter_metadata: Filter retrieval by metadata
+            include_history: Include conversation history
+            session_id: Conversation session
+            session_status: Optional session status hint for the prompt
+            
+        Returns:
+            RAGResponse with answer and sources
+        """
+        logger.info(f"Processing async query: {question[:50]}...")
+        memory = self._get_memory(session_id)
+        
+        quick_reply = self.router.route(question) if self.router else None
+        if quick_reply is not None:
+            if memory:
+                memory.add_turn(question, quick_reply)
+            logger.info("Answered with a quick reply")
+            return RAGResponse(answer=quick_reply, query=question)
+        
+        async with self._slots():
+            retrieval_result, messages = await self._aprepare(
+                question, top_k, filter_metadata, memory, include_history, session_status
+            )
+            chat_response = await self.llm_provider.achat(messages)
+        
+        return self._finish_query(question, retrieval_result, chat_response, memory)
+    
+    async def astream_query(
+        self,
+        question: str,
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_history: bool = True,
+        session_id: Optional[str] = None,
+        session_status: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async version of stream_query().
+        
+        Args:
+            question: User's question
+            top_k: Number of documents to retrieve
+            filter_metadata: Filter retrieval by metadata
+            include_history: Include conversation history
+            session_id: Conversation session
+            session_status: Optional session status hint for the prompt
+            
+        Yields:
+            Response tokens as they're generated
+        """
+        logger.info(f"Streaming async query: {question[:50]}...")
+        memory = self._get_memory(session_id)
+        
+        quick_reply = self.router.route(question) if self.router else None
+        if quick_reply is not None:
+            yield quick_reply
+            if memory:
+                memory.add_turn(question, quick_reply)
+            return
+        
+        full_response = ""
+        async with self._slots():
+            _, messages = await self._aprepare(
+                question, top_k, filter_metadata, memory, include_history, session_status
+            )
+            if self.use_batch_for_stream:
+                full_response = (await self.llm_provider.achat(messages)).content
+                if full_response:
+                    yield full_response
+            else:
+                async for token in self.llm_provider.astream_chat(messages):
+                    full_response += token
+                    yield token
+        
+        if memory:
+            memory.add_turn(question, full_response)
+    
+    def close(self) -> None:
+        """Shut down the history preparation thread pool."""
+        # An in-flight summary call isn't waited for; its result is unused
+        self._prep_pool.shutdown(wait=False, cancel_futures=True)
+    
+    async def aclose(self) -> None:
+        """Shut down the thread pool and stop the retriever's batching worker, if any."""
+        self.close()
+        retriever_aclose = getattr(self.retriever, "aclose", None)
+        if retriever_aclose is not None:
+            await retriever_aclose()
+    
     def clear_memory(self, session_id: Optional[str] = None) -> None:
         """Clear conversation memory (optionally for a single session)."""
         if not self._memory_enabled:
@@ -421,6 +843,6 @@ class RAGPipeline:
         return {
             "document_count": self.document_count,
             "memory_enabled": self._memory_enabled,
-            "memory_turns": len(self._default_memory.messages) // 2 if self._default_memory else 0,
+            "memory_turns": self._default_memory.turn_count if self._default_memory else 0,
             "context_token_budget": self.context_token_budget
         }
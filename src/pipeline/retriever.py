@@ -7,6 +7,7 @@ It combines embedding and vector store to find relevant documents.
 Architecture:
 - Retriever: Main class orchestrating embedding + search
 - RetrievalResult: Container for retrieval results with context
+- BatchingRetriever: Retriever that micro-batches concurrent async queries
 
 SOLID Principles:
 - Single Responsibility: Only handles retrieval logic
@@ -20,16 +21,29 @@ Usage:
     results = retriever.retrieve("How do I reset my password?", top_k=5)
 """
 
+import asyncio
+import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from hashlib import blake2b
+from typing import Hashable, List, Dict, Any, Optional, Tuple
 
+import numpy as np
+
+from src.core.cache import LRUCache, request_key
 from src.core.embeddings import EmbeddingProvider
+from src.core.microbatch import MicroBatcher
+from src.core.tokens import count_tokens, truncate_to_tokens
 from src.core.vectorstore import VectorStore, SearchResults, SearchResult
+from src.pipeline.compression import quench
 from src.config import settings
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# (query, top_k, filter_metadata)
+_Query = Tuple[str, int, Optional[Dict[str, Any]]]
+_PendingQuery = Tuple[_Query, "asyncio.Future[RetrievalResult]"]
+
 
 @dataclass
 class RetrievalResult:
@@ -42,7 +56,8 @@ class RetrievalResult:
     Attributes:
         query: Original query text
         results: List of search results
-        query_embedding: Embedding of the query
+        query_embedding: Embedding of the query (only when requested with
+            store_query_embedding, e.g. for reranking)
     """
     query: str
     results: List[SearchResult] = field(default_factory=list)
@@ -68,15 +83,22 @@ class RetrievalResult:
         self,
         include_source: bool = True,
         max_tokens: Optional[int] = None,
-        separator: str = "\n\n---\n\n"
+        separator: str = "\n\n---\n\n",
+        compression_theta: Optional[float] = None
     ) -> str:
         """
         Format retrieved documents as context string for LLM.
         
+        Documents are added in rank order until the token budget is
+        reached; the document that crosses it is cut to fit and marked
+        with "...".
+        
         Args:
             include_source: Include source metadata in context
-            max_tokens: Maximum tokens to include (approximate)
+            max_tokens: Maximum tokens to include
             separator: String to separate documents
+            compression_theta: If set, compress each document with quench()
+                before budgeting, keeping this share of its sentence score
             
         Returns:
             Formatted context string
@@ -84,27 +106,46 @@ class RetrievalResult:
         if not self.results:
             return ""
         
-        context_parts = []
-        
-        for i, result in enumerate(self.results, 1):
-            if include_source:
-                source = result.metadata.get("source", "Unknown")
-                chunk_idx = result.metadata.get("chunk_index", 0)
-                header = f"[Source: {source}, Chunk: {chunk_idx}]"
-                context_parts.append(f"{header}\n{result.text}")
-            else:
-                context_parts.append(result.text)
+        if not max_tokens:
+            # No budget: format every document in one pass and join once
+            return separator.join([
+                self._format_part(result, include_source, compression_theta)
+                for result in self.results
+            ])
         
-        full_context = separator.join(context_parts)
+        context_parts = []
+        used = 0
+        separator_tokens = count_tokens(separator)
         
-        # TODO: Implement proper token-based truncation
-        # For now, use character-based approximation (4 chars ≈ 1 token)
-        if max_tokens:
-            max_chars = max_tokens * 4
-            if len(full_context) > max_chars:
-                full_context = full_context[:max_chars] + "..."
+        for result in self.results:
+            part = self._format_part(result, include_source, compression_theta)
+            
+            cost = count_tokens(part) + (separator_tokens if context_parts else 0)
+            if used + cost > max_tokens:
+                room = max_tokens - used - (separator_tokens if context_parts else 0)
+                if room > 0:
+                    context_parts.append(truncate_to_tokens(part, room) + "...")
+                break
+            used += cost
+            
+            context_parts.append(part)
         
-        return full_context
+        return separator.join(context_parts)
+    
+    @staticmethod
+    def _format_part(
+        result: SearchResult,
+        include_source: bool,
+        compression_theta: Optional[float]
+    ) -> str:
+        """Format one document as a single string."""
+        metadata = result.metadata
+        text = result.text
+        if compression_theta is not None:
+            text = quench(text, compression_theta)
+        if not include_source:
+            return text
+        return f"[Source: {metadata.get('source', 'Unknown')}, Chunk: {metadata.get('chunk_index', 0)}]\n{text}"
     
     def get_sources(self) -> List[Dict[str, Any]]:
         """
@@ -113,19 +154,16 @@ class RetrievalResult:
         Returns:
             List of source metadata dicts
         """
-        seen = set()
-        sources = []
+        # First result per source wins; dicts keep insertion order
+        sources: Dict[str, Dict[str, Any]] = {}
         
         for result in self.results:
-            source = result.metadata.get("source", "Unknown")
-            if source not in seen:
-                seen.add(source)
-                sources.append({
-                    "source": source,
-                    "metadata": result.metadata
-                })
-        
-        return sources
+            metadata = result.metadata
+            source = metadata.get("source", "Unknown")
+            if source not in sources:
+                sources[source] = {"source": source, "metadata": metadata}
+        
+        return list(sources.values())
 
 
 class Retriever:
@@ -137,6 +175,16 @@ class Retriever:
     2. Search the vector store for similar documents
     3. Format results for downstream processing
     
+    Query embeddings are cached by normalized query text, so a repeated
+    query with a different filter only re-runs the search. Whole results
+    are cached too when the store exposes a `generation` counter that
+    changes on every write (ChromaVectorStore does).
+    
+    With MMR enabled, a larger candidate set is fetched (with embeddings)
+    and reduced to top_k by maximal marginal relevance, so near-duplicate
+    chunks don't crowd out other relevant ones. This needs a store whose
+    search accepts include_embeddings (ChromaVectorStore does).
+    
     Example:
         from src.core.embeddings import AzureEmbeddingProvider
         from src.core.vectorstore import ChromaVectorStore
@@ -154,7 +202,9 @@ class Retriever:
         self,
         embedding_provider: EmbeddingProvider,
         vector_store: VectorStore,
-        default_top_k: Optional[int] = None
+        default_top_k: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        use_mmr: Optional[bool] = None
     ):
         """
         Initialize the retriever.
@@ -163,10 +213,21 @@ class Retriever:
             embedding_provider: Provider for query embeddings
             vector_store: Store for document search
             default_top_k: Default number of results to return
+            cache_size: Entries per query cache (defaults to settings; 0 disables)
+            use_mmr: Diversify results with MMR (defaults to settings)
         """
         self.embedding_provider = embedding_provider
         self.vector_store = vector_store
         self.default_top_k = default_top_k or settings.retrieval.top_k
+        self.use_mmr = settings.retrieval.mmr_enabled if use_mmr is None else use_mmr
+        self.mmr_lambda = settings.retrieval.mmr_lambda
+        self.mmr_fetch_k = settings.retrieval.mmr_fetch_k
+        self.cache_ttl_seconds = settings.retrieval.cache_ttl_seconds
+        
+        cache_size = settings.retrieval.cache_size if cache_size is None else cache_size
+        self._emb_cache: LRUCache[List[float]] = LRUCache(cache_size)
+        # (expires_at, result); the store generation only tracks this process's writes
+        self._result_cache: LRUCache[Tuple[float, RetrievalResult]] = LRUCache(cache_size)
         
         logger.info(f"Initialized Retriever with top_k={self.default_top_k}")
     
@@ -174,7 +235,8 @@ class Retriever:
         self,
         query: str,
         top_k: Optional[int] = None,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        store_query_embedding: bool = False
     ) -> RetrievalResult:
         """
         Retrieve relevant documents for a query.
@@ -183,6 +245,7 @@ class Retriever:
             query: Query text
             top_k: Number of results to return
             filter_metadata: Optional metadata filter
+            store_query_embedding: Keep the query embedding on the result
             
         Returns:
             RetrievalResult with matching documents
@@ -191,30 +254,249 @@ class Retriever:
         
         logger.debug(f"Retrieving top {top_k} results for query: {query[:50]}...")
         
+        query_key = self._query_key(query)
+        result_key = self._result_key(query_key, top_k, filter_metadata)
+        cached = self._cached_result(query, result_key, query_key, store_query_embedding)
+        if cached is not None:
+            return cached
+        
         # Embed the query
-        query_embedding = self.embedding_provider.embed(query)
+        query_embedding = self._emb_cache.get(query_key)
+        if query_embedding is None:
+            query_embedding = self.embedding_provider.embed(query)
+            self._emb_cache.set(query_key, query_embedding)
         
         # Search vector store
         search_results = self.vector_store.search(
             query_embedding=query_embedding,
-            top_k=top_k,
-            filter_metadata=filter_metadata
+            filter_metadata=filter_metadata,
+            **self._search_kwargs(top_k)
         )
         
         logger.info(f"Retrieved {len(search_results)} results for query")
         
+        return self._store_result(result_key, RetrievalResult(
+            query=query,
+            results=self._select(search_results, query_embedding, top_k),
+            query_embedding=query_embedding
+        ), store_query_embedding)
+    
+    async def aretrieve(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        store_query_embedding: bool = False
+    ) -> RetrievalResult:
+        """
+        Retrieve relevant documents without blocking the event loop.
+        
+        The query is embedded with the provider's aembed(); the vector
+        search runs in a worker thread.
+        
+        Args:
+            query: Query text
+            top_k: Number of results to return
+            filter_metadata: Optional metadata filter
+            store_query_embedding: Keep the query embedding on the result
+            
+        Returns:
+            RetrievalResult with matching documents
+        """
+        top_k = top_k or self.default_top_k
+        
+        query_key = self._query_key(query)
+        result_key = self._result_key(query_key, top_k, filter_metadata)
+        cached = self._cached_result(query, result_key, query_key, store_query_embedding)
+        if cached is not None:
+            return cached
+        
+        query_embedding = self._emb_cache.get(query_key)
+        if query_embedding is None:
+            query_embedding = await self.embedding_provider.aembed(query)
+            self._emb_cache.set(query_key, query_embedding)
+        
+        search_results = await asyncio.to_thread(
+            self.vector_store.search,
+            query_embedding=query_embedding,
+            filter_metadata=filter_metadata,
+            **self._search_kwargs(top_k)
+        )
+        
+        logger.info(f"Retrieved {len(search_results)} results for query")
+        
+        return self._store_result(result_key, RetrievalResult(
+            query=query,
+            results=self._select(search_results, query_embedding, top_k),
+            query_embedding=query_embedding
+        ), store_query_embedding)
+    
+    def _search_kwargs(self, top_k: int) -> Dict[str, Any]:
+        """Search arguments for top_k final results (more candidates for MMR)."""
+        if self.use_mmr:
+            return {"top_k": max(top_k, self.mmr_fetch_k), "include_embeddings": True}
+        return {"top_k": top_k}
+    
+    def _select(
+        self,
+        search_results: SearchResults,
+        query_embedding: List[float],
+        top_k: int
+    ) -> List[SearchResult]:
+        """Reduce searched candidates to the final top_k results."""
+        if not self.use_mmr:
+            return search_results.results
+        return search_results.mmr(top_k, self.mmr_lambda, query_embedding).results
+    
+    @staticmethod
+    def _query_key(query: str) -> bytes:
+        """Key a query by its normalized text."""
+        return blake2b(query.strip().lower().encode(), digest_size=16).digest()
+    
+    def _result_key(
+        self,
+        query_key: bytes,
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> Optional[Hashable]:
+        """Key a retrieval result, or None if results can't be cached safely."""
+        generation = getattr(self.vector_store, "generation", None)
+        if generation is None or not self._result_cache.maxsize or self.cache_ttl_seconds <= 0:
+            return None
+        filter_key = request_key(filter_metadata) if filter_metadata else ""
+        return (query_key, top_k, filter_key, generation)
+    
+    def _cached_result(
+        self,
+        query: str,
+        result_key: Optional[Hashable],
+        query_key: bytes,
+        store_query_embedding: bool
+    ) -> Optional[RetrievalResult]:
+        """Get a cached result for this query, as a fresh RetrievalResult."""
+        if result_key is None:
+            return None
+        entry = self._result_cache.get(result_key)
+        if entry is None:
+            return None
+        expires_at, cached = entry
+        if time.monotonic() >= expires_at:
+            return None
+        
+        # Cached results don't hold embeddings; take it from the embedding cache
+        query_embedding = None
+        if store_query_embedding:
+            query_embedding = self._emb_cache.get(query_key)
+            if query_embedding is None:
+                return None
+        
+        logger.debug(f"Retrieval cache hit for query: {query[:50]}...")
         return RetrievalResult(
             query=query,
-            results=search_results.results,
+            results=list(cached.results),
             query_embedding=query_embedding
         )
     
+    def _store_result(
+        self,
+        result_key: Optional[Hashable],
+        result: RetrievalResult,
+        store_query_embedding: bool
+    ) -> RetrievalResult:
+        """Cache a retrieval result and return it, dropping its embedding unless asked to keep it."""
+        if result_key is not None:
+            self._result_cache.set(result_key, (
+                time.monotonic() + self.cache_ttl_seconds,
+                RetrievalResult(query=result.query, results=list(result.results))
+            ))
+        if not store_query_embedding:
+            result.query_embedding = None
+        return result
+    
+    def clear_cache(self) -> None:
+        """Drop cached query embeddings and retrieval results."""
+        self._emb_cache.clear()
+        self._result_cache.clear()
+    
+    def retrieve_many(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        store_query_embedding: bool = False
+    ) -> List[RetrievalResult]:
+        """
+        Retrieve documents for several queries at once.
+        
+        Uncached queries are embedded with one embed_batch() call and
+        searched with one search_batch() call when the store supports it
+        (otherwise one search per query).
+        
+        Args:
+            queries: Query texts
+            top_k: Number of results per query
+            filter_metadata: Optional metadata filter applied to every query
+            store_query_embedding: Keep each query's embedding on its result
+            
+        Returns:
+            One RetrievalResult per query, in order
+        """
+        top_k = top_k or self.default_top_k
+        
+        query_keys = [self._query_key(query) for query in queries]
+        result_keys = [self._result_key(key, top_k, filter_metadata) for key in query_keys]
+        results: List[Optional[RetrievalResult]] = [
+            self._cached_result(query, result_key, query_key, store_query_embedding)
+            for query, result_key, query_key in zip(queries, result_keys, query_keys)
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        # Embed the queries that have no cached embedding, in one call
+        embeddings = {i: self._emb_cache.get(query_keys[i]) for i in pending}
+        missing = [i for i in pending if embeddings[i] is None]
+        if missing:
+            fresh = self.embedding_provider.embed_batch([queries[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                self._emb_cache.set(query_keys[i], embedding)
+        
+        query_embeddings = [embeddings[i] for i in pending]
+        search_batch = getattr(self.vector_store, "search_batch", None)
+        search_kwargs = self._search_kwargs(top_k)
+        if search_batch is not None:
+            batched = search_batch(query_embeddings, filter_metadata=filter_metadata, **search_kwargs)
+        else:
+            batched = [
+                self.vector_store.search(
+                    query_embedding=embedding,
+                    filter_metadata=filter_metadata,
+                    **search_kwargs
+                )
+                for embedding in query_embeddings
+            ]
+        
+        for i, search_results in zip(pending, batched):
+            results[i] = self._store_result(result_keys[i], RetrievalResult(
+                query=queries[i],
+                results=self._select(search_results, embeddings[i], top_k),
+                query_embedding=embeddings[i]
+            ), store_query_embedding)
+        
+        logger.info(
+            f"Retrieved results for {len(queries)} queries "
+            f"({len(pending)} searched, {len(missing)} embedded)"
+        )
+        return results
+    
     def retrieve_with_threshold(
         self,
         query: str,
         top_k: Optional[int] = None,
         score_threshold: float = 0.5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        store_query_embedding: bool = False
     ) -> RetrievalResult:
         """
         Retrieve documents with minimum similarity threshold.
@@ -226,6 +508,7 @@ class Retriever:
             top_k: Maximum results to return
             score_threshold: Minimum similarity score (0-1)
             filter_metadata: Optional metadata filter
+            store_query_embedding: Keep the query embedding on the result
             
         Returns:
             RetrievalResult with filtered matching documents
@@ -233,14 +516,17 @@ class Retriever:
         result = self.retrieve(
             query=query,
             top_k=top_k,
-            filter_metadata=filter_metadata
+            filter_metadata=filter_metadata,
+            store_query_embedding=store_query_embedding
         )
         
-        # Filter by score threshold
-        filtered_results = [
-            r for r in result.results
-            if r.score >= score_threshold
-        ]
+        # Filter by score threshold (float64, so a score equal to the
+        # threshold isn't rounded below it)
+        scores = np.fromiter(
+            (r.score for r in result.results), dtype=np.float64, count=len(result.results)
+        )
+        keep = np.flatnonzero(scores >= score_threshold)
+        filtered_results = [result.results[i] for i in keep.tolist()]
         
         logger.debug(
             f"Filtered {len(result.results)} results to {len(filtered_results)} "
@@ -257,3 +543,156 @@ class Retriever:
     def document_count(self) -> int:
         """Get number of documents in the vector store."""
         return self.vector_store.count()
+
+
+class BatchingRetriever(Retriever):
+    """
+    Retriever that micro-batches concurrent async queries.
+    
+    Queries passed to aretrieve() within a short window (or until the batch
+    is full) are embedded with one embed_batch() call. Queries sharing
+    top_k and filter are then searched together when the store offers
+    search_batch(); otherwise each is searched on its own, concurrently.
+    Synchronous retrieve() is not batched.
+    
+    Example:
+        retriever = BatchingRetriever(embedding_provider, vector_store)
+        pipeline = RAGPipeline(retriever=retriever)
+        
+        responses = await asyncio.gather(
+            pipeline.aquery("How do I reset my password?"),
+            pipeline.aquery("What are your opening hours?"),
+        )
+    """
+    
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider,
+        vector_store: VectorStore,
+        default_top_k: Optional[int] = None,
+        max_batch: int = 32,
+        max_wait_ms: float = 50.0,
+        cache_size: Optional[int] = None,
+        use_mmr: Optional[bool] = None
+    ):
+        """
+        Initialize the batching retriever.
+        
+        Args:
+            embedding_provider: Provider for query embeddings
+            vector_store: Store for document search
+            default_top_k: Default number of results to return
+            max_batch: Maximum queries per batch
+            max_wait_ms: Maximum time to wait for a batch to fill
+            cache_size: Entries per query cache (defaults to settings; 0 disables)
+            use_mmr: Diversify results with MMR (defaults to settings)
+        """
+        super().__init__(embedding_provider, vector_store, default_top_k, cache_size, use_mmr)
+        self._batcher: MicroBatcher[_Query, RetrievalResult] = MicroBatcher(
+            self._dispatch, max_batch, max_wait_ms, name="Batching retriever"
+        )
+    
+    async def aretrieve(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        store_query_embedding: bool = False
+    ) -> RetrievalResult:
+        """
+        Queue a query for the next retrieval batch (unless its result is cached).
+        
+        Args:
+            query: Query text
+            top_k: Number of results to return
+            filter_metadata: Optional metadata filter
+            store_query_embedding: Keep the query embedding on the result
+            
+        Returns:
+            RetrievalResult with matching documents
+        """
+        top_k = top_k or self.default_top_k
+        query_key = self._query_key(query)
+        cached = self._cached_result(
+            query, self._result_key(query_key, top_k, filter_metadata), query_key, store_query_embedding
+        )
+        if cached is not None:
+            return cached
+        
+        result = await self._batcher.submit((query, top_k, filter_metadata))
+        if not store_query_embedding:
+            result.query_embedding = None
+        return result
+    
+    async def aclose(self) -> None:
+        """Stop the batching worker, failing queued queries."""
+        await self._batcher.aclose()
+    
+    async def _dispatch(self, batch: List[_PendingQuery]) -> None:
+        """Embed the batch in one call, search it, and resolve every waiter."""
+        queries = [query for query, _ in batch]
+        query_keys = [self._query_key(query) for query, _, _ in queries]
+        embeddings: List[Optional[List[float]]] = [self._emb_cache.get(key) for key in query_keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = await asyncio.to_thread(
+                self.embedding_provider.embed_batch, [queries[i][0] for i in missing]
+            )
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                self._emb_cache.set(query_keys[i], embedding)
+        
+        # One store query per distinct (top_k, filter)
+        groups: Dict[str, List[int]] = {}
+        for i, (_, top_k, filter_metadata) in enumerate(queries):
+            key = request_key({"top_k": top_k, "filter": filter_metadata})
+            groups.setdefault(key, []).append(i)
+        
+        logger.debug(
+            f"Retrieving {len(batch)} queries ({len(missing)} embedded) in "
+            f"{len(groups)} search groups"
+        )
+        
+        results = await asyncio.gather(
+            *(self._search_group([embeddings[i] for i in rows], *queries[rows[0]][1:])
+              for rows in groups.values()),
+            return_exceptions=True
+        )
+        
+        for rows, group_result in zip(groups.values(), results):
+            for position, i in enumerate(rows):
+                (query, top_k, filter_metadata), future = batch[i]
+                if future.done():
+                    continue
+                if isinstance(group_result, BaseException):
+                    future.set_exception(group_result)
+                else:
+                    result_key = self._result_key(query_keys[i], top_k, filter_metadata)
+                    future.set_result(self._store_result(result_key, RetrievalResult(
+                        query=query,
+                        results=self._select(group_result[position], embeddings[i], top_k),
+                        query_embedding=embeddings[i]
+                    ), store_query_embedding=True))
+    
+    async def _search_group(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[SearchResults]:
+        """Search a group of queries that share top_k and filter."""
+        search_batch = getattr(self.vector_store, "search_batch", None)
+        search_kwargs = self._search_kwargs(top_k)
+        if search_batch is not None:
+            return await asyncio.to_thread(
+                search_batch, query_embeddings, filter_metadata=filter_metadata, **search_kwargs
+            )
+        return list(await asyncio.gather(*(
+            asyncio.to_thread(
+                self.vector_store.search,
+                query_embedding=embedding,
+                filter_metadata=filter_metadata,
+                **search_kwargs
+            )
+            for embedding in query_embeddings
+        )))
@@ -0,0 +1,86 @@
+"""
+Quick Reply Router Module
+
+Answers conversational noise (greetings, thanks, goodbyes) and clearly
+abusive messages with canned replies, so those turns skip retrieval and
+the LLM entirely.
+
+Only whole-message matches are routed: "hi" is answered locally, while
+"hi, what data packages do you have?" still goes through the pipeline.
+The same holds for abuse, so a question that quotes an insult is answered.
+
+Usage:
+    from src.pipeline.router import SafetyGreetingRouter
+
+    router = SafetyGreetingRouter()
+    reply = router.route("thanks, bye!")  # -> canned goodbye, or None
+"""
+
+import re
+from typing import Optional
+
+from src.core.llm import ACKNOWLEDGEMENT_PHRASES, GOODBYE_PHRASES, GREETING_PHRASES, THANKS_PHRASES
+from src.messages import msg
+
+_GREETING_PATTERN = re.compile(
+    rf"^({'|'.join(GREETING_PHRASES)})( rashmi)?\W*$",
+    re.IGNORECASE,
+)
+
+# The trailing sign-offs are kept to words that can only match one way, so
+# the repeated group can't backtrack exponentially on long inputs
+_GOODBYE_PATTERN = re.compile(
+    rf"^(({'|'.join(ACKNOWLEDGEMENT_PHRASES)})\W*)?"
+    rf"({'|'.join(THANKS_PHRASES + GOODBYE_PHRASES)})"
+    r"(\W+(bye|goodbye|thanks?|thank you))*\W*$",
+    re.IGNORECASE,
+)
+
+# Insults aimed at the assistant. Plain profanity is deliberately not matched:
+# "this stupid router keeps dropping" is a frustrated customer, not abuse.
+_ABUSE_PHRASE = (
+    r"(f+u+c+k+\s*(you|u|off)|shut\s+up|"
+    r"(you|u)\s*('?re|\s+are)?\s+(an?\s+|so\s+)?(stupid|idiot|useless|dumb|moron|bitch|bastard|"
+    r"asshole|trash|garbage))"
+)
+
+# Only messages made up entirely of insults are refused; "the app says you
+# are useless until I update, how do I update?" is a support question.
+_ABUSE_PATTERN = re.compile(
+    rf"^({_ABUSE_PHRASE}( rashmi)?\W*)+$",
+    re.IGNORECASE,
+)
+
+
+class SafetyGreetingRouter:
+    """
+    Routes greeting, goodbye, and abusive turns to canned replies.
+
+    Example:
+        router = SafetyGreetingRouter()
+
+        router.route("hello")              # greeting reply
+        router.route("How do I top up?")   # None -> run the full pipeline
+    """
+
+    def route(self, question: str) -> Optional[str]:
+        """
+        Get a canned reply for a message, if it needs no retrieval or LLM.
+
+        Args:
+            question: User's message
+
+        Returns:
+            Canned reply text, or None if the message needs the full pipeline
+        """
+        text = question.strip()
+        if not text:
+            return None
+
+        if _ABUSE_PATTERN.match(text):
+            return msg("router.refusal")
+        if _GREETING_PATTERN.match(text):
+            return msg("router.greeting")
+        if _GOODBYE_PATTERN.match(text):
+            return msg("router.goodbye")
+        return None
@@ -21,6 +21,7 @@ from src.config import settings
 from src.logger import get_logger
 from src.core.embeddings import AzureEmbeddingProvider
 from src.core.vectorstore import ChromaVectorStore
+from src.pipeline.providers import get_default_embedding_provider, get_default_vector_store
 from .events import (
     EventBus,
     IntentEvent,
@@ -178,9 +179,9 @@ class RealtimeRAGEngine:
     def _ensure_providers(self) -> None:
         """Lazily initialize providers."""
         if self._embedding_provider is None:
-            self._embedding_provider = AzureEmbeddingProvider()
+            self._embedding_provider = get_default_embedding_provider()
         if self._vector_store is None:
-            self._vector_store = ChromaVectorStore()
+            self._vector_store = get_default_vector_store()
 
     async def start(self) -> None:
         """Start RAG engine."""
@@ -0,0 +1,97 @@
+"""
+Tests for Batching Module
+
+Tests request coalescing in BatchingAzureLLMProvider.
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def batching_provider():
+    """Create a batching provider over a mocked Azure provider."""
+    from unittest.mock import AsyncMock, MagicMock
+    from src.core.batching import BatchingAzureLLMProvider
+    from src.core.llm import ChatResponse
+
+    provider = MagicMock()
+    provider.temperature = 0.0
+    provider.achat = AsyncMock(side_effect=lambda m, **kw: ChatResponse(content=m[-1].content))
+    provider.aclose = AsyncMock()
+    return BatchingAzureLLMProvider(provider=provider, max_batch=8, max_wait_ms=10)
+
+
+class TestBatchingAzureLLMProvider:
+    """Tests for micro-batched chat requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_call(self, batching_provider):
+        """Test concurrent identical requests are sent once."""
+        from src.core.llm import Message
+
+        messages = [Message(role="user", content="Explain roaming")]
+        responses = await asyncio.gather(*(batching_provider.chat_async(messages) for _ in range(3)))
+
+        assert [r.content for r in responses] == ["Explain roaming"] * 3
+        assert batching_provider.provider.achat.await_count == 1
+        await batching_provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_distinct_requests_each_get_their_response(self, batching_provider):
+        """Test distinct requests in one batch are demultiplexed correctly."""
+        from src.core.llm import Message
+
+        responses = await asyncio.gather(
+            batching_provider.chat_async([Message(role="user", content="a")]),
+            batching_provider.chat_async([Message(role="user", content="b")]),
+        )
+
+        assert [r.content for r in responses] == ["a", "b"]
+        assert batching_provider.provider.achat.await_count == 2
+        await batching_provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self, batching_provider):
+        """Test a failed call is raised to all coalesced callers."""
+        from src.core.llm import Message
+
+        batching_provider.provider.achat.side_effect = RuntimeError("boom")
+        messages = [Message(role="user", content="Explain roaming")]
+
+        results = await asyncio.gather(
+            *(batching_provider.chat_async(messages) for _ in range(2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        await batching_provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_are_not_shared(self, batching_provider):
+        """Test identical requests above temperature 0 each get their own call."""
+        from src.core.llm import Message
+
+        messages = [Message(role="user", content="Write a greeting")]
+        await asyncio.gather(*(batching_provider.chat_async(messages, temperature=0.7) for _ in range(3)))
+
+        assert batching_provider.provider.achat.await_count == 3
+        await batching_provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_fails_queued_requests(self, batching_provider):
+        """Test requests still waiting for a batch are not left hanging on close."""
+        from src.core.llm import Message
+
+        batching_provider._batcher.max_wait = 60
+        pending = asyncio.ensure_future(
+            batching_provider.chat_async([Message(role="user", content="Explain roaming")])
+        )
+        await asyncio.sleep(0.01)
+
+        await batching_provider.aclose()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, 1)
+        batching_provider.provider.achat.assert_not_awaited()
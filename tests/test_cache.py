@@ -0,0 +1,168 @@
+"""
+Tests for Cache Module
+
+Tests LRUCache and the exact/semantic LLMCache tiers.
+"""
+
+import pytest
+
+
+def _body(question: str, session: str = "") -> dict:
+    """Build a minimal chat request body."""
+    return {
+        "messages": [
+            {"role": "system", "content": "You are helpful."},
+            {"role": "user", "content": f'Customer: "{question}"{session}'},
+        ],
+        "temperature": 0.0,
+    }
+
+
+class TestLRUCache:
+    """Tests for the bounded LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted first."""
+        from src.core.cache import LRUCache
+
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+
+class TestLLMCache:
+    """Tests for the LLM response cache."""
+
+    @pytest.fixture
+    def embed_fn(self):
+        """Embed questions about balance and roaming on separate axes."""
+        def embed(text):
+            if "balance" in text:
+                return [1.0, 0.05]
+            return [0.0, 1.0]
+        return embed
+
+    def test_exact_hit_and_stats(self):
+        """Test identical bodies hit and counters are updated."""
+        from src.core.cache import LLMCache
+
+        cache = LLMCache()
+        assert cache.get(_body("hi there")) is None
+        cache.set(_body("hi there"), {"content": "Hello!"})
+
+        assert cache.get(_body("hi there")) == {"content": "Hello!"}
+        assert cache.stats == {"hits": 1, "semantic_hits": 0, "misses": 1}
+
+    def test_expired_entries_miss(self):
+        """Test entries are not served after their TTL."""
+        from src.core.cache import LLMCache
+
+        cache = LLMCache(ttl_seconds=0)
+        cache.set(_body("hi there"), {"content": "Hello!"})
+
+        assert cache.get(_body("hi there")) is None
+
+    def test_semantic_hit_for_similar_question(self, embed_fn):
+        """Test a reworded question reuses the cached response."""
+        from src.core.cache import LLMCache
+
+        cache = LLMCache(embed_fn=embed_fn)
+        cache.set(_body("check my balance"), {"content": "Dial #456#"}, "check my balance")
+
+        cached = cache.get(_body("what is my balance"), "what is my balance")
+
+        assert cached == {"content": "Dial #456#"}
+        assert cache.stats["semantic_hits"] == 1
+
+    def test_semantic_miss_for_different_question(self, embed_fn):
+        """Test an unrelated question is not answered from cache."""
+        from src.core.cache import LLMCache
+
+        cache = LLMCache(embed_fn=embed_fn)
+        cache.set(_body("check my balance"), {"content": "Dial #456#"}, "check my balance")
+
+        assert cache.get(_body("roaming rates"), "roaming rates") is None
+
+    def test_semantic_miss_when_rest_of_prompt_differs(self, embed_fn):
+        """Test similar questions under a different session state do not match."""
+        from src.core.cache import LLMCache
+
+        cache = LLMCache(embed_fn=embed_fn)
+        cache.set(_body("check my balance"), {"content": "Dial #456#"}, "check my balance")
+
+        body = _body("what is my balance", session="\n\nSession: signed in")
+        assert cache.get(body, "what is my balance") is None
+
+
+class TestGenerativeCache:
+    """Tests for the slot-template cache."""
+
+    def test_refills_template_with_new_slot_values(self):
+        """Test a structurally identical question reuses the answer shape."""
+        from src.core.cache import GenerativeCache
+
+        cache = GenerativeCache()
+        cache.set(
+            _body("Activate *123# on 0771234567"),
+            "Activate *123# on 0771234567",
+            "Done! *123# is now active on 0771234567.",
+        )
+
+        response = cache.get(_body("Activate *456# on 0719876543"), "Activate *456# on 0719876543")
+
+        assert response == "Done! *456# is now active on 0719876543."
+
+    def test_skips_responses_with_foreign_values(self):
+        """Test answers quoting values not in the question are not templated."""
+        from src.core.cache import GenerativeCache
+
+        cache = GenerativeCache()
+        cache.set(_body("Price of 1 GB pack"), "Price of 1 GB pack", "The 1 GB pack costs Rs. 100.")
+
+        assert cache.get(_body("Price of 5 GB pack"), "Price of 5 GB pack") is None
+
+    def test_skips_values_found_in_context(self):
+        """Test answers looked up for a slot value are not reused for another."""
+        from src.core.cache import GenerativeCache
+
+        def body(question):
+            request = _body(question)
+            request["messages"].insert(1, {"role": "system", "content": "Plan 5: unlimited data. Plan 10: 2 GB."})
+            return request
+
+        cache = GenerativeCache()
+        cache.set(body("Does plan 5 have unlimited data"), "Does plan 5 have unlimited data", "Yes, plan 5 does.")
+
+        assert cache.get(body("Does plan 10 have unlimited data"), "Does plan 10 have unlimited data") is None
+
+    def test_does_not_refill_values_found_in_context(self):
+        """Test a template is not re-filled with a value the context has facts about."""
+        from src.core.cache import GenerativeCache
+
+        def body(question):
+            request = _body(question)
+            request["messages"].insert(1, {"role": "system", "content": "Plan 10: 2 GB."})
+            return request
+
+        cache = GenerativeCache()
+        cache.set(body("Upgrade 0771234567 to plan 7"), "Upgrade 0771234567 to plan 7", "Plan 7 set for 0771234567.")
+
+        assert cache.get(body("Upgrade 0719876543 to plan 10"), "Upgrade 0719876543 to plan 10") is None
+        assert cache.get(body("Upgrade 0719876543 to plan 8"), "Upgrade 0719876543 to plan 8") == (
+            "Plan 8 set for 0719876543."
+        )
+
+    def test_questions_without_slots_miss(self):
+        """Test questions with no slot values are left to other tiers."""
+        from src.core.cache import GenerativeCache
+
+        cache = GenerativeCache()
+        cache.set(_body("What is roaming"), "What is roaming", "Roaming lets you...")
+
+        assert cache.get(_body("What is roaming"), "What is roaming") is None
@@ -39,6 +39,20 @@ class TestChunk:
         assert chunk1.id == chunk2.id
         # Different content should generate different ID
         assert chunk1.id != chunk3.id
+    
+    def test_chunk_id_is_memoized(self):
+        """Test the ID is hashed once and ignored by equality."""
+        import hashlib
+        from src.pipeline.chunker import Chunk
+        
+        chunk = Chunk(text="Hello", index=0, metadata={"source": "a.txt"})
+        
+        with patch("src.pipeline.chunker.blake2b", wraps=hashlib.blake2b) as blake2b:
+            first = chunk.id
+            assert chunk.id == first
+        
+        blake2b.assert_called_once()
+        assert chunk == Chunk(text="Hello", index=0, metadata={"source": "a.txt"})
 
 
 class TestTextChunker:
@@ -134,3 +148,182 @@ class TestChunkTextSimple:
         assert isinstance(chunks, list)
         assert all(isinstance(c, str) for c in chunks)
         assert len(chunks) > 1
+
+
+class _CharEncoder:
+    """Offline stand-in for a tiktoken encoding: one token per character."""
+    
+    def encode(self, text):
+        if "<|endoftext|>" in text:
+            raise ValueError("disallowed special token")
+        return [ord(c) for c in text]
+    
+    def encode_batch(self, texts, num_threads=1):
+        return [self.encode(t) for t in texts]
+    
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+    
+    def decode_batch(self, batch, num_threads=1):
+        return [self.decode(tokens) for tokens in batch]
+    
+    def decode_tokens_bytes(self, tokens):
+        return [chr(t).encode("utf-8") for t in tokens]
+
+
+class TestSentenceBoundaries:
+    """Tests for byte-exact sentence boundary detection."""
+    
+    @pytest.fixture
+    def chunker(self):
+        """Create a sentence-aware chunker with an offline character tokenizer."""
+        with patch("src.pipeline.chunker.get_encoding", return_value=_CharEncoder()):
+            from src.pipeline.chunker import TextChunker
+            yield TextChunker(chunk_size=20, overlap=2, respect_sentences=True)
+    
+    def test_boundaries_are_exact_token_positions(self, chunker):
+        """Test boundaries fall right after sentence punctuation and whitespace."""
+        text = "Hé there. Ok!\n\nNext."
+        tokens = chunker.encoder.encode(text)
+        
+        boundaries = chunker._sentence_boundaries(tokens)
+        
+        assert [text[:b] for b in boundaries] == ["Hé there. ", "Hé there. Ok!\n\n"]
+    
+    def test_chunks_end_at_sentence_boundaries(self, chunker):
+        """Test chunks break after whole sentences when one is in range."""
+        text = "One two three. Four five six. Seven eight nine."
+        
+        chunks = chunker.chunk_text(text)
+        
+        assert chunks[0].text == "One two three. "
+        assert all(c.end_token > c.start_token for c in chunks)
+        assert chunks[-1].end_token == len(text)
+
+
+class TestTokenCache:
+    """Tests for reusing document tokens across chunking calls."""
+    
+    def test_unchanged_documents_are_not_re_encoded(self):
+        """Test a cached document skips tokenization on the next call."""
+        encoder = _CharEncoder()
+        with patch("src.pipeline.chunker.get_encoding", return_value=encoder), \
+                patch.object(encoder, "encode", wraps=encoder.encode) as encode:
+            from src.pipeline.chunker import TextChunker
+            chunker = TextChunker(chunk_size=20, overlap=5, token_cache_size=8)
+            first = chunker.chunk_batch(["cached text", "other"])
+            second = chunker.chunk_batch(["cached text", "new text"])
+        
+        assert [call.args[0] for call in encode.call_args_list] == ["cached text", "other", "new text"]
+        assert second[0] == first[0]
+    
+    def test_precomputed_tokens_skip_encoding(self):
+        """Test chunk_text uses tokens supplied by the caller."""
+        encoder = _CharEncoder()
+        with patch("src.pipeline.chunker.get_encoding", return_value=encoder), \
+                patch.object(encoder, "encode", side_effect=AssertionError("re-encoded")):
+            from src.pipeline.chunker import TextChunker
+            chunker = TextChunker(chunk_size=20, overlap=5)
+            chunks = chunker.chunk_text("hello", precomputed_tokens=[ord(c) for c in "hello"])
+        
+        assert [c.text for c in chunks] == ["hello"]
+
+
+class TestDecoding:
+    """Tests for turning chunk token ranges back into text."""
+    
+    def test_chunks_are_decoded_without_a_thread_pool(self):
+        """Test chunk texts come from plain decode(), not a pooled decode_batch()."""
+        encoder = _CharEncoder()
+        with patch("src.pipeline.chunker.get_encoding", return_value=encoder), \
+                patch.object(encoder, "decode_batch", side_effect=AssertionError("pooled decode")):
+            from src.pipeline.chunker import TextChunker
+            chunker = TextChunker(chunk_size=20, overlap=5)
+            chunks = chunker.chunk_text("x" * 50)
+        
+        assert [c.text for c in chunks] == ["x" * (c.end_token - c.start_token) for c in chunks]
+        assert len(chunks) > 1
+
+
+class TestEncoderCache:
+    """Tests for sharing tokenizers between chunkers."""
+    
+    def test_chunkers_share_one_encoder(self):
+        """Test the BPE encoding is loaded lazily, and once for many chunkers."""
+        from src.core import tokens
+        from src.pipeline.chunker import TextChunker
+        
+        tokens.get_encoding.cache_clear()
+        try:
+            with patch("src.core.tokens.tiktoken") as mock_tiktoken:
+                mock_tiktoken.get_encoding.return_value = _CharEncoder()
+                first = TextChunker(model="gpt-4")
+                second = TextChunker(model="gpt-4")
+                mock_tiktoken.get_encoding.assert_not_called()
+                
+                assert first.encoder is second.encoder
+            
+            mock_tiktoken.get_encoding.assert_called_once_with("cl100k_base")
+        finally:
+            tokens.get_encoding.cache_clear()
+
+
+class TestChunkBatch:
+    """Tests for batched chunking."""
+    
+    @pytest.fixture
+    def chunker(self):
+        """Create a chunker with an offline character tokenizer."""
+        with patch("src.pipeline.chunker.get_encoding", return_value=_CharEncoder()):
+            from src.pipeline.chunker import TextChunker
+            yield TextChunker(chunk_size=20, overlap=5, respect_sentences=False)
+    
+    def test_matches_per_text_chunking(self, chunker):
+        """Test batched output equals chunking each text on its own."""
+        texts = ["short text", "a much longer text that needs several chunks", "  "]
+        metadatas = [{"source": "a"}, {"source": "b"}, {"source": "c"}]
+        
+        batched = chunker.chunk_batch(texts, metadatas)
+        
+        assert batched == [chunker.chunk_text(t, m) for t, m in zip(texts, metadatas)]
+        assert len(batched[1]) > 1
+        assert batched[2] == []
+    
+    def test_no_chunk_lies_entirely_in_the_overlap(self, chunker):
+        """Test chunking stops at the chunk that reaches the end of the text."""
+        chunks = chunker.chunk_text("x" * 25)
+        
+        assert [(c.start_token, c.end_token) for c in chunks] == [(0, 20), (15, 25)]
+    
+    def test_fixed_windows_cover_text_with_overlap(self, chunker):
+        """Test the vectorized layout steps by chunk_size - overlap."""
+        assert chunker._fixed_windows(41) == [(0, 20), (15, 35), (30, 41)]
+        assert chunker._fixed_windows(5) == [(0, 5)]
+    
+    def test_return_exceptions_isolates_failures(self, chunker):
+        """Test one failing text does not lose the others."""
+        outcomes = chunker.chunk_batch(["fine", "bad <|endoftext|>"], return_exceptions=True)
+        
+        assert [c.text for c in outcomes[0]] == ["fine"]
+        assert isinstance(outcomes[1], ValueError)
+    
+    def test_threaded_splitting_keeps_order(self):
+        """Test splitting on a thread pool matches serial splitting."""
+        with patch("src.pipeline.chunker.get_encoding", return_value=_CharEncoder()):
+            from src.pipeline.chunker import TextChunker
+            serial = TextChunker(chunk_size=20, overlap=5, max_workers=1)
+            threaded = TextChunker(chunk_size=20, overlap=5, max_workers=4)
+            texts = [f"Document {i}. " * (i + 1) for i in range(12)]
+            
+            assert threaded.chunk_batch(texts) == serial.chunk_batch(texts)
+    
+    def test_chunk_documents_tokenizes_in_one_batch(self, chunker):
+        """Test chunk_documents encodes all documents with a single batch call."""
+        documents = [{"text": "first doc", "source": "a"}, {"text": ""}, {"text": "second doc", "source": "b"}]
+        
+        with patch.object(chunker.encoder, "encode_batch", wraps=chunker.encoder.encode_batch) as encode_batch:
+            chunks = chunker.chunk_documents(documents)
+        
+        encode_batch.assert_called_once()
+        assert [c.text for c in chunks] == ["first doc", "second doc"]
+        assert [c.metadata["document_index"] for c in chunks] == [0, 2]
@@ -0,0 +1,49 @@
+"""
+Tests for Context Compression Module
+
+Tests sentence scoring and extractive compression with quench().
+"""
+
+
+class TestQuench:
+    """Tests for entropy-gated sentence dropping."""
+
+    TEXT = (
+        "To reset your password, open the app. Go to Settings then Security.\n"
+        "- Tap Reset Password\n"
+        "- Enter the code sent to 077 123 4567\n"
+        "Thanks for reading this. We hope this helps you. Contact us anytime."
+    )
+
+    def test_keeps_details_and_drops_filler(self):
+        """Test sentences with concrete details survive and filler goes first."""
+        from src.pipeline.compression import quench
+
+        compressed = quench(self.TEXT, theta=0.5)
+
+        assert "077 123 4567" in compressed
+        assert "Contact us anytime." not in compressed
+        assert len(compressed) < len(self.TEXT)
+
+    def test_preserves_order_and_line_breaks(self):
+        """Test kept sentences stay in order and list items stay on their own lines."""
+        from src.pipeline.compression import quench
+
+        lines = quench(self.TEXT, theta=0.5).split("\n")
+
+        assert lines[1:3] == ["- Tap Reset Password", "- Enter the code sent to 077 123 4567"]
+
+    def test_short_texts_are_unchanged(self):
+        """Test texts too short to compress are returned as-is."""
+        from src.pipeline.compression import quench
+
+        text = "Roaming is free. It works in 40 countries."
+
+        assert quench(text, theta=0.1) == text
+        assert quench(self.TEXT, theta=1.0) == self.TEXT
+
+    def test_is_deterministic(self):
+        """Test compressing the same text twice gives identical output."""
+        from src.pipeline.compression import quench
+
+        assert quench(self.TEXT, theta=0.6) == quench(self.TEXT, theta=0.6)
@@ -0,0 +1,29 @@
+"""
+Tests for Embeddings Module
+
+Tests vector normalization in AzureEmbeddingProvider.
+"""
+
+import numpy as np
+
+
+class TestNormalizeVectors:
+    """Tests for batched L2 normalization."""
+
+    def test_rows_have_unit_length(self):
+        """Test each vector is scaled to unit L2 norm."""
+        from src.core.embeddings import AzureEmbeddingProvider
+
+        normalized = AzureEmbeddingProvider._normalize_vectors([[3.0, 4.0], [1.0, 0.0]])
+
+        assert normalized == [[0.6, 0.8], [1.0, 0.0]]
+        assert all(isinstance(x, float) for x in normalized[0])
+
+    def test_zero_vector_is_unchanged(self):
+        """Test a zero vector is returned as-is instead of dividing by zero."""
+        from src.core.embeddings import AzureEmbeddingProvider
+
+        normalized = AzureEmbeddingProvider._normalize_vectors([[0.0, 0.0], [0.0, 2.0]])
+
+        assert normalized == [[0.0, 0.0], [0.0, 1.0]]
+        assert np.isfinite(normalized).all()
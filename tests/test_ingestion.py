@@ -0,0 +1,178 @@
+"""
+Tests for Document Ingestion Module
+
+Tests DocumentIngester batching with mocked embedding and store backends.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def ingester():
+    """Create an ingester with one chunk per document and mocked backends."""
+    from src.ingestion import DocumentIngester
+    from src.pipeline.chunker import Chunk
+
+    chunker = MagicMock()
+    chunker.chunk_batch.side_effect = lambda texts, metadatas, return_exceptions: [
+        [Chunk(text=text, metadata=metadata)] for text, metadata in zip(texts, metadatas)
+    ]
+    embedder = MagicMock()
+    embedder.embed_batch.side_effect = lambda texts: [[float(len(t))] for t in texts]
+
+    vector_store = MagicMock()
+    vector_store.exists_many.return_value = set()
+
+    return DocumentIngester(
+        embedding_provider=embedder,
+        vector_store=vector_store,
+        chunker=chunker
+    )
+
+
+class TestIngestDocuments:
+    """Tests for pipelined embedding and storage."""
+
+    def test_batches_are_stored_in_order(self, ingester):
+        """Test prefetched batches reach the store in input order."""
+        from src.ingestion import Document
+
+        documents = [Document(text="x" * i, metadata={"index": i}) for i in range(1, 8)]
+
+        result = ingester.ingest_documents(documents, batch_size=2, prefetch=3)
+
+        stored = [c.kwargs["texts"] for c in ingester.vector_store.add_documents.call_args_list]
+        assert stored == [["x", "xx"], ["xxx", "xxxx"], ["xxxxx", "xxxxxx"], ["xxxxxxx"]]
+        assert result.chunks_ingested == 7
+        assert result.success
+
+    def test_failed_batch_is_reported(self, ingester):
+        """Test an embedding failure is recorded without losing other batches."""
+        from src.ingestion import Document
+
+        def embed_batch(texts):
+            if "boom" in texts:
+                raise RuntimeError("embedding failed")
+            return [[1.0] for _ in texts]
+
+        ingester.embedding_provider.embed_batch.side_effect = embed_batch
+        documents = [Document(text=t, metadata={"index": i}) for i, t in enumerate(["a", "boom", "c"])]
+
+        result = ingester.ingest_documents(documents, batch_size=1)
+
+        assert result.chunks_ingested == 2
+        assert result.errors == ["Batch ingestion error: embedding failed"]
+
+
+    def test_ingest_iter_streams_documents(self, ingester):
+        """Test chunking runs only a bounded distance ahead of the store."""
+        from src.ingestion import Document
+
+        pulled = []
+        pulled_at_first_store = []
+
+        def documents():
+            for i in range(50):
+                pulled.append(i)
+                yield Document(text=f"doc {i}", metadata={"index": i})
+
+        def add_documents(**kwargs):
+            if not pulled_at_first_store:
+                pulled_at_first_store.append(len(pulled))
+
+        ingester.vector_store.add_documents.side_effect = add_documents
+
+        result = ingester.ingest_iter(documents(), batch_size=1, prefetch=1)
+
+        assert pulled_at_first_store[0] < 10
+        assert result.documents_processed == 50
+        assert result.chunks_ingested == 50
+
+    def test_document_iterator_errors_propagate(self, ingester):
+        """Test a failing document source is not silently truncated."""
+        from src.ingestion import Document
+
+        def documents():
+            yield Document(text="ok", metadata={"index": 0})
+            raise OSError("disk read failed")
+
+        with pytest.raises(OSError):
+            ingester.ingest_iter(documents())
+
+    def test_unchanged_chunks_are_not_re_embedded(self, ingester):
+        """Test chunks already stored with the same text skip embedding."""
+        from src.ingestion import Document
+        from src.pipeline.chunker import Chunk
+
+        stored = Chunk(text="old", metadata={"index": 0})
+        ingester.vector_store.exists_many.side_effect = lambda ids, texts, metadatas: {stored.id}
+        documents = [Document(text="old", metadata={"index": 0}), Document(text="new", metadata={"index": 1})]
+
+        result = ingester.ingest_documents(documents)
+
+        ingester.embedding_provider.embed_batch.assert_called_once_with(["new"])
+        assert result.chunks_ingested == 1
+        assert result.chunks_skipped == 1
+
+    def test_metadata_is_compared_when_skipping(self, ingester):
+        """Test the skip check is given each chunk's metadata, not just its text."""
+        from src.ingestion import Document
+
+        ingester.ingest_documents([Document(text="old", metadata={"index": 0, "category": "billing"})])
+
+        ids, texts, metadatas = ingester.vector_store.exists_many.call_args.args
+        assert texts == ["old"]
+        assert metadatas[0]["category"] == "billing"
+
+
+class TestDocumentLoader:
+    """Tests for lazy document loading."""
+
+    def test_iter_file_yields_jsonl_documents(self, tmp_path):
+        """Test JSON Lines rows are yielded one by one, skipping bad lines."""
+        from src.ingestion import DocumentLoader
+
+        path = tmp_path / "faq.jsonl"
+        path.write_text(
+            '{"question": "Q1", "answer": "A1"}\nnot json\n\n{"text": "Plain"}\n',
+            encoding="utf-8"
+        )
+
+        documents = DocumentLoader().iter_file(path)
+
+        assert next(documents).text == "Question: Q1\n\nAnswer: A1"
+        assert [d.text for d in documents] == ["Plain"]
+
+    def test_iter_file_validates_path_eagerly(self, tmp_path):
+        """Test a missing file fails before iteration starts."""
+        from src.ingestion import DocumentLoader
+
+        with pytest.raises(FileNotFoundError):
+            DocumentLoader().iter_file(tmp_path / "missing.jsonl")
+
+
+class TestIngestDirectory:
+    """Tests for concurrent directory ingestion."""
+
+    def test_combines_results_from_every_file(self, ingester, tmp_path):
+        """Test each file is ingested and the results are merged."""
+        for name in ("a.txt", "b.md", "c.txt"):
+            (tmp_path / name).write_text(f"Contents of {name}", encoding="utf-8")
+        (tmp_path / "skip.csv").write_text("ignored", encoding="utf-8")
+
+        result = ingester.ingest_directory(tmp_path, max_workers=2)
+
+        assert result.documents_processed == 3
+        assert result.chunks_ingested == 3
+        assert result.success
+
+    def test_finds_files_in_subdirectories(self, ingester, tmp_path):
+        """Test recursive ingestion walks nested folders, case-insensitively."""
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "top.txt").write_text("top", encoding="utf-8")
+        (tmp_path / "nested" / "deep.MD").write_text("deep", encoding="utf-8")
+
+        assert ingester.ingest_directory(tmp_path).documents_processed == 2
+        assert ingester.ingest_directory(tmp_path, recursive=False).documents_processed == 1
@@ -0,0 +1,506 @@
+"""
+Tests for LLM Module
+
+Tests AzureLLMProvider request building and the RAG message helpers.
+"""
+
+import orjson
+import pytest
+
+
+class TestShortTurnDetection:
+    """Tests for greeting/goodbye detection."""
+
+    def test_greetings_and_goodbyes(self):
+        """Test conversational noise is detected as a short turn."""
+        from src.core.llm import Message, is_short_turn
+
+        for text in ["hi", "Hello!", "thanks", "Thank you.", "bye", "that's all"]:
+            assert is_short_turn([Message(role="user", content=text)])
+
+    def test_questions_are_not_short_turns(self):
+        """Test real questions keep the full response budget."""
+        from src.core.llm import Message, is_short_turn
+
+        assert not is_short_turn([Message(role="user", content="What data packages?")])
+        assert not is_short_turn([Message(role="user", content="hi, check my balance")])
+
+    def test_reads_customer_quote_from_rag_message(self):
+        """Test the customer's words are extracted from a templated message."""
+        from src.core.llm import build_rag_messages, is_short_turn
+
+        messages = build_rag_messages(question="bye", context="Some long context text.")
+        assert is_short_turn(messages)
+
+
+class TestAzureLLMProviderBody:
+    """Tests for request body construction."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider with test settings."""
+        from src.core.llm import AzureLLMProvider
+        return AzureLLMProvider(api_key="test", endpoint="https://test", max_tokens=300)
+
+    def test_short_turn_caps_max_tokens(self, provider):
+        """Test greetings get a small budget and stop sequences."""
+        from src.core.llm import Message, SHORT_TURN_STOP_SEQUENCES
+
+        body = provider._build_body([Message(role="user", content="hi")])
+
+        assert body["max_tokens"] == 64
+        assert body["stop"] == SHORT_TURN_STOP_SEQUENCES
+
+    def test_explicit_max_tokens_is_respected(self, provider):
+        """Test caller overrides are not capped."""
+        from src.core.llm import Message
+
+        body = provider._build_body([Message(role="user", content="hi")], max_tokens=200)
+
+        assert body["max_tokens"] == 200
+        assert "stop" not in body
+
+    def test_stream_requests_usage(self):
+        """Test streaming bodies ask for usage reporting on api-versions that support it."""
+        from src.core.llm import AzureLLMProvider, Message
+
+        provider = AzureLLMProvider(
+            api_key="test", endpoint="https://test", max_tokens=300, api_version="2024-10-21"
+        )
+
+        body = provider._build_body([Message(role="user", content="Explain roaming")], stream=True)
+
+        assert body["stream"] is True
+        assert body["stream_options"] == {"include_usage": True}
+        assert body["max_tokens"] == 300
+
+    def test_older_api_version_omits_stream_options(self):
+        """Test api-versions before 2024-09-01-preview don't get stream_options."""
+        from src.core.llm import AzureLLMProvider, Message
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test", api_version="2024-08-01-preview")
+
+        body = provider._build_body([Message(role="user", content="Explain roaming")], stream=True)
+
+        assert body["stream"] is True
+        assert "stream_options" not in body
+
+
+class TestChatSpeculative:
+    """Tests for speculative chat completions."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider whose chat() echoes the last message."""
+        from unittest.mock import MagicMock
+        from src.core.llm import AzureLLMProvider, ChatResponse
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        provider.chat = MagicMock(side_effect=lambda m, **kw: ChatResponse(content=m[-1].content))
+        return provider
+
+    def test_uses_speculative_result_when_messages_match(self, provider):
+        """Test a matching final prompt reuses the speculative call."""
+        from src.core.llm import Message
+
+        partial = [Message(role="user", content="same")]
+        response = provider.chat_speculative(lambda: [Message(role="user", content="same")], partial)
+
+        assert response.content == "same"
+        assert provider.chat.call_count == 1
+
+    def test_reissues_when_messages_change(self, provider):
+        """Test a changed final prompt is sent again."""
+        from src.core.llm import Message
+
+        partial = [Message(role="user", content="early")]
+        response = provider.chat_speculative(lambda: [Message(role="user", content="final")], partial)
+
+        assert response.content == "final"
+        assert provider.chat.call_count == 2
+
+
+class TestContextFitting:
+    """Tests for token counting and context truncation."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider with a small context window."""
+        from src.core.llm import AzureLLMProvider
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test", max_tokens=50)
+        provider.context_window = 1500
+        return provider
+
+    def test_context_that_fits_is_unchanged(self, provider):
+        """Test short prompts keep their full context."""
+        from src.core.llm import build_rag_messages
+
+        context = "Roaming costs Rs. 100 per day."
+        messages = build_rag_messages(question="Roaming price?", context=context)
+
+        assert provider.fit_context(context, messages) == context
+
+    def test_oversized_context_is_truncated(self, provider):
+        """Test the prompt plus response budget is brought within the window."""
+        from src.core.llm import build_rag_messages
+
+        context = "Roaming costs Rs. 100 per day. " * 500
+        messages = build_rag_messages(question="Roaming price?", context=context)
+
+        fitted = provider.fit_context(context, messages)
+        refitted = build_rag_messages(question="Roaming price?", context=fitted)
+
+        assert len(fitted) < len(context)
+        assert provider.count_tokens(refitted) + 50 <= 1500
+
+    def test_max_tokens_capped_to_remaining_window(self, provider):
+        """Test the completion budget never exceeds what the window has left."""
+        from src.core.llm import Message
+
+        messages = [Message(role="user", content="Roaming costs Rs. 100 per day. " * 180)]
+        body = provider._build_body(messages, max_tokens=500)
+
+        assert provider.count_tokens(messages) + body["max_tokens"] <= 1500
+        assert body["max_tokens"] > 0
+
+    def test_repeated_contents_are_not_re_encoded(self, provider):
+        """Test the system prompt and history reuse cached token counts."""
+        from unittest.mock import patch
+        from src.core.llm import _message_token_counts, build_rag_messages, count_tokens_batch
+
+        history = build_rag_messages(question="Earlier question?", context="Earlier context.")[-1:]
+        first = build_rag_messages(question="q1", context="c1", conversation_history=history)
+        second = build_rag_messages(question="q2", context="c2", conversation_history=history)
+        provider.count_tokens(first)
+
+        with patch("src.core.llm.count_tokens_batch", side_effect=count_tokens_batch) as batch:
+            total = provider.count_tokens(second)
+
+        assert batch.call_args.args[0] == [second[-2].content, second[-1].content]
+        _message_token_counts.clear()
+        assert provider.count_tokens(second) == total
+
+
+class TestChatFanOut:
+    """Tests for multi-candidate and batched completions."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider with a mocked HTTP session."""
+        from unittest.mock import MagicMock
+        from src.core.llm import AzureLLMProvider
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        provider._session = MagicMock()
+        return provider
+
+    def test_chat_candidates_returns_every_choice(self, provider):
+        """Test n candidates are requested and parsed from one call."""
+        from src.core.llm import Message
+
+        provider._session.post.return_value.status_code = 200
+        provider._session.post.return_value.content = orjson.dumps({
+            "model": "gpt-4o-mini",
+            "choices": [
+                {"message": {"content": "first"}, "finish_reason": "stop"},
+                {"message": {"content": "second"}, "finish_reason": "stop"},
+            ],
+        })
+
+        responses = provider.chat_candidates([Message(role="user", content="Explain roaming")], n=2)
+
+        assert [r.content for r in responses] == ["first", "second"]
+        body = orjson.loads(provider._session.post.call_args.kwargs["data"])
+        assert body["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_chat_batch_preserves_order(self, provider):
+        """Test batched completions come back in input order."""
+        from src.core.llm import ChatResponse, Message
+
+        async def echo(messages, **kwargs):
+            return ChatResponse(content=messages[-1].content)
+
+        provider.achat = echo
+        batch = [[Message(role="user", content=str(i))] for i in range(5)]
+
+        responses = await provider.chat_batch(batch, max_concurrency=2)
+
+        assert [r.content for r in responses] == ["0", "1", "2", "3", "4"]
+
+    def test_chat_many_preserves_order(self, provider):
+        """Test thread-pooled completions come back in input order."""
+        from src.core.llm import ChatResponse, Message
+
+        provider.chat = lambda messages, **kwargs: ChatResponse(content=messages[-1].content)
+        batch = [[Message(role="user", content=str(i))] for i in range(5)]
+
+        responses = provider.chat_many(batch, max_workers=2)
+
+        assert [r.content for r in responses] == ["0", "1", "2", "3", "4"]
+
+
+class TestExactCache:
+    """Tests for the exact-match response cache."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider with a mocked HTTP session."""
+        from unittest.mock import MagicMock
+        from src.core.llm import AzureLLMProvider
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        provider._session = MagicMock()
+        provider._session.post.return_value.status_code = 200
+        provider._session.post.return_value.content = orjson.dumps({
+            "choices": [{"message": {"content": "cached"}, "finish_reason": "stop"}],
+        })
+        return provider
+
+    def test_identical_deterministic_requests_hit_cache(self, provider):
+        """Test a repeated temperature-0 request is not sent twice."""
+        from src.core.llm import Message
+
+        messages = [Message(role="user", content="Explain roaming")]
+        first = provider.chat(messages, temperature=0.0)
+        second = provider.chat(messages, temperature=0.0)
+
+        assert first.content == second.content == "cached"
+        assert provider._session.post.call_count == 1
+
+    def test_sampled_requests_bypass_cache(self, provider):
+        """Test non-zero temperature requests are always sent."""
+        from src.core.llm import Message
+
+        messages = [Message(role="user", content="Explain roaming")]
+        provider.chat(messages, temperature=0.7)
+        provider.chat(messages, temperature=0.7)
+
+        assert provider._session.post.call_count == 2
+
+
+class TestStreamChat:
+    """Tests for SSE stream parsing."""
+
+    def test_yields_content_deltas(self):
+        """Test content is yielded from data lines until [DONE]."""
+        from unittest.mock import MagicMock
+        from src.core.llm import AzureLLMProvider, Message
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        provider._session = MagicMock()
+        provider._session.post.return_value.iter_lines.return_value = [
+            b'data: {"choices":[{"delta":{"role":"assistant"}}]}',
+            b"",
+            b'data: {"choices":[{"delta":{"content":"Hel"}}]}',
+            b'data: {"choices":[{"delta":{"content":"lo"}}]}',
+            b'data: {"choices":[],"usage":{"total_tokens":5}}',
+            b"data: [DONE]",
+            b'data: {"choices":[{"delta":{"content":"ignored"}}]}',
+        ]
+
+        tokens = list(provider.stream_chat([Message(role="user", content="Explain roaming")]))
+
+        assert tokens == ["Hel", "lo"]
+
+
+class _FakeAioResponse:
+    """Minimal aiohttp response for tests."""
+
+    def __init__(self, status=200, body=b"", lines=(), headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+        self.content = self._iter_lines(lines)
+
+    async def _iter_lines(self, lines):
+        for line in lines:
+            yield line
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestAsyncChat:
+    """Tests for the native async chat path."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider whose async session is replaced per test."""
+        from unittest.mock import MagicMock
+        from src.core.llm import AzureLLMProvider
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        provider._get_aio_session = MagicMock()
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_retry_backoff_does_not_block_loop(self, provider):
+        """Test rate-limit backoff awaits instead of sleeping the thread."""
+        from unittest.mock import patch
+        from src.core.llm import Message
+
+        provider._get_aio_session.return_value.post.side_effect = [
+            _FakeAioResponse(status=429, headers={"Retry-After": "0"}),
+            _FakeAioResponse(body=orjson.dumps({"choices": [{"message": {"content": "done"}}]})),
+        ]
+
+        with patch("src.core.llm.time.sleep") as blocking_sleep:
+            response = await provider.achat([Message(role="user", content="Explain roaming")])
+
+        assert response.content == "done"
+        blocking_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_astream_chat_yields_content_deltas(self, provider):
+        """Test async streaming parses SSE lines until [DONE]."""
+        from src.core.llm import Message
+
+        provider._get_aio_session.return_value.post.return_value = _FakeAioResponse(lines=[
+            b'data: {"choices":[{"delta":{"content":"Hel"}}]}\n',
+            b"\n",
+            b'data: {"choices":[{"delta":{"content":"lo"}}]}\n',
+            b"data: [DONE]\n",
+        ])
+
+        tokens = [t async for t in provider.astream_chat([Message(role="user", content="Explain roaming")])]
+
+        assert tokens == ["Hel", "lo"]
+
+
+class TestAioSession:
+    """Tests for the per-loop async session."""
+
+    def test_session_from_a_finished_loop_is_closed(self):
+        """Test replacing the session after a loop change closes the old one."""
+        import asyncio
+        from src.core.llm import AzureLLMProvider
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+
+        async def open_session():
+            return provider._get_aio_session()
+
+        async def reopen_session():
+            session = provider._get_aio_session()
+            await asyncio.sleep(0)
+            await provider.aclose()
+            return session
+
+        first = asyncio.run(open_session())
+        second = asyncio.run(reopen_session())
+
+        assert second is not first
+        assert first.closed and second.closed
+
+
+class TestBuildRagMessages:
+    """Tests for RAG message layout."""
+
+    def test_static_prefix_precedes_per_turn_content(self):
+        """Test system prompt and history come before context and question."""
+        from src.core.llm import Message, RAG_SYSTEM_PROMPT, build_rag_messages
+
+        history = [
+            Message(role="user", content="hi"),
+            Message(role="assistant", content="Hello!"),
+        ]
+        messages = build_rag_messages(
+            question="Roaming price?",
+            context="Roaming costs Rs. 100 per day.",
+            conversation_history=history,
+            session_status="signed in",
+        )
+
+        assert [m.role for m in messages] == ["system", "user", "assistant", "system", "user"]
+        assert messages[0].content == RAG_SYSTEM_PROMPT
+        assert "Roaming costs" in messages[3].content
+        assert "Roaming costs" not in messages[4].content
+        assert messages[4].content.endswith("Session: signed in")
+
+    def test_messages_are_immutable(self):
+        """Test messages can be shared safely between requests and caches."""
+        import dataclasses
+        from src.core.llm import Message
+
+        message = Message(role="user", content="hi")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            message.content = "changed"
+        assert orjson.loads(orjson.dumps(message)) == message.to_dict()
+
+
+class TestStreamChatViaBatch:
+    """Tests for re-emitting a whole completion as a stream."""
+
+    def test_chunks_reassemble_the_response(self):
+        """Test one non-streaming call is re-emitted word by word."""
+        from unittest.mock import MagicMock
+        from src.core.llm import AzureLLMProvider, ChatResponse, Message
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        provider.chat = MagicMock(return_value=ChatResponse(content="Roaming is  active.\nEnjoy!"))
+
+        chunks = list(provider.stream_chat_via_batch([Message(role="user", content="Roaming?")]))
+
+        assert chunks == ["Roaming ", "is  ", "active.\n", "Enjoy!"]
+        assert provider.chat.call_count == 1
+
+
+class TestRetryPolicy:
+    """Tests for retry decisions."""
+
+    def test_client_errors_are_not_retried(self):
+        """Test a 400 fails immediately without backoff."""
+        from unittest.mock import MagicMock, patch
+        import requests
+        from src.core.llm import AzureLLMProvider, Message
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test")
+        bad_request = MagicMock(status_code=400)
+        bad_request.raise_for_status.side_effect = requests.HTTPError("400", response=bad_request)
+        provider._session = MagicMock()
+        provider._session.post.return_value = bad_request
+
+        with patch("src.core.llm.time.sleep") as sleep, pytest.raises(requests.HTTPError):
+            provider.chat([Message(role="user", content="Explain roaming")])
+
+        assert provider._session.post.call_count == 1
+        sleep.assert_not_called()
+
+    def test_retry_after_is_clamped_and_jittered(self):
+        """Test server-requested waits are bounded and never shortened."""
+        from src.core.llm import MAX_RETRY_AFTER, _retry_after
+
+        assert _retry_after("600", 0) <= MAX_RETRY_AFTER * 1.2
+        assert all(1.0 <= _retry_after("1", 0) <= 1.2 for _ in range(50))
+        assert 1.6 <= _retry_after("not-a-number", 1) <= 2.4
+
+    def test_last_rate_limited_attempt_raises_without_waiting(self):
+        """Test a 429 on the final attempt raises an HTTPError keeping the status."""
+        from unittest.mock import MagicMock, patch
+        import requests
+        from src.core.llm import AzureLLMProvider, Message
+
+        provider = AzureLLMProvider(api_key="test", endpoint="https://test", max_retries=2)
+        limited = MagicMock(status_code=429, headers={"Retry-After": "1"})
+        limited.raise_for_status.side_effect = requests.HTTPError("429", response=limited)
+        provider._session = MagicMock()
+        provider._session.post.return_value = limited
+
+        with patch("src.core.llm.time.sleep") as sleep, pytest.raises(requests.HTTPError) as error:
+            provider.chat([Message(role="user", content="Explain roaming")])
+
+        assert error.value.response.status_code == 429
+        assert provider._session.post.call_count == 2
+        sleep.assert_called_once()
@@ -0,0 +1,68 @@
+"""
+Tests for Micro-Batching Module
+
+Tests batch collection, error propagation and shutdown of MicroBatcher.
+"""
+
+import asyncio
+
+import pytest
+
+
+def _batcher(dispatch, max_wait_ms=10):
+    """Create a micro-batcher around a dispatch callback."""
+    from src.core.microbatch import MicroBatcher
+
+    return MicroBatcher(dispatch, max_batch=4, max_wait_ms=max_wait_ms)
+
+
+class TestMicroBatcher:
+    """Tests for the shared micro-batcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_items_share_a_batch(self):
+        """Test items submitted together reach the callback as one batch."""
+        sizes = []
+
+        async def dispatch(batch):
+            sizes.append(len(batch))
+            for item, future in batch:
+                future.set_result(item * 2)
+
+        batcher = _batcher(dispatch)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+
+        assert results == [0, 2, 4, 6, 8, 10]
+        assert sizes == [4, 2]
+        await batcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_reach_every_waiter(self):
+        """Test an exception from the callback fails its whole batch."""
+        async def dispatch(batch):
+            batch[0][1].set_result("first")
+            raise ValueError("boom")
+
+        batcher = _batcher(dispatch)
+
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+        assert results[0] == "first"
+        assert isinstance(results[1], ValueError)
+        await batcher.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_fails_queued_items(self):
+        """Test items still waiting for a batch are not left hanging on close."""
+        async def dispatch(batch):
+            raise AssertionError("should not dispatch")
+
+        batcher = _batcher(dispatch, max_wait_ms=60000)
+        pending = asyncio.ensure_future(batcher.submit(1))
+        await asyncio.sleep(0.01)
+
+        await batcher.aclose()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, 1)
@@ -0,0 +1,326 @@
+"""
+Tests for RAG Pipeline Module
+
+Tests conversation memory trimming, history summarization, session
+eviction and async queries.
+"""
+
+import asyncio
+
+import pytest
+
+
+class TestConversationMemory:
+    """Tests for block-trimmed conversation memory."""
+
+    def test_trims_oldest_turns_in_blocks(self):
+        """Test history keeps its prefix until a whole block is dropped."""
+        from src.pipeline.rag_pipeline import ConversationMemory
+
+        memory = ConversationMemory(max_turns=4, trim_turns=2)
+        for i in range(4):
+            memory.add_turn(f"q{i}", f"a{i}")
+        assert memory.messages[0].content == "q0"
+
+        memory.add_turn("q4", "a4")
+
+        assert len(memory.messages) == 6
+        assert memory.messages[0].content == "q2"
+        assert memory.turn_count == 3
+
+        memory.clear()
+        assert memory.turn_count == 0
+
+    def test_history_is_an_immutable_snapshot(self):
+        """Test get_history() is unaffected by later turns and can't be mutated."""
+        from src.pipeline.rag_pipeline import ConversationMemory
+
+        memory = ConversationMemory()
+        memory.add_turn("q0", "a0")
+        history = memory.get_history()
+        memory.add_turn("q1", "a1")
+
+        assert isinstance(history, tuple)
+        assert [m.content for m in history] == ["q0", "a0"]
+
+    def test_concurrent_turns_are_not_lost(self):
+        """Test turns added from several threads are all recorded intact."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.pipeline.rag_pipeline import ConversationMemory
+
+        memory = ConversationMemory(max_turns=1000)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: memory.add_turn(f"q{i}", f"a{i}"), range(400)))
+
+        history = memory.get_history()
+        assert len(history) == 800
+        assert all(u.content[1:] == a.content[1:] for u, a in zip(history[::2], history[1::2]))
+
+
+def _async_pipeline(**kwargs):
+    """Build a pipeline over mocked async-capable components."""
+    from unittest.mock import AsyncMock, MagicMock
+    from src.core.llm import ChatResponse
+    from src.core.vectorstore import SearchResult, SearchResults
+    from src.pipeline.rag_pipeline import RAGPipeline
+
+    embedder = MagicMock()
+    embedder.aembed = AsyncMock(return_value=[0.1, 0.2])
+    store = MagicMock()
+    store.search.return_value = SearchResults(results=[
+        SearchResult(id="1", text="Reset via settings.", metadata={"source": "faq"}, distance=0.1)
+    ])
+    llm = MagicMock()
+    llm.fit_context.side_effect = lambda context, messages: context
+    llm.achat = AsyncMock(return_value=ChatResponse(content="Use settings.", model="m"))
+
+    async def astream_chat(messages):
+        for token in ("Use ", "settings."):
+            yield token
+
+    llm.astream_chat = astream_chat
+    return RAGPipeline(
+        embedding_provider=embedder,
+        vector_store=store,
+        llm_provider=llm,
+        enable_quick_replies=False,
+        **kwargs
+    )
+
+
+class TestSessionMemories:
+    """Tests for per-session conversation memory."""
+
+    def test_least_recently_used_session_is_dropped(self):
+        """Test sessions beyond the cap evict the one used longest ago."""
+        pipeline = _async_pipeline()
+        pipeline._session_cap = 2
+
+        first = pipeline._get_memory("a")
+        pipeline._get_memory("b")
+        assert pipeline._get_memory("a") is first
+        pipeline._get_memory("c")
+
+        assert list(pipeline._session_memories) == ["a", "c"]
+
+
+class TestHistoryCompression:
+    """Tests for rolling summarization of older history."""
+
+    @pytest.fixture(autouse=True)
+    def char_tokens(self):
+        """Count one token per character so budgets are easy to reason about."""
+        from unittest.mock import patch
+
+        with patch("src.pipeline.rag_pipeline.count_tokens", side_effect=len):
+            yield
+
+    @staticmethod
+    def _memory(turns):
+        """Memory holding `turns` turns of 100 characters each."""
+        from src.pipeline.rag_pipeline import ConversationMemory
+
+        memory = ConversationMemory(max_turns=10, trim_turns=2)
+        for i in range(turns):
+            memory.add_turn(f"q{i}".ljust(50, "."), f"a{i}".ljust(50, "."))
+        return memory
+
+    @staticmethod
+    def _pipeline(*summaries):
+        """Pipeline whose LLM returns the given summaries in turn."""
+        from src.core.llm import ChatResponse
+
+        pipeline = _async_pipeline()
+        pipeline.llm_provider.chat.side_effect = [ChatResponse(content=s, model="m") for s in summaries]
+        return pipeline
+
+    def test_history_within_budget_is_unchanged(self):
+        """Test history that fits the budget is sent verbatim without an LLM call."""
+        pipeline = self._pipeline()
+        memory = self._memory(4)
+
+        history = pipeline._compress_history(memory, max_tokens=400)
+
+        assert list(history) == list(memory.get_history())
+        pipeline.llm_provider.chat.assert_not_called()
+
+    def test_oldest_block_is_summarized(self):
+        """Test over-budget history evicts a whole block and summarizes it."""
+        pipeline = self._pipeline("S1")
+        memory = self._memory(5)
+
+        history = pipeline._compress_history(memory, max_tokens=450)
+
+        assert history[0].content == "Summary so far: S1"
+        assert [m.content[:2] for m in history[1::2]] == ["q2", "q3", "q4"]
+        transcript = pipeline.llm_provider.chat.call_args.args[0][1].content
+        assert "q0" in transcript and "q1" in transcript and "q2" not in transcript
+
+    def test_unchanged_older_block_is_not_resummarized(self):
+        """Test the summary is reused until another block is evicted."""
+        pipeline = self._pipeline("S1")
+        memory = self._memory(5)
+
+        first = pipeline._compress_history(memory, max_tokens=450)
+        second = pipeline._compress_history(memory, max_tokens=450)
+        # Another conversation with the same older turns hits the summary cache
+        third = pipeline._compress_history(self._memory(5), max_tokens=450)
+
+        assert list(first) == list(second) == list(third)
+        assert pipeline.llm_provider.chat.call_count == 1
+
+    def test_summary_rolls_forward(self):
+        """Test a later eviction folds only the new block into the old summary."""
+        pipeline = self._pipeline("S1", "S2")
+        memory = self._memory(5)
+        pipeline._compress_history(memory, max_tokens=450)
+
+        memory.add_turn("q5".ljust(50, "."), "a5".ljust(50, "."))
+        history = pipeline._compress_history(memory, max_tokens=450)
+
+        assert history[0].content == "Summary so far: S2"
+        transcript = pipeline.llm_provider.chat.call_args.args[0][1].content
+        assert transcript.startswith("Summary so far: S1")
+        assert "q2" in transcript and "q0" not in transcript
+
+    def test_failed_summary_drops_older_turns(self):
+        """Test a summarization error falls back to the recent turns alone."""
+        pipeline = self._pipeline()
+        pipeline.llm_provider.chat.side_effect = RuntimeError("LLM down")
+        memory = self._memory(5)
+
+        history = pipeline._compress_history(memory, max_tokens=450)
+
+        assert [m.content[:2] for m in history[::2]] == ["q2", "q3", "q4"]
+        assert memory.summary == ""
+
+
+class TestClose:
+    """Tests for releasing pipeline resources."""
+
+    @pytest.mark.asyncio
+    async def test_aclose_shuts_down_prep_pool(self):
+        """Test the history preparation pool refuses work once closed."""
+        pipeline = _async_pipeline()
+
+        await pipeline.aclose()
+
+        with pytest.raises(RuntimeError):
+            pipeline._prep_pool.submit(lambda: None)
+
+
+class TestAsyncQuery:
+    """Tests for the async query paths."""
+
+    @pytest.mark.asyncio
+    async def test_aquery_uses_async_components(self):
+        """Test aquery embeds, searches and generates without blocking calls."""
+        pipeline = _async_pipeline()
+
+        response = await pipeline.aquery("How do I reset my password?", session_id="s1")
+
+        assert response.answer == "Use settings."
+        assert response.sources
+        pipeline.retriever.embedding_provider.aembed.assert_awaited_once()
+        pipeline.llm_provider.chat.assert_not_called()
+        assert len(pipeline._get_memory("s1").messages) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_aqueries_share_the_loop(self):
+        """Test several aqueries can run together under the concurrency limit."""
+        pipeline = _async_pipeline(max_concurrent_queries=2)
+
+        responses = await asyncio.gather(*(pipeline.aquery(f"q{i}") for i in range(5)))
+
+        assert [r.answer for r in responses] == ["Use settings."] * 5
+        assert pipeline.llm_provider.achat.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_astream_query_records_full_response(self):
+        """Test streamed tokens are yielded and saved to memory."""
+        pipeline = _async_pipeline()
+
+        tokens = [t async for t in pipeline.astream_query("reset?", session_id="s1")]
+
+        assert tokens == ["Use ", "settings."]
+        assert pipeline._get_memory("s1").messages[-1].content == "Use settings."
+
+
+class TestStreamQuery:
+    """Tests for the synchronous streaming path."""
+
+    def test_history_is_prepared_during_retrieval(self):
+        """Test history preparation overlaps retrieval instead of following it."""
+        import threading
+
+        pipeline = _async_pipeline()
+        pipeline._get_memory("s1").add_turn("hi", "Hello!")
+        pipeline.llm_provider.stream_chat.return_value = iter(["Use ", "settings."])
+
+        history_started = threading.Event()
+        prepare_history = pipeline._history_for
+
+        def history_for(memory, include_history):
+            history_started.set()
+            return prepare_history(memory, include_history)
+
+        def embed(text):
+            assert history_started.wait(timeout=2)
+            return [0.1, 0.2]
+
+        pipeline._history_for = history_for
+        pipeline.retriever.embedding_provider.embed.side_effect = embed
+
+        tokens = list(pipeline.stream_query("reset?", session_id="s1"))
+
+        assert tokens == ["Use ", "settings."]
+        messages = pipeline.llm_provider.stream_chat.call_args.args[0]
+        assert any(m.content == "Hello!" for m in messages)
+
+
+class TestDefaultProviders:
+    """Tests for process-wide default providers."""
+
+    def test_pipelines_share_default_providers(self):
+        """Test pipelines built without providers reuse one instance of each."""
+        from unittest.mock import MagicMock, patch
+        from src.pipeline import providers
+        from src.pipeline.rag_pipeline import RAGPipeline
+
+        factories = (
+            providers.get_default_embedding_provider,
+            providers.get_default_vector_store,
+            providers.get_default_llm_provider,
+        )
+        for factory in factories:
+            factory.cache_clear()
+        try:
+            with patch.object(providers, "AzureEmbeddingProvider", MagicMock), \
+                 patch.object(providers, "ChromaVectorStore", MagicMock), \
+                 patch.object(providers, "AzureLLMProvider", MagicMock):
+                first, second = RAGPipeline(), RAGPipeline()
+        finally:
+            for factory in factories:
+                factory.cache_clear()
+
+        assert first.embedding_provider is second.embedding_provider
+        assert first.vector_store is second.vector_store
+        assert first.llm_provider is second.llm_provider
+
+
+class TestRAGResponse:
+    """Tests for the response container."""
+
+    def test_timestamp_is_derived_from_nanoseconds(self):
+        """Test the datetime view matches the stored nanosecond timestamp."""
+        from datetime import datetime, timedelta
+        from src.pipeline.rag_pipeline import RAGResponse
+
+        before = datetime.now()
+        response = RAGResponse(answer="a", query="q")
+        after = datetime.now()
+
+        assert isinstance(response.timestamp_ns, int)
+        # Allow for float rounding of the nanosecond value
+        slack = timedelta(milliseconds=1)
+        assert before - slack <= response.timestamp <= after + slack
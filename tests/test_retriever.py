@@ -0,0 +1,360 @@
+"""
+Tests for Retriever Module
+
+Tests context formatting, query caching in Retriever and query coalescing
+in BatchingRetriever.
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def batching_retriever():
+    """Create a batching retriever over mocked embedding and store backends."""
+    from unittest.mock import MagicMock
+    from src.core.vectorstore import SearchResult, SearchResults
+    from src.pipeline.retriever import BatchingRetriever
+
+    embedder = MagicMock()
+    embedder.embed_batch.side_effect = lambda texts: [[float(len(t))] for t in texts]
+
+    store = MagicMock()
+    store.search_batch.side_effect = lambda embeddings, top_k, filter_metadata: [
+        SearchResults(results=[SearchResult(id=str(e[0]), text=f"len {e[0]:g}", metadata={})])
+        for e in embeddings
+    ]
+    return BatchingRetriever(embedder, store, default_top_k=3, max_batch=8, max_wait_ms=10)
+
+
+class TestBatchingRetriever:
+    """Tests for micro-batched retrieval."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_embedding_call(self, batching_retriever):
+        """Test queries in one batch are embedded and searched together."""
+        results = await asyncio.gather(*(batching_retriever.aretrieve("x" * n) for n in (1, 2, 3)))
+
+        assert [r.texts for r in results] == [["len 1"], ["len 2"], ["len 3"]]
+        assert [r.query for r in results] == ["x", "xx", "xxx"]
+        batching_retriever.embedding_provider.embed_batch.assert_called_once()
+        batching_retriever.vector_store.search_batch.assert_called_once()
+        await batching_retriever.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_fails_queued_queries(self, batching_retriever):
+        """Test queries still waiting for a batch are not left hanging on close."""
+        batching_retriever._batcher.max_wait = 60
+        pending = asyncio.ensure_future(batching_retriever.aretrieve("x"))
+        await asyncio.sleep(0.01)
+
+        await batching_retriever.aclose()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, 1)
+        batching_retriever.embedding_provider.embed_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_queries_are_grouped_by_filter(self, batching_retriever):
+        """Test queries with different filters are searched separately."""
+        await asyncio.gather(
+            batching_retriever.aretrieve("a", filter_metadata={"source": "faq"}),
+            batching_retriever.aretrieve("b", filter_metadata={"source": "faq"}),
+            batching_retriever.aretrieve("c"),
+        )
+
+        calls = batching_retriever.vector_store.search_batch.call_args_list
+        assert sorted(len(c.args[0]) for c in calls) == [1, 2]
+        await batching_retriever.aclose()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_single_searches(self, batching_retriever):
+        """Test stores without search_batch are searched once per query."""
+        from src.core.vectorstore import SearchResults
+
+        store = batching_retriever.vector_store
+        del store.search_batch
+        store.search.return_value = SearchResults()
+
+        results = await asyncio.gather(batching_retriever.aretrieve("a"), batching_retriever.aretrieve("b"))
+
+        assert [len(r) for r in results] == [0, 0]
+        assert store.search.call_count == 2
+        await batching_retriever.aclose()
+
+    @pytest.mark.asyncio
+    async def test_embedding_errors_reach_every_waiter(self, batching_retriever):
+        """Test a failed embedding call is raised to all batched callers."""
+        batching_retriever.embedding_provider.embed_batch.side_effect = RuntimeError("boom")
+
+        results = await asyncio.gather(
+            batching_retriever.aretrieve("a"),
+            batching_retriever.aretrieve("b"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        await batching_retriever.aclose()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_errors_reach_every_waiter(self, batching_retriever):
+        """Test an error while grouping a batch fails its queries instead of hanging them."""
+        from src.pipeline.retriever import BatchingRetriever
+
+        retriever = BatchingRetriever(
+            batching_retriever.embedding_provider, batching_retriever.vector_store,
+            max_wait_ms=10, cache_size=0
+        )
+
+        # Sets can't be serialized into a group key
+        with pytest.raises(TypeError):
+            await asyncio.wait_for(retriever.aretrieve("a", filter_metadata={"tags": {"a"}}), 1)
+        await retriever.aclose()
+
+
+@pytest.fixture
+def retriever():
+    """Create a caching retriever over mocked embedding and store backends."""
+    from unittest.mock import MagicMock
+    from src.core.vectorstore import SearchResult, SearchResults
+    from src.pipeline.retriever import Retriever
+
+    embedder = MagicMock()
+    embedder.embed.side_effect = lambda text: [float(len(text))]
+
+    store = MagicMock()
+    store.generation = 0
+    store.search.side_effect = lambda query_embedding, top_k, filter_metadata: SearchResults(
+        results=[SearchResult(id="1", text="doc", metadata={})]
+    )
+    return Retriever(embedder, store, default_top_k=3, cache_size=8)
+
+
+class TestRetrieverCache:
+    """Tests for cached query embeddings and retrieval results."""
+
+    def test_repeated_query_is_served_from_cache(self, retriever):
+        """Test a repeated (differently cased) query skips embedding and search."""
+        first = retriever.retrieve("Reset password?")
+        second = retriever.retrieve("  reset password?")
+
+        assert second.query == "  reset password?"
+        assert second.texts == first.texts
+        retriever.embedding_provider.embed.assert_called_once()
+        retriever.vector_store.search.assert_called_once()
+
+    def test_new_filter_reuses_the_embedding(self, retriever):
+        """Test a different filter re-runs only the search."""
+        retriever.retrieve("reset password?")
+        retriever.retrieve("reset password?", filter_metadata={"source": "faq"})
+
+        retriever.embedding_provider.embed.assert_called_once()
+        assert retriever.vector_store.search.call_count == 2
+
+    def test_store_writes_invalidate_results(self, retriever):
+        """Test results are searched again after the store's generation changes."""
+        retriever.retrieve("reset password?")
+        retriever.vector_store.generation += 1
+        retriever.retrieve("reset password?")
+
+        assert retriever.vector_store.search.call_count == 2
+
+    def test_cached_results_expire(self, retriever):
+        """Test results are searched again once their TTL has passed."""
+        from unittest.mock import patch
+
+        retriever.cache_ttl_seconds = 60
+        with patch("src.pipeline.retriever.time.monotonic", return_value=1000.0):
+            retriever.retrieve("reset password?")
+            retriever.retrieve("reset password?")
+        with patch("src.pipeline.retriever.time.monotonic", return_value=1060.0):
+            retriever.retrieve("reset password?")
+
+        assert retriever.vector_store.search.call_count == 2
+        retriever.embedding_provider.embed.assert_called_once()
+
+    def test_query_embedding_is_opt_in(self, retriever):
+        """Test results carry the query embedding only when asked, cached or not."""
+        assert retriever.retrieve("reset password?").query_embedding is None
+
+        cached = retriever.retrieve("reset password?", store_query_embedding=True)
+
+        assert cached.query_embedding == [15.0]
+        retriever.vector_store.search.assert_called_once()
+
+    def test_stores_without_generation_skip_the_result_cache(self, retriever):
+        """Test results are never cached when writes can't be detected."""
+        del retriever.vector_store.generation
+
+        retriever.retrieve("reset password?")
+        retriever.retrieve("reset password?")
+
+        retriever.embedding_provider.embed.assert_called_once()
+        assert retriever.vector_store.search.call_count == 2
+
+
+class TestFormatContext:
+    """Tests for token-budgeted context formatting."""
+
+    @pytest.fixture(autouse=True)
+    def char_tokens(self):
+        """Count one token per character so budgets are easy to reason about."""
+        from unittest.mock import patch
+
+        with patch("src.pipeline.retriever.count_tokens", side_effect=len), \
+             patch("src.pipeline.retriever.truncate_to_tokens", side_effect=lambda text, n: text[:n]):
+            yield
+
+    @staticmethod
+    def _result(*texts):
+        from src.core.vectorstore import SearchResult
+        from src.pipeline.retriever import RetrievalResult
+
+        return RetrievalResult(
+            query="q",
+            results=[SearchResult(id=str(i), text=t, metadata={}) for i, t in enumerate(texts)]
+        )
+
+    def test_stops_at_the_budget(self):
+        """Test documents past the budget are dropped and the last one is cut."""
+        result = self._result("aaaa", "bbbb", "cccc")
+
+        context = result.format_context(include_source=False, max_tokens=8, separator="|")
+
+        assert context == "aaaa|bbb..."
+
+    def test_unbounded_context_keeps_everything(self):
+        """Test every document is included without a budget."""
+        result = self._result("aaaa", "bbbb")
+
+        assert result.format_context(include_source=False, separator="|") == "aaaa|bbbb"
+
+    def test_unbounded_context_skips_token_counting(self):
+        """Test formatting without a budget never counts tokens."""
+        from src.pipeline import retriever as retriever_module
+
+        result = self._result("aaaa", "bbbb")
+
+        context = result.format_context(separator="|")
+
+        assert context == "[Source: Unknown, Chunk: 0]\naaaa|[Source: Unknown, Chunk: 0]\nbbbb"
+        retriever_module.count_tokens.assert_not_called()
+
+    def test_source_headers_count_toward_the_budget(self):
+        """Test the source header is part of each document's cost."""
+        result = self._result("text")
+        header = "[Source: Unknown, Chunk: 0]\n"
+
+        assert result.format_context(max_tokens=len(header) + 4) == header + "text"
+
+
+class TestRetrieveWithThreshold:
+    """Tests for score-thresholded retrieval."""
+
+    def test_keeps_scores_at_or_above_threshold(self, retriever):
+        """Test results below the threshold are dropped, in rank order."""
+        from src.core.vectorstore import SearchResult, SearchResults
+
+        retriever.vector_store.search.side_effect = None
+        retriever.vector_store.search.return_value = SearchResults(results=[
+            SearchResult(id=str(i), text=str(score), metadata={}, score=score)
+            for i, score in enumerate([0.9, 0.7, 0.4, 0.7])
+        ])
+
+        result = retriever.retrieve_with_threshold("q", score_threshold=0.7)
+
+        assert [r.id for r in result] == ["0", "1", "3"]
+
+
+class TestGetSources:
+    """Tests for source deduplication."""
+
+    def test_first_result_per_source_in_rank_order(self):
+        """Test each source appears once, in the order it was first retrieved."""
+        from src.core.vectorstore import SearchResult
+        from src.pipeline.retriever import RetrievalResult
+
+        result = RetrievalResult(query="q", results=[
+            SearchResult(id="1", text="", metadata={"source": "b", "chunk_index": 0}),
+            SearchResult(id="2", text="", metadata={"source": "a"}),
+            SearchResult(id="3", text="", metadata={"source": "b", "chunk_index": 1}),
+            SearchResult(id="4", text="", metadata={}),
+        ])
+
+        sources = result.get_sources()
+
+        assert [s["source"] for s in sources] == ["b", "a", "Unknown"]
+        assert sources[0]["metadata"]["chunk_index"] == 0
+
+
+class TestRetrieveMany:
+    """Tests for batched multi-query retrieval."""
+
+    @pytest.fixture
+    def store_with_batch(self, retriever):
+        """Give the mocked store a search_batch() that labels results by embedding."""
+        from src.core.vectorstore import SearchResult, SearchResults
+
+        retriever.embedding_provider.embed_batch.side_effect = lambda texts: [
+            [float(len(t))] for t in texts
+        ]
+        retriever.vector_store.search_batch.side_effect = lambda embeddings, top_k, filter_metadata: [
+            SearchResults(results=[SearchResult(id=str(e[0]), text=f"len {e[0]:g}", metadata={})])
+            for e in embeddings
+        ]
+        return retriever
+
+    def test_one_embedding_and_search_call(self, store_with_batch):
+        """Test all queries share one embed_batch() and one search_batch() call."""
+        results = store_with_batch.retrieve_many(["a", "bb", "ccc"])
+
+        assert [r.texts for r in results] == [["len 1"], ["len 2"], ["len 3"]]
+        store_with_batch.embedding_provider.embed_batch.assert_called_once_with(["a", "bb", "ccc"])
+        store_with_batch.vector_store.search_batch.assert_called_once()
+
+    def test_cached_queries_are_skipped(self, store_with_batch):
+        """Test queries answered from the cache are not embedded or searched again."""
+        store_with_batch.retrieve_many(["a"])
+
+        results = store_with_batch.retrieve_many(["a", "bb"])
+
+        assert [r.query for r in results] == ["a", "bb"]
+        assert store_with_batch.embedding_provider.embed_batch.call_args.args[0] == ["bb"]
+        assert len(store_with_batch.vector_store.search_batch.call_args.args[0]) == 1
+
+
+class TestRetrieverMMR:
+    """Tests for MMR-diversified retrieval."""
+
+    def test_fetches_candidates_and_diversifies(self, retriever):
+        """Test a wider candidate set is searched and reduced to top_k by MMR."""
+        import numpy as np
+        from src.core.vectorstore import SearchResult, SearchResults
+
+        retriever.use_mmr = True
+        retriever.mmr_lambda = 0.5
+        retriever.mmr_fetch_k = 10
+        retriever.embedding_provider.embed.side_effect = lambda text: [1.0, 0.0]
+        retriever.vector_store.search.side_effect = None
+        retriever.vector_store.search.return_value = SearchResults(
+            results=[SearchResult(id=i, text=i, metadata={}) for i in ("a", "a2", "b")],
+            embeddings=np.array([[1.0, 0.1], [1.0, 0.11], [0.8, -0.6]], dtype=np.float32)
+        )
+
+        result = retriever.retrieve("question", top_k=2)
+
+        kwargs = retriever.vector_store.search.call_args.kwargs
+        assert kwargs["top_k"] == 10
+        assert kwargs["include_embeddings"] is True
+        assert [r.id for r in result.results] == ["a", "b"]
+
+    def test_disabled_searches_top_k_only(self, retriever):
+        """Test MMR off leaves the search request unchanged."""
+        retriever.use_mmr = False
+
+        retriever.retrieve("question", top_k=2)
+
+        kwargs = retriever.vector_store.search.call_args.kwargs
+        assert kwargs["top_k"] == 2
+        assert "include_embeddings" not in kwargs
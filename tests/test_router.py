@@ -0,0 +1,75 @@
+"""
+Tests for Quick Reply Router Module
+
+Tests which messages are answered with canned replies and which go
+through the full pipeline.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def router():
+    """Create a quick reply router."""
+    from src.pipeline.router import SafetyGreetingRouter
+
+    return SafetyGreetingRouter()
+
+
+class TestGreetingsAndGoodbyes:
+    """Tests for conversational noise."""
+
+    @pytest.mark.parametrize("text", ["hi", "Hello there!", "good morning Rashmi"])
+    def test_greeting(self, router, text):
+        """Test bare greetings get the greeting reply."""
+        from src.messages import msg
+
+        assert router.route(text) == msg("router.greeting")
+
+    @pytest.mark.parametrize("text", ["thanks, bye!", "ok thank you so much", "that's all"])
+    def test_goodbye(self, router, text):
+        """Test thanks and goodbyes get the goodbye reply."""
+        from src.messages import msg
+
+        assert router.route(text) == msg("router.goodbye")
+
+    @pytest.mark.parametrize("text", ["hi, what data packages do you have?", "thanks but it still fails", ""])
+    def test_questions_go_through(self, router, text):
+        """Test messages with question content are not routed."""
+        assert router.route(text) is None
+
+    @pytest.mark.parametrize("text", ["hi there", "good evening", "thanks", "that is all"])
+    def test_routed_noise_is_a_short_turn(self, router, text):
+        """Test the router and the LLM short-turn cap share one vocabulary."""
+        from src.core.llm import Message, is_short_turn
+
+        assert router.route(text) is not None
+        assert is_short_turn([Message(role="user", content=text)])
+
+    def test_long_sign_off_runs_are_fast(self, router):
+        """Test repeated sign-offs don't trigger catastrophic regex backtracking."""
+        import time
+
+        start = time.perf_counter()
+        assert router.route("thanks bye thank you " * 200 + "but why?") is None
+        assert time.perf_counter() - start < 1
+
+
+class TestAbuse:
+    """Tests for abusive messages."""
+
+    @pytest.mark.parametrize("text", ["fuck you", "You are useless!", "shut up, you idiot", "you're so dumb Rashmi"])
+    def test_whole_message_abuse_is_refused(self, router, text):
+        """Test messages made up only of insults get the refusal."""
+        from src.messages import msg
+
+        assert router.route(text) == msg("router.refusal")
+
+    @pytest.mark.parametrize("text", [
+        "My son told me to shut up the router but internet still drops, how do I fix it?",
+        "The app says you are useless until I update, how do I update?",
+        "this stupid router keeps dropping",
+    ])
+    def test_questions_quoting_insults_go_through(self, router, text):
+        """Test support questions that contain an insult are not refused."""
+        assert router.route(text) is None
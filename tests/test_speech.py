@@ -0,0 +1,93 @@
+"""
+Tests for Speech Module
+
+Tests SpeechService synthesizer reuse and sentence streaming.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def service():
+    """Create a SpeechService with the Speech SDK mocked out."""
+    with patch("src.core.speech.settings") as mock_settings, \
+            patch("src.core.speech.speechsdk") as mock_sdk:
+        mock_settings.speech.is_configured = True
+        mock_settings.speech.push_audio = False
+        mock_sdk.ResultReason.SynthesizingAudioCompleted = "completed"
+        mock_sdk.SpeechSynthesizer.return_value.speak_text_async.return_value.get.return_value = (
+            MagicMock(reason="completed")
+        )
+
+        from src.core.speech import SpeechService
+        yield SpeechService(), mock_sdk
+
+
+class TestSpeakStream:
+    """Tests for sentence-by-sentence streaming synthesis."""
+
+    def test_queues_each_sentence_as_it_completes(self, service):
+        """Test sentences are synthesized in order, with the tail flushed last."""
+        speech, mock_sdk = service
+        tokens = ["Hello", " there. ", "Roaming is", " active! You", " can call"]
+
+        text = speech.speak_stream(tokens)
+
+        synthesizer = mock_sdk.SpeechSynthesizer.return_value
+        spoken = [c.args[0] for c in synthesizer.speak_text_async.call_args_list]
+        assert spoken == ["Hello there.", "Roaming is active!", "You can call"]
+        assert text == "".join(tokens)
+
+    def test_reuses_one_synthesizer(self, service):
+        """Test repeated calls share a single synthesizer."""
+        speech, mock_sdk = service
+
+        speech.speak("First.")
+        speech.speak_stream(["Second. "])
+
+        assert mock_sdk.SpeechSynthesizer.call_count == 1
+
+
+class TestRecognizerReuse:
+    """Tests for recognizer reuse."""
+
+    def test_reuses_one_recognizer_and_replaces_callbacks(self, service):
+        """Test repeated recognition shares a recognizer without stacking handlers."""
+        speech, mock_sdk = service
+        recognizer = mock_sdk.SpeechRecognizer.return_value
+        recognizer.recognize_once_async.return_value.get.return_value = None
+
+        speech.recognize_from_microphone(on_recognizing=lambda text: None)
+        speech.recognize_from_microphone(on_recognizing=lambda text: None)
+
+        assert mock_sdk.SpeechRecognizer.call_count == 1
+        assert recognizer.recognizing.disconnect_all.call_count == 2
+
+
+class TestPushAudio:
+    """Tests for the push-stream microphone input."""
+
+    def test_pushes_audio_only_while_listening(self, service):
+        """Test microphone frames reach the recognizer only during recognition."""
+        speech, mock_sdk = service
+        sounddevice = MagicMock()
+
+        with patch.dict("sys.modules", {"sounddevice": sounddevice}):
+            speech._audio_input_config = speech._open_push_audio()
+
+        on_audio = sounddevice.RawInputStream.call_args.kwargs["callback"]
+        push_stream = mock_sdk.audio.PushAudioInputStream.return_value
+
+        on_audio(b"\x00\x01", 1, None, None)
+        push_stream.write.assert_not_called()
+
+        recognizer = mock_sdk.SpeechRecognizer.return_value
+        recognizer.recognize_once_async.return_value.get.side_effect = (
+            lambda: on_audio(b"\x00\x01", 1, None, None)
+        )
+        speech.recognize_from_microphone()
+
+        push_stream.write.assert_called_once_with(b"\x00\x01")
+        sounddevice.RawInputStream.return_value.start.assert_called_once()
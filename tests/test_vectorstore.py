@@ -33,6 +33,13 @@ class TestSearchResult:
         
         result = SearchResult(id="1", text="test", distance=0.3)
         assert result.score == pytest.approx(0.7, abs=0.01)
+    
+    def test_search_result_explicit_score(self):
+        """Test an explicit score takes precedence over distance."""
+        from src.core.vectorstore import SearchResult
+        
+        result = SearchResult(id="1", text="test", distance=0.3, score=0.95)
+        assert result.score == 0.95
 
 
 class TestSearchResults:
@@ -96,6 +103,7 @@ class TestChromaVectorStore:
         with patch("src.core.vectorstore.chromadb") as mock_chromadb:
             mock_collection = MagicMock()
             mock_collection.count.return_value = 0
+            mock_collection.metadata = {"hnsw:space": "cosine", "id_scheme": 2}
             mock_collection.query.return_value = {
                 "ids": [["1", "2"]],
                 "documents": [["doc1", "doc2"]],
@@ -113,6 +121,17 @@ class TestChromaVectorStore:
                 "collection": mock_collection
             }
     
+    def test_store_satisfies_protocol(self, mock_chroma, temp_vectorstore_dir):
+        """Test ChromaVectorStore is recognized as a VectorStore."""
+        from src.core.vectorstore import ChromaVectorStore, VectorStore
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        
+        assert isinstance(store, VectorStore)
+    
     def test_store_initialization(self, mock_chroma, temp_vectorstore_dir):
         """Test vector store initializes correctly."""
         from src.core.vectorstore import ChromaVectorStore
@@ -142,6 +161,23 @@ class TestChromaVectorStore:
         assert len(ids) == 3
         mock_chroma["collection"].upsert.assert_called_once()
     
+    def test_add_documents_passes_float32_array(self, mock_chroma, temp_vectorstore_dir, mock_embeddings):
+        """Test embeddings reach Chroma as one contiguous float32 array."""
+        import numpy as np
+        from src.core.vectorstore import ChromaVectorStore
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        
+        store.add_documents(["doc1", "doc2"], mock_embeddings[:2])
+        
+        vectors = mock_chroma["collection"].upsert.call_args.kwargs["embeddings"]
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (2, len(mock_embeddings[0]))
+        assert vectors.flags["C_CONTIGUOUS"]
+    
     def test_search(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
         """Test searching documents."""
         from src.core.vectorstore import ChromaVectorStore
@@ -160,6 +196,43 @@ class TestChromaVectorStore:
         assert results[0].text == "doc1"
         assert results[0].distance == 0.1
     
+    def test_search_batch_splits_rows(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
+        """Test a batched search sends one query and returns one result set per row."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        mock_chroma["collection"].count.return_value = 10
+        mock_chroma["collection"].query.return_value = {
+            "ids": [["a"], ["b", "c"]],
+            "documents": [["doc a"], ["doc b", "doc c"]],
+            "metadatas": [[{}], [{}, {}]],
+            "distances": [[0.1], [0.2, 0.3]]
+        }
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        
+        batch = store.search_batch([mock_embedding, mock_embedding], top_k=2)
+        
+        mock_chroma["collection"].query.assert_called_once()
+        assert [r.ids for r in batch] == [["a"], ["b", "c"]]
+    
+    def test_search_ignores_stale_local_count(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
+        """Test top_k is not capped by a local count another process made stale."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        mock_chroma["collection"].count.return_value = 1
+        mock_chroma["collection"].query.return_value = {"ids": [[]]}
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        store.search_batch([mock_embedding], top_k=5)
+        
+        assert mock_chroma["collection"].query.call_args.kwargs["n_results"] == 5
+    
     def test_search_empty_store(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
         """Test searching empty store."""
         from src.core.vectorstore import ChromaVectorStore
@@ -222,3 +295,247 @@ class TestChromaVectorStore:
         
         assert stats["collection_name"] == "test_collection"
         assert stats["document_count"] == 100
+    
+    def test_count_is_tracked_locally(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
+        """Test searches and writes use the local count without asking Chroma."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        mock_chroma["collection"].count.return_value = 10
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        store.search(mock_embedding, top_k=5)
+        store.add_documents(texts=["a", "b"], embeddings=[mock_embedding] * 2)
+        store.delete(["1"])
+        
+        assert store.count() == 11
+        assert mock_chroma["collection"].count.call_count == 1
+        
+        store.clear()
+        assert store.count() == 0
+    
+    def test_generation_changes_on_every_write(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
+        """Test writes bump the generation used to invalidate cached searches."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        store.search(mock_embedding, top_k=5)
+        assert store.generation == 0
+        
+        store.add_documents(texts=["a"], embeddings=[mock_embedding], ids=["x"])
+        store.delete(["x"])
+        store.clear()
+        
+        assert store.generation == 3
+    
+    def test_count_resyncs_periodically(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
+        """Test the local count is re-read from Chroma every COUNT_RESYNC_WRITES writes."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        store.COUNT_RESYNC_WRITES = 2
+        mock_chroma["collection"].count.return_value = 1
+        
+        store.add_documents(texts=["a"], embeddings=[mock_embedding], ids=["x"])
+        store.add_documents(texts=["a"], embeddings=[mock_embedding], ids=["x"])
+        
+        assert store.count() == 1
+    
+    def test_hnsw_profile_sets_collection_metadata(self, mock_chroma, temp_vectorstore_dir):
+        """Test an HNSW profile is passed as collection metadata."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection",
+            hnsw_profile="balanced"
+        )
+        
+        metadata = mock_chroma["client"].get_or_create_collection.call_args.kwargs["metadata"]
+        assert metadata["hnsw:space"] == "cosine"
+        assert metadata["hnsw:M"] == 24
+        assert metadata["hnsw:search_ef"] == 100
+    
+    def test_exists_many_requires_matching_metadata(self, mock_chroma, temp_vectorstore_dir):
+        """Test a stored chunk with edited metadata doesn't count as existing."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        mock_chroma["collection"].get.return_value = {
+            "ids": ["same", "edited", "bare"],
+            "documents": ["a", "b", "c"],
+            "metadatas": [{"category": "billing"}, {"category": "old"}, None],
+        }
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        
+        existing = store.exists_many(
+            ["same", "edited", "bare"],
+            ["a", "b", "c"],
+            [{"category": "billing"}, {"category": "new"}, {}]
+        )
+        
+        assert existing == {"same", "bare"}
+        assert mock_chroma["collection"].get.call_args.kwargs["include"] == ["documents", "metadatas"]
+    
+    def test_stale_id_scheme_refuses_writes_until_cleared(self, mock_chroma, temp_vectorstore_dir, mock_embedding):
+        """Test a collection built with older chunk IDs can't be added to."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        mock_chroma["collection"].count.return_value = 10
+        mock_chroma["collection"].metadata = {"hnsw:space": "cosine"}
+        mock_chroma["client"].create_collection.return_value.count.return_value = 0
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        with pytest.raises(ValueError):
+            store.add_documents(texts=["a"], embeddings=[mock_embedding])
+        
+        store.clear()
+        store.add_documents(texts=["a"], embeddings=[mock_embedding])
+        
+        metadata = mock_chroma["client"].create_collection.call_args.kwargs["metadata"]
+        assert metadata["id_scheme"] == 2
+    
+    def test_empty_collection_is_stamped_with_id_scheme(self, mock_chroma, temp_vectorstore_dir):
+        """Test an empty unversioned collection takes the current ID scheme."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        mock_chroma["collection"].metadata = {"hnsw:space": "cosine", "indexed_fields": "source"}
+        
+        store = ChromaVectorStore(
+            persist_directory=temp_vectorstore_dir,
+            collection_name="test_collection"
+        )
+        
+        assert not store.id_scheme_mismatch
+        mock_chroma["collection"].modify.assert_called_once_with(
+            metadata={"indexed_fields": "source", "id_scheme": 2}
+        )
+    
+    def test_unknown_hnsw_profile_rejected(self, mock_chroma, temp_vectorstore_dir):
+        """Test a misspelled profile fails fast."""
+        from src.core.vectorstore import ChromaVectorStore
+        
+        with pytest.raises(ValueError):
+            ChromaVectorStore(
+                persist_directory=temp_vectorstore_dir,
+                collection_name="test_collection",
+                hnsw_profile="turbo"
+            )
+
+
+class TestRerankExact:
+    """Tests for exact cosine reranking of search results."""
+    
+    def test_reorders_by_exact_similarity(self):
+        """Test results are sorted by cosine similarity to the query."""
+        import numpy as np
+        from src.core.vectorstore import SearchResult, SearchResults
+        
+        results = SearchResults(
+            results=[SearchResult(id="far", text="a"), SearchResult(id="near", text="b")],
+            query_embedding=[1.0, 0.0],
+            embeddings=np.array([[0.0, 2.0], [3.0, 0.1]], dtype=np.float32)
+        )
+        
+        reranked = results.rerank_exact()
+        
+        assert reranked.ids == ["near", "far"]
+        assert reranked[0].score == pytest.approx(0.9994, abs=1e-3)
+        assert reranked[1].score == pytest.approx(0.0, abs=1e-6)
+    
+    def test_requires_embeddings(self):
+        """Test reranking without stored embeddings fails clearly."""
+        from src.core.vectorstore import SearchResult, SearchResults
+        
+        results = SearchResults(results=[SearchResult(id="1", text="a")], query_embedding=[1.0])
+        
+        with pytest.raises(ValueError):
+            results.rerank_exact()
+
+
+class TestMMR:
+    """Tests for maximal marginal relevance selection."""
+    
+    def test_near_duplicate_is_skipped(self):
+        """Test a diverse result is picked over a near-copy of the best one."""
+        import numpy as np
+        from src.core.vectorstore import SearchResult, SearchResults
+        
+        results = SearchResults(
+            results=[
+                SearchResult(id="best", text="a"),
+                SearchResult(id="copy", text="b"),
+                SearchResult(id="other", text="c"),
+            ],
+            query_embedding=[1.0, 0.0, 0.0],
+            embeddings=np.array(
+                [[1.0, 0.1, 0.0], [1.0, 0.11, 0.0], [0.7, 0.0, 0.7]], dtype=np.float32
+            )
+        )
+        
+        selected = results.mmr(k=2, lambda_mult=0.5)
+        
+        assert selected.ids == ["best", "other"]
+        assert selected.embeddings.shape == (2, 3)
+    
+    def test_lambda_one_keeps_relevance_order(self):
+        """Test lambda 1.0 reduces to plain top-k by similarity."""
+        import numpy as np
+        from src.core.vectorstore import SearchResult, SearchResults
+        
+        results = SearchResults(
+            results=[SearchResult(id=str(i), text="x") for i in range(3)],
+            query_embedding=[1.0, 0.0],
+            embeddings=np.array([[1.0, 0.0], [1.0, 0.01], [0.0, 1.0]], dtype=np.float32)
+        )
+        
+        assert results.mmr(k=2, lambda_mult=1.0).ids == ["0", "1"]
+    
+    def test_requires_embeddings(self):
+        """Test MMR without stored embeddings fails clearly."""
+        from src.core.vectorstore import SearchResult, SearchResults
+        
+        results = SearchResults(results=[SearchResult(id="1", text="a")], query_embedding=[1.0])
+        
+        with pytest.raises(ValueError):
+            results.mmr(k=1)
+
+
+class TestCanonicalFilter:
+    """Tests for metadata filter normalization."""
+    
+    def test_single_key_passes_through(self):
+        """Test a single condition is used as-is."""
+        from src.core.vectorstore import canonical_filter
+        
+        assert canonical_filter({"source": "faq.pdf"}) == {"source": "faq.pdf"}
+    
+    def test_multiple_keys_are_combined_in_order(self):
+        """Test several equality filters become one cached $and clause."""
+        from src.core.vectorstore import canonical_filter
+        
+        where = canonical_filter({"source": "faq.pdf", "category": "billing"})
+        
+        assert where == {"$and": [{"category": "billing"}, {"source": "faq.pdf"}]}
+        assert canonical_filter({"category": "billing", "source": "faq.pdf"}) is where
+    
+    def test_unhashable_values_are_not_cached(self):
+        """Test operator filters with list values still work."""
+        from src.core.vectorstore import canonical_filter
+        
+        where = {"source": {"$in": ["a.pdf", "b.pdf"]}}
+        
+        assert canonical_filter(where) == where